@@ -21,21 +21,21 @@ import uuid
 import pytz
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
-# Lazy load scheduling agent
-scheduling_agent = None
-def get_scheduling_agent():
-    global scheduling_agent
-    if scheduling_agent is None:
-        try:
-            from backend.agent_orchestrator import scheduling_agent as agent
-            scheduling_agent = agent
-        except Exception as e:
-            print(f"Warning: Failed to load scheduling agent: {e}")
-            class DummyAgent:
-                def notify(self, *args, **kwargs): pass
-                def propose_best_slots(self, *args, **kwargs): return []
-            scheduling_agent = DummyAgent()
+from backend.agent_registry import agent_registry
+
+class DummyAgent:
+    def notify(self, *args, **kwargs): pass
+    def propose_best_slots(self, *args, **kwargs): return []
+
+def _load_scheduling_agent():
+    from backend.agent_orchestrator import scheduling_agent
     return scheduling_agent
+
+# Lazy, built once per process by the registry
+agent_registry.register('scheduling', _load_scheduling_agent, fallback=lambda error: DummyAgent())
+
+def get_scheduling_agent():
+    return agent_registry.get('scheduling')
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
@@ -1,6 +1,12 @@
 """API endpoints for notification system"""
-from flask import Blueprint, jsonify
-from backend.agent_orchestrator import get_notifications, mark_notification_read, clear_all_notifications
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from backend.agent_orchestrator import (
+    get_notifications, get_latest_notification_seq, notification_events,
+    mark_notification_read, clear_all_notifications, get_reasoning
+)
+
+# Longest ?wait= a reasoning request may block for, in seconds
+MAX_REASONING_WAIT = 5
 
 notification_bp = Blueprint('notifications', __name__)
 
@@ -8,11 +14,40 @@ notification_bp = Blueprint('notifications', __name__)
 def get_all_notifications():
     """Get all AI agent notifications"""
     try:
-        notifications = get_notifications()
-        return jsonify({'success': True, 'notifications': notifications})
+        # ?since=<seq> returns only notifications newer than that sequence id
+        since = request.args.get('since', type=int)
+        latest_seq = get_latest_notification_seq()
+        notifications = get_notifications(since)
+        return jsonify({'success': True, 'notifications': notifications, 'latest_seq': latest_seq})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@notification_bp.route('/api/reasoning/<reasoning_id>', methods=['GET'])
+def get_decision_reasoning(reasoning_id):
+    """Deferred reasoning for an agent decision (its ``reasoning_id``)"""
+    try:
+        wait = min(max(request.args.get('wait', default=0, type=float), 0), MAX_REASONING_WAIT)
+        reasoning = get_reasoning(reasoning_id, timeout=wait)
+        return jsonify({
+            'success': True,
+            'reasoning_id': reasoning_id,
+            'reasoning_status': 'pending' if reasoning is None else 'ready',
+            'reasoning': reasoning
+        })
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@notification_bp.route('/api/notifications/stream', methods=['GET'])
+def stream_notifications():
+    """Push new notifications as Server-Sent Events"""
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', type=int)
+    if since is None:
+        since = get_latest_notification_seq()
+    return Response(stream_with_context(notification_events(since)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @notification_bp.route('/api/notifications/<int:index>/read', methods=['POST'])
 def mark_read(index):
     """Mark notification as read"""
@@ -23,6 +23,11 @@ except ImportError as e:
     print(f"Failed to import PromptManager: {e}")
     PromptManager = None
 
+try:
+    from backend.llm_cache import llm_cache
+except ImportError:
+    llm_cache = None
+
 
 # --- Helper Functions ---
 def extract_text_from_pdf(pdf_path: str) -> Optional[str]:
@@ -85,18 +90,30 @@ def _parse_with_llm(text: str, prompt: str, retries: int = 5) -> Optional[Dict]:
         full_prompt = prompt.replace("{job_description_text}", text)
     else:
         full_prompt = f"{prompt}\n\n---\nJob Description:\n{text}\n---\nJSON Output:"
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
+        {"role": "user", "content": full_prompt},
+    ]
+    response_format = {"type": "json_object"}
+    cache_key = None
+    if llm_cache is not None:
+        cache_key = llm_cache.make_key(LLM_MODEL, messages, response_format=response_format)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return json.loads(cached)
     delay_seconds = 1
     for _ in range(retries):
         try:
             res = client.chat.completions.create(
                 model=LLM_MODEL,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant designed to output JSON."},
-                    {"role": "user", "content": full_prompt},
-                ],
-                response_format={"type": "json_object"},
+                messages=messages,
+                response_format=response_format,
             )
-            return json.loads(res.choices[0].message.content)
+            content = res.choices[0].message.content
+            parsed = json.loads(content)
+            if cache_key:
+                llm_cache.set(cache_key, LLM_MODEL, content)
+            return parsed
         except RateLimitError:
             time.sleep(delay_seconds)
             delay_seconds *= 2
@@ -24,6 +24,13 @@ HF_TOKEN_ENV = "HF_TOKEN"
 
 # Matching / thresholds
 REJECTION_THRESHOLD = 50.0  # out of 100
+TOP_K_JOBS = 5  # LLM-score only the K most similar jobs per resume
+
+# Cascade: cheap stage-1 ranking gates which of the top-K pairs reach the LLM
+CASCADE_ENABLED = True
+CASCADE_SEMANTIC_FLOOR = 0.75  # semantic score (0..1) that always earns an LLM call
+CASCADE_TOP_N = 2  # stage-1 best N jobs always get an LLM call
+CASCADE_KEYWORD_WEIGHT = 0.3  # stage-1 = (1-w)*semantic + w*keyword overlap
 
 # ChromaDB (optional)
 CHROMA_PERSIST_DIR = os.path.join(BASE_DIR, ".chroma")
@@ -49,6 +56,15 @@ CONFIG = {
     "thresholds": {
         "rejection": REJECTION_THRESHOLD,
     },
+    "matching": {
+        "top_k_jobs": TOP_K_JOBS,
+        "cascade": {
+            "enabled": CASCADE_ENABLED,
+            "semantic_floor": CASCADE_SEMANTIC_FLOOR,
+            "top_n": CASCADE_TOP_N,
+            "keyword_weight": CASCADE_KEYWORD_WEIGHT,
+        },
+    },
 }
 
 
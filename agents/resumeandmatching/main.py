@@ -1,30 +1,37 @@
 import os
 import sys
-import time
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Optional
 
 from dotenv import load_dotenv
-from pymongo import MongoClient
+from pymongo import MongoClient, UpdateOne
 from bson.objectid import ObjectId
 from datetime import datetime
-import hashlib
 from langgraph.graph import StateGraph, START, END
 
 # Robust imports so this file can be run as a module or script
 try:
     from .config import CONFIG  # type: ignore
     from .utils.resume_parser import parse_resume  # type: ignore
-    from .utils.matcher import semantic_match  # type: ignore
-    from .utils.llm_scorer import compute_score  # type: ignore
+    from .utils.text_cache import file_sha256, get_or_extract_many  # type: ignore
+    from .utils.matcher import semantic_match, get_embeddings, semantic_match_matrix  # type: ignore
+    from .utils.jd_embeddings import get_job_embeddings, job_text  # type: ignore
+    from .utils.vector_index import get_vector_index  # type: ignore
+    from .utils.cascade import stage1_scores, select_for_llm  # type: ignore
+    from .utils.watcher import ResumeWatcher  # type: ignore
+    from .utils.llm_scorer import score_many  # type: ignore
     from .utils.database import get_session_factory, upsert_candidate, get_candidate_by_hash  # type: ignore
 except Exception:
     try:
         from agents.resumeandmatching.config import CONFIG  # type: ignore
         from agents.resumeandmatching.utils.resume_parser import parse_resume  # type: ignore
-        from agents.resumeandmatching.utils.matcher import semantic_match  # type: ignore
-        from agents.resumeandmatching.utils.llm_scorer import compute_score  # type: ignore
-        from agents.resumeandmatching.utils.llm_scorer import compute_score  # type: ignore
+        from agents.resumeandmatching.utils.text_cache import file_sha256, get_or_extract_many  # type: ignore
+        from agents.resumeandmatching.utils.matcher import semantic_match, get_embeddings, semantic_match_matrix  # type: ignore
+        from agents.resumeandmatching.utils.jd_embeddings import get_job_embeddings, job_text  # type: ignore
+        from agents.resumeandmatching.utils.vector_index import get_vector_index  # type: ignore
+        from agents.resumeandmatching.utils.cascade import stage1_scores, select_for_llm  # type: ignore
+        from agents.resumeandmatching.utils.watcher import ResumeWatcher  # type: ignore
+        from agents.resumeandmatching.utils.llm_scorer import score_many  # type: ignore
         from agents.resumeandmatching.utils.database import get_session_factory, upsert_candidate, get_candidate_by_hash  # type: ignore
     except Exception:
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -32,8 +39,13 @@ except Exception:
             sys.path.append(current_dir)
         from config import CONFIG  # type: ignore
         from utils.resume_parser import parse_resume  # type: ignore
-        from utils.matcher import semantic_match  # type: ignore
-        from utils.llm_scorer import compute_score  # type: ignore
+        from utils.text_cache import file_sha256, get_or_extract_many  # type: ignore
+        from utils.matcher import semantic_match, get_embeddings, semantic_match_matrix  # type: ignore
+        from utils.jd_embeddings import get_job_embeddings, job_text  # type: ignore
+        from utils.vector_index import get_vector_index  # type: ignore
+        from utils.cascade import stage1_scores, select_for_llm  # type: ignore
+        from utils.watcher import ResumeWatcher  # type: ignore
+        from utils.llm_scorer import score_many  # type: ignore
         from utils.database import get_session_factory, upsert_candidate, get_candidate_by_hash  # type: ignore
 
 
@@ -49,28 +61,124 @@ class AgentState:
     current_resume_text: Optional[str] = None
     shortlisted: List[Dict] = field(default_factory=list)
     rejected_count: int = 0
+    # Filled once per batch by embed_batch_node
+    resume_texts: Dict[str, str] = field(default_factory=dict)
+    resume_hashes: Dict[str, Optional[str]] = field(default_factory=dict)
+    job_embeddings: Optional[Any] = None  # np.ndarray aligned with jobs
+    semantic_scores: Dict[str, Dict[str, float]] = field(default_factory=dict)  # path -> {job_id: sem}
+    # LLM calls made / skipped (vs. scoring every job) in this batch
+    llm_calls: int = 0
+    llm_calls_avoided: int = 0
+    # Application score updates, sent to Mongo in one bulk_write per batch
+    mongo_updates: List[Any] = field(default_factory=list)
+
+
+_mongo_client: Optional[MongoClient] = None
+
+
+def get_mongo_client() -> Optional[MongoClient]:
+    """Process-wide MongoClient (it pools connections); None if the URI is unset."""
+    global _mongo_client
+    if _mongo_client is None:
+        uri = os.getenv(CONFIG["env"]["mongodb_uri_env"]) or ""
+        if not uri:
+            return None
+        _mongo_client = MongoClient(uri)
+    return _mongo_client
 
 
 def fetch_jobs_node(state: AgentState) -> AgentState:
-    uri = os.getenv(CONFIG["env"]["mongodb_uri_env"]) or ""
+    client = get_mongo_client()
     jobs: List[Dict] = []
-    if not uri:
+    if client is None:
         print("Warning: MONGODB_URI not set. Proceeding with no jobs.")
     else:
         try:
-            client = MongoClient(uri)
             db = client["profiles"]
             col = db["json_files"]
             for doc in col.find({"approved": True}):
                 jobs.append({
                     "_id": str(doc.get("_id")),
                     "title": doc.get("job_title") or doc.get("title"),
-                    "description": doc.get("responsibilities") or doc.get("summary") or "",
+                    "description": job_text(doc),
                     "raw": doc,
                 })
         except Exception as exc:
             print(f"Warning: Failed to fetch jobs from MongoDB: {exc}")
     state.jobs = jobs
+    state.job_embeddings = None
+    if jobs:
+        # Reuse stored JD vectors; only new or edited JDs are re-embedded
+        session = get_session_factory(CONFIG["db"]["sqlalchemy_url"])()
+        try:
+            state.job_embeddings = get_job_embeddings(session, jobs, CONFIG["models"]["sbert"])
+        except Exception as exc:
+            print(f"Warning: Failed to load JD embeddings: {exc}")
+        finally:
+            session.close()
+    return state
+
+
+def _top_k(sem_by_job: Dict[str, float], k: int) -> Dict[str, float]:
+    best = sorted(sem_by_job.items(), key=lambda kv: kv[1], reverse=True)[:k]
+    return dict(best)
+
+
+def embed_batch_node(state: AgentState) -> AgentState:
+    """Parse every pending resume and retrieve its top-K jobs in one batch.
+
+    Resumes are encoded once and JD vectors come from the persistent store
+    loaded in fetch_jobs_node. Both are kept in the vector index under
+    CHROMA_PERSIST_DIR: the job collection answers the top-K job query per
+    resume, and the resume collection (keyed by path) serves top-K resumes
+    per job. Without stored JD vectors the full resume x job cosine matrix
+    is computed instead.
+    """
+    paths = [os.path.abspath(p) for p in state.resumes]
+    # Cached texts are reused by file hash; new PDFs are extracted in parallel
+    missing = [p for p in paths if p not in state.resume_texts]
+    if missing:
+        session = get_session_factory(CONFIG["db"]["sqlalchemy_url"])()
+        try:
+            for path, digest, text in get_or_extract_many(session, missing):
+                state.resume_texts[path] = text
+                state.resume_hashes[path] = digest
+        finally:
+            session.close()
+    scored_paths = [p for p in paths if state.resume_texts.get(p)]
+    unreadable = [p for p in paths if not state.resume_texts.get(p)]
+    if unreadable:
+        # A re-processed file that no longer yields text loses its old vector
+        try:
+            get_vector_index(CONFIG["paths"]["chroma"]).remove_resumes(unreadable)
+        except Exception as exc:
+            print(f"Warning: failed to update resume index: {exc}")
+    if not state.jobs:
+        return state
+    if not scored_paths:
+        return state
+    top_k = CONFIG["matching"]["top_k_jobs"]
+    job_ids = [job["_id"] for job in state.jobs]
+    try:
+        resume_texts = [state.resume_texts[p] for p in scored_paths]
+        if state.job_embeddings is not None:
+            resume_embs = get_embeddings(resume_texts, CONFIG["models"]["sbert"])
+            index = get_vector_index(CONFIG["paths"]["chroma"])
+            index.sync_jobs(job_ids, state.job_embeddings)
+            index.upsert_resumes(scored_paths, resume_embs)
+            for path, emb in zip(scored_paths, resume_embs):
+                state.semantic_scores[path] = dict(index.top_jobs_for_resume(emb, top_k))
+        else:
+            matrix = semantic_match_matrix(
+                resume_texts,
+                [job.get("description", "") for job in state.jobs],
+                CONFIG["models"]["sbert"],
+            )
+            for path, row in zip(scored_paths, matrix):
+                state.semantic_scores[path] = _top_k(dict(zip(job_ids, (float(v) for v in row))), top_k)
+    except Exception as exc:
+        # Fall back to per-pair semantic_match in score_against_jobs_node
+        print(f"Warning: batch embedding failed: {exc}")
     return state
 
 
@@ -78,7 +186,10 @@ def pick_next_resume_node(state: AgentState) -> AgentState:
     if not state.resumes:
         return state
     state.current_resume_path = os.path.abspath(state.resumes.pop(0))
-    state.current_resume_text = parse_resume(state.current_resume_path) or ""
+    text = state.resume_texts.pop(state.current_resume_path, None)
+    if text is None:
+        text = parse_resume(state.current_resume_path) or ""
+    state.current_resume_text = text
     return state
 
 
@@ -86,21 +197,16 @@ def score_against_jobs_node(state: AgentState) -> AgentState:
     if not state.current_resume_text:
         return state
     threshold = CONFIG["thresholds"]["rejection"]
-    session_factory = get_session_factory(CONFIG["db"]["sqlalchemy_url"])
-    session = session_factory()
+    session = get_session_factory(CONFIG["db"]["sqlalchemy_url"])()
 
     best_score = -1.0
     best_job_id = None
     email = os.path.basename(state.current_resume_path).split("_")[0] if state.current_resume_path else "unknown@example.com"
     
-    # Calculate hash
-    file_hash = None
-    if state.current_resume_path and os.path.exists(state.current_resume_path):
-        try:
-            with open(state.current_resume_path, "rb") as f:
-                file_hash = hashlib.sha256(f.read()).hexdigest()
-        except Exception as e:
-            print(f"Warning: Failed to hash resume: {e}")
+    # Hash computed when the text was extracted / looked up in embed_batch_node
+    file_hash = state.resume_hashes.pop(state.current_resume_path, None) if state.current_resume_path else None
+    if file_hash is None and state.current_resume_path and os.path.exists(state.current_resume_path):
+        file_hash = file_sha256(state.current_resume_path)
 
     # Check for existing score
     existing_candidate = None
@@ -114,44 +220,53 @@ def score_against_jobs_node(state: AgentState) -> AgentState:
     else:
         # Compute score if not cached
         if state.jobs:
-            for job in state.jobs:
-                jd_text = job.get("description", "")
+            # Semantic scores (0..1) of the top-K jobs, precomputed by embed_batch_node
+            candidates = state.semantic_scores.pop(state.current_resume_path, None)
+            if candidates is None:
+                candidates = _top_k({
+                    job["_id"]: semantic_match(state.current_resume_text, job.get("description", ""), CONFIG["models"]["sbert"])
+                    for job in state.jobs
+                }, CONFIG["matching"]["top_k_jobs"])
+            jd_texts = {job["_id"]: job.get("description", "") for job in state.jobs}
+            candidates = {job_id: sem for job_id, sem in candidates.items() if job_id in jd_texts}
+            to_score = list(candidates)
+            cascade = CONFIG["matching"]["cascade"]
+            if cascade["enabled"]:
+                # Stage 1: semantic + keyword ranking; stage 2: LLM only for the survivors
+                ranked = stage1_scores(state.current_resume_text, candidates, jd_texts, cascade["keyword_weight"])
+                to_score = select_for_llm(ranked, candidates, cascade["semantic_floor"], cascade["top_n"])
+            state.llm_calls += len(to_score)
+            state.llm_calls_avoided += len(state.jobs) - len(to_score)
+            # All surviving pairs are scored concurrently on the shared client
+            llm_scores = score_many([(state.current_resume_text, jd_texts[job_id]) for job_id in to_score], CONFIG["models"]["llm"])  # 0..100
+            for job_id, llm in zip(to_score, llm_scores):
                 # combine semantic and llm
-                sem = semantic_match(state.current_resume_text, jd_text, CONFIG["models"]["sbert"])  # 0..1
-                llm = compute_score(state.current_resume_text, jd_text, CONFIG["models"]["llm"])  # 0..100
+                sem = candidates[job_id]
                 print(f"DEBUG: Semantic Score: {sem:.4f}, LLM Score: {llm:.4f}")
                 score = 0.5 * (sem * 100.0) + 0.5 * llm
                 if score > best_score:
                     best_score = score
-                    best_job_id = job.get("_id")
+                    best_job_id = job_id
         else:
             best_score = 0.0
             best_job_id = None
 
     if best_score >= threshold:
         upsert_candidate(session, email=email, resume_path=state.current_resume_path, score=best_score, job_id=best_job_id, resume_hash=file_hash)
-        # Also upsert into MongoDB for visibility in the main app
-        try:
-            mongo_uri = os.getenv(CONFIG["env"]["mongodb_uri_env"]) or ""
-            if mongo_uri and state.current_resume_path:
-                mclient = MongoClient(mongo_uri)
-                mdb = mclient["profiles"]
-                applications = mdb.get_collection("applications")
-                # Update the original apply document by matching the stored resume path
-                filter_doc = {"resume_path": state.current_resume_path}
-                update_set = {
-                    "score": float(max(0.0, min(100.0, best_score)))
-                }
-                # Optionally attach job_id if resolvable
-                if best_job_id:
-                    try:
-                        update_set["job_id"] = ObjectId(best_job_id)
-                    except Exception:
-                        update_set["job_id"] = best_job_id
-                applications.update_one(filter_doc, {"$set": update_set}, upsert=False)
-        except Exception as _mongo_exc:
-            # Non-fatal: keep processing even if Mongo write fails
-            print(f"Warning: failed to upsert score into MongoDB: {_mongo_exc}")
+        # Also update MongoDB for visibility in the main app (flushed per batch)
+        if state.current_resume_path:
+            # Update the original apply document by matching the stored resume path
+            filter_doc = {"resume_path": state.current_resume_path}
+            update_set = {
+                "score": float(max(0.0, min(100.0, best_score)))
+            }
+            # Optionally attach job_id if resolvable
+            if best_job_id:
+                try:
+                    update_set["job_id"] = ObjectId(best_job_id)
+                except Exception:
+                    update_set["job_id"] = best_job_id
+            state.mongo_updates.append(UpdateOne(filter_doc, {"$set": update_set}, upsert=False))
         if state.shortlisted is None:
             state.shortlisted = []
         state.shortlisted.append({"email": email, "score": round(best_score, 2), "job_id": best_job_id})
@@ -164,41 +279,72 @@ def score_against_jobs_node(state: AgentState) -> AgentState:
     return state
 
 
+def flush_scores_node(state: AgentState) -> AgentState:
+    if not state.mongo_updates:
+        return state
+    client = get_mongo_client()
+    try:
+        if client is not None:
+            client["profiles"]["applications"].bulk_write(state.mongo_updates, ordered=False)
+    except Exception as _mongo_exc:
+        # Non-fatal: scores are already stored in the local DB
+        print(f"Warning: failed to upsert scores into MongoDB: {_mongo_exc}")
+    state.mongo_updates = []
+    return state
+
+
 def more_resumes_condition(state: AgentState) -> bool:
     return len(state.resumes) > 0
 
 
+def build_graph():
+    workflow = StateGraph(AgentState)
+    workflow.add_node("fetch_jobs", fetch_jobs_node)
+    workflow.add_node("embed_batch", embed_batch_node)
+    workflow.add_node("pick_resume", pick_next_resume_node)
+    workflow.add_node("score_resume", score_against_jobs_node)
+    workflow.add_node("flush_scores", flush_scores_node)
+
+    workflow.add_edge(START, "fetch_jobs")
+    workflow.add_edge("fetch_jobs", "embed_batch")
+    workflow.add_edge("embed_batch", "pick_resume")
+    workflow.add_edge("pick_resume", "score_resume")
+    # loop until resumes empty
+    workflow.add_conditional_edges(
+        "score_resume",
+        lambda s: "more" if more_resumes_condition(s) else "done",
+        {"more": "pick_resume", "done": "flush_scores"},
+    )
+    workflow.add_edge("flush_scores", END)
+    return workflow.compile()
+
+
+_graph = None
+
+
+def get_graph():
+    # Compiled once per process and reused for every batch
+    global _graph
+    if _graph is None:
+        _graph = build_graph()
+    return _graph
+
+
 def run_agent():
-    resumes_dir = CONFIG["paths"]["resumes"]
-    # Watch mode: process new files continuously
-    seen = set()
-    while True:
-        all_pdfs = [os.path.join(resumes_dir, f) for f in os.listdir(resumes_dir) if f.lower().endswith(".pdf")]
-        new_pdfs = [p for p in all_pdfs if p not in seen]
-        if not new_pdfs:
-            time.sleep(2)
-            continue
-        for p in new_pdfs:
-            seen.add(p)
-        state = AgentState(resumes=new_pdfs, jobs=[], shortlisted=[], rejected_count=0)
-
-        workflow = StateGraph(AgentState)
-        workflow.add_node("fetch_jobs", fetch_jobs_node)
-        workflow.add_node("pick_resume", pick_next_resume_node)
-        workflow.add_node("score_resume", score_against_jobs_node)
-
-        workflow.add_edge(START, "fetch_jobs")
-        workflow.add_edge("fetch_jobs", "pick_resume")
-        workflow.add_edge("pick_resume", "score_resume")
-        # loop until resumes empty
-        workflow.add_conditional_edges(
-            "score_resume",
-            lambda s: "more" if more_resumes_condition(s) else "done",
-            {"more": "pick_resume", "done": END},
-        )
-
-        graph = workflow.compile()
+    graph = get_graph()
+    # Watch mode: filesystem events (or a polling fallback) feed new files;
+    # the processed-file ledger in the SQLite DB survives restarts
+    watcher = ResumeWatcher(CONFIG["paths"]["resumes"], get_session_factory(CONFIG["db"]["sqlalchemy_url"]))
+    index = get_vector_index(CONFIG["paths"]["chroma"])
+    for new_pdfs in watcher.batches():
+        # Resumes deleted from the folder leave the per-job index
+        try:
+            index.prune_resumes()
+        except Exception as exc:
+            print(f"Warning: failed to prune resume index: {exc}")
+        state = AgentState(resumes=list(new_pdfs), jobs=[], shortlisted=[], rejected_count=0)
         final = graph.invoke(state)
+        watcher.mark_processed(new_pdfs)
 
         # Summary log
         shortlisted = getattr(final, "shortlisted", None)
@@ -207,6 +353,11 @@ def run_agent():
         print("Shortlisted candidates (batch):")
         for c in shortlisted or []:
             print(f" - {c['email']}: {c['score']} (job {c['job_id']})")
+        if isinstance(final, dict):
+            llm_calls, avoided = final.get("llm_calls", 0), final.get("llm_calls_avoided", 0)
+        else:
+            llm_calls, avoided = final.llm_calls, final.llm_calls_avoided
+        print(f"LLM scoring calls (batch): {llm_calls} made, {avoided} avoided")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+from typing import Dict, List, Tuple
+
+
+def keyword_overlap(resume_text: str, job_text: str) -> float:
+    """Fraction of distinct JD words that also appear in the resume (0..1)."""
+    jd_words = set(job_text.lower().split())
+    if not jd_words:
+        return 0.0
+    return len(set(resume_text.lower().split()) & jd_words) / len(jd_words)
+
+
+def stage1_scores(resume_text: str, semantic: Dict[str, float], jd_texts: Dict[str, str], keyword_weight: float) -> List[Tuple[str, float]]:
+    """Cheap stage-1 ranking: blend of SBERT similarity and keyword overlap, best first."""
+    ranked = []
+    for job_id, sem in semantic.items():
+        kw = keyword_overlap(resume_text, jd_texts.get(job_id, ""))
+        ranked.append((job_id, (1.0 - keyword_weight) * sem + keyword_weight * kw))
+    ranked.sort(key=lambda kv: kv[1], reverse=True)
+    return ranked
+
+
+def select_for_llm(ranked: List[Tuple[str, float]], semantic: Dict[str, float], semantic_floor: float, top_n: int) -> List[str]:
+    """Stage-2 gate: jobs in the stage-1 top-N or whose semantic score clears the floor."""
+    return [
+        job_id for rank, (job_id, _) in enumerate(ranked)
+        if rank < top_n or semantic[job_id] >= semantic_floor
+    ]
@@ -1,5 +1,7 @@
-from typing import Optional
-from sqlalchemy import create_engine, String, Float, Text, Column
+import threading
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import create_engine, String, Float, Integer, Text, Column, LargeBinary, inspect, text
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
 from sqlalchemy import UniqueConstraint
 
@@ -21,17 +23,52 @@ class JobDescription(Base):
     id = Column(String, primary_key=True)  # use Mongo _id string
     title = Column(String, nullable=True)
     description = Column(Text, nullable=True)
-    embedding = Column(Text, nullable=True)  # store as JSON string if desired
+    embedding = Column(LargeBinary, nullable=True)  # raw float32 vector bytes
+    content_hash = Column(String, nullable=True)  # sha256 of model + embedded text
+
+
+class ResumeText(Base):
+    __tablename__ = "resume_texts"
+    resume_hash = Column(String, primary_key=True)  # sha256 of the PDF bytes
+    text = Column(LargeBinary, nullable=False)  # zlib-compressed normalized UTF-8 text
+
+
+class ProcessedResume(Base):
+    __tablename__ = "processed_resumes"
+    path = Column(Text, primary_key=True)  # absolute path in the resumes folder
+    size = Column(Integer, nullable=False)
+    mtime = Column(Float, nullable=False)
+    processed_at = Column(Float, nullable=False)
 
 
 def get_engine(sqlalchemy_url: str):
     return create_engine(sqlalchemy_url, echo=False, future=True)
 
 
+def _migrate(engine) -> None:
+    # Add columns introduced after the table was first created
+    columns = {c["name"] for c in inspect(engine).get_columns("job_descriptions")}
+    if "content_hash" not in columns:
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE job_descriptions ADD COLUMN content_hash VARCHAR"))
+
+
+_session_factories: Dict[str, sessionmaker] = {}
+_session_factories_lock = threading.Lock()
+
+
 def get_session_factory(sqlalchemy_url: str):
-    engine = get_engine(sqlalchemy_url)
-    Base.metadata.create_all(engine)
-    return sessionmaker(bind=engine, expire_on_commit=False, class_=Session)
+    # One engine (and connection pool) per URL for the life of the process;
+    # schema creation and migrations only run the first time
+    with _session_factories_lock:
+        factory = _session_factories.get(sqlalchemy_url)
+        if factory is None:
+            engine = get_engine(sqlalchemy_url)
+            Base.metadata.create_all(engine)
+            _migrate(engine)
+            factory = sessionmaker(bind=engine, expire_on_commit=False, class_=Session)
+            _session_factories[sqlalchemy_url] = factory
+        return factory
 
 
 def upsert_candidate(session: Session, *, email: str, resume_path: str, score: float, job_id: Optional[str], resume_hash: Optional[str] = None) -> Candidate:
@@ -53,16 +90,51 @@ def get_candidate_by_hash(session: Session, email: str, resume_hash: str) -> Opt
     return session.query(Candidate).filter_by(email=email, resume_hash=resume_hash).one_or_none()
 
 
-def upsert_job_description(session: Session, *, id: str, title: Optional[str], description: Optional[str], embedding: Optional[str]) -> JobDescription:
+def upsert_job_description(session: Session, *, id: str, title: Optional[str], description: Optional[str], embedding: Optional[bytes], content_hash: Optional[str] = None, commit: bool = True) -> JobDescription:
     obj = session.query(JobDescription).filter_by(id=id).one_or_none()
     if obj is None:
-        obj = JobDescription(id=id, title=title, description=description, embedding=embedding)
+        obj = JobDescription(id=id, title=title, description=description, embedding=embedding, content_hash=content_hash)
         session.add(obj)
     else:
         obj.title = title
         obj.description = description
         obj.embedding = embedding
-    session.commit()
+        obj.content_hash = content_hash
+    if commit:
+        session.commit()
     return obj
 
 
+def get_job_descriptions(session: Session, ids: List[str]) -> Dict[str, JobDescription]:
+    if not ids:
+        return {}
+    rows = session.query(JobDescription).filter(JobDescription.id.in_(ids)).all()
+    return {row.id: row for row in rows}
+
+
+def get_resume_texts(session: Session, hashes: List[str]) -> Dict[str, str]:
+    if not hashes:
+        return {}
+    rows = session.query(ResumeText).filter(ResumeText.resume_hash.in_(hashes)).all()
+    return {row.resume_hash: zlib.decompress(row.text).decode("utf-8") for row in rows}
+
+
+def save_resume_text(session: Session, resume_hash: str, text: str, commit: bool = True) -> None:
+    session.merge(ResumeText(resume_hash=resume_hash, text=zlib.compress(text.encode("utf-8"))))
+    if commit:
+        session.commit()
+
+
+def get_processed_resumes(session: Session, paths: List[str]) -> Dict[str, Tuple[int, float]]:
+    found: Dict[str, Tuple[int, float]] = {}
+    # Chunked to stay under SQLite's bound-parameter limit on large folders
+    for i in range(0, len(paths), 500):
+        rows = session.query(ProcessedResume).filter(ProcessedResume.path.in_(paths[i:i + 500])).all()
+        found.update({row.path: (row.size, row.mtime) for row in rows})
+    return found
+
+
+def mark_resumes_processed(session: Session, entries: Sequence[Tuple[str, int, float]], processed_at: float) -> None:
+    for path, size, mtime in entries:
+        session.merge(ProcessedResume(path=path, size=size, mtime=mtime, processed_at=processed_at))
+    session.commit()
@@ -0,0 +1,77 @@
+import hashlib
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .matcher import get_embeddings
+from .database import get_job_descriptions, upsert_job_description
+
+
+def job_text(doc: Dict) -> str:
+    """Text of a Mongo job profile that is embedded and matched against."""
+    return doc.get("responsibilities") or doc.get("summary") or doc.get("description") or ""
+
+
+def content_hash(text: str, model_name: str) -> str:
+    # Model is part of the key so switching SBERT models invalidates old vectors
+    return hashlib.sha256(f"{model_name}\n{text}".encode("utf-8")).hexdigest()
+
+
+def embedding_to_blob(emb: np.ndarray) -> bytes:
+    return np.asarray(emb, dtype=np.float32).tobytes()
+
+
+def blob_to_embedding(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+def get_job_embeddings(session: Session, jobs: List[Dict], model_name: str) -> np.ndarray:
+    """Return one normalised embedding row per job, aligned with ``jobs``.
+
+    Stored vectors are reused when the job's content hash is unchanged; only new
+    or edited JDs are encoded (in a single batch) and written back.
+    """
+    ids = [str(job["_id"]) for job in jobs]
+    texts = [job.get("description") or "" for job in jobs]
+    hashes = [content_hash(t, model_name) for t in texts]
+    stored = get_job_descriptions(session, ids)
+
+    rows: List[Optional[np.ndarray]] = []
+    stale: List[int] = []
+    for i, job_id in enumerate(ids):
+        row = stored.get(job_id)
+        if row is not None and row.embedding and row.content_hash == hashes[i]:
+            rows.append(blob_to_embedding(row.embedding))
+        else:
+            rows.append(None)
+            stale.append(i)
+
+    if stale:
+        fresh = get_embeddings([texts[i] for i in stale], model_name)
+        for i, emb in zip(stale, fresh):
+            rows[i] = emb
+            upsert_job_description(
+                session,
+                id=ids[i],
+                title=jobs[i].get("title"),
+                description=texts[i],
+                embedding=embedding_to_blob(emb),
+                content_hash=hashes[i],
+                commit=False,
+            )
+        session.commit()
+
+    if not rows:
+        return np.zeros((0, 0), dtype=np.float32)
+    return np.vstack(rows).astype(np.float32, copy=False)
+
+
+def embed_job_profile(session: Session, doc: Dict, model_name: str) -> np.ndarray:
+    """Embed (or reuse the stored embedding of) a single approved job profile."""
+    job = {
+        "_id": str(doc.get("_id")),
+        "title": doc.get("job_title") or doc.get("title"),
+        "description": job_text(doc),
+    }
+    return get_job_embeddings(session, [job], model_name)[0]
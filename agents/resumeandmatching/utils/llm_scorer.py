@@ -1,8 +1,13 @@
 import os
 import json
 import time
-from typing import Optional
-from openai import OpenAI
+import random
+import asyncio
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from openai import AsyncOpenAI, APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
 
 # Try to import PromptManager, fallback to default if not available
 try:
@@ -14,50 +19,223 @@ except ImportError:
     except ImportError:
         prompt_manager = None
 
-def compute_score(resume_text: str, job_description_text: str, model: str, hf_token_env: str = "HF_TOKEN") -> float:
-    token = os.environ.get(hf_token_env)
-    if not token:
-        # Fallback: simple heuristic using length overlap when no token present
-        common = len(set(resume_text.lower().split()) & set(job_description_text.lower().split()))
-        total = len(set(job_description_text.lower().split())) or 1
-        return min(100.0, 100.0 * common / total)
-
-    client = OpenAI(base_url="https://router.huggingface.co/v1", api_key=token, timeout=60.0)
-    
-    # Get prompt from PromptManager or use fallback
+try:
+    from backend.llm_cache import llm_cache
+except ImportError:
+    llm_cache = None
+
+HF_BASE_URL = "https://router.huggingface.co/v1"
+
+# Scheduling defaults for the shared scoring client
+MAX_IN_FLIGHT = 8  # concurrent requests
+RATE_PER_SEC = 4.0  # token-bucket refill rate (requests / second)
+BURST = 8  # token-bucket capacity
+MAX_ATTEMPTS = 5
+BACKOFF_BASE = 1.0  # seconds, doubled per attempt
+BACKOFF_CAP = 30.0
+
+# Request parameters that affect the output (part of the cache key)
+SCORING_PARAMS = {"response_format": {"type": "json_object"}, "temperature": 0.0, "seed": 42}
+
+
+def _heuristic_score(resume_text: str, job_description_text: str) -> float:
+    # Fallback: simple heuristic using length overlap when no token present
+    common = len(set(resume_text.lower().split()) & set(job_description_text.lower().split()))
+    total = len(set(job_description_text.lower().split())) or 1
+    return min(100.0, 100.0 * common / total)
+
+
+# Hardcoded fallback if PromptManager fails
+DEFAULT_SCORING_PROMPT = (
+    "You are an expert HR evaluator. Score the candidate's resume against the job description.\n"
+    "Return a strict JSON object with keys: score (0-100 float), reasoning (string).\n\n"
+    "Job Description:\n{jd}\n\nResume:\n{resume}\n\nJSON:"
+)
+
+
+def _scoring_prompt() -> str:
+    """Active scoring prompt template (looked up once per batch)"""
     prompt = None
     if prompt_manager:
         prompt = prompt_manager.get_prompt("Resume and Matching Agent", "scoring")
-    
-    if prompt:
-        formatted_prompt = prompt.format(jd=job_description_text, resume=resume_text)
-    else:
-        # Hardcoded fallback if PromptManager fails
-        formatted_prompt = (
-            "You are an expert HR evaluator. Score the candidate's resume against the job description.\n"
-            "Return a strict JSON object with keys: score (0-100 float), reasoning (string).\n\n"
-            "Job Description:\n{jd}\n\nResume:\n{resume}\n\nJSON:" 
-        ).format(jd=job_description_text, resume=resume_text)
-
-    for _ in range(3):
+    return prompt or DEFAULT_SCORING_PROMPT
+
+
+def _build_prompt(template: str, resume_text: str, job_description_text: str) -> str:
+    return template.format(jd=job_description_text, resume=resume_text)
+
+
+def _parse_score(content: str) -> float:
+    data = json.loads(content)
+    score = float(data.get("score", 0.0))
+    return max(0.0, min(100.0, score))
+
+
+def _retry_after(exc: APIStatusError) -> Optional[float]:
+    """Seconds requested by a Retry-After / retry-after-ms header, if any."""
+    headers = exc.response.headers if exc.response is not None else {}
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000.0
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except ValueError:
+        pass  # HTTP-date form; fall back to exponential backoff
+    return None
+
+
+def _backoff(attempt: int) -> float:
+    # Full jitter: uniform in [0, base * 2^attempt], capped
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * (2 ** attempt)))
+
+
+class TokenBucket:
+    """Asyncio token bucket: ``rate`` tokens/second, at most ``capacity`` banked."""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+
+class AsyncLLMScorer:
+    """Concurrent resume/JD scorer sharing one pooled HTTP client.
+
+    Runs its own event loop on a daemon thread so synchronous callers (the
+    LangGraph nodes) can submit work while the connection pool stays alive
+    across calls. Up to ``max_in_flight`` requests run at once, throttled by a
+    token bucket; 429s honour Retry-After, other transient errors back off
+    exponentially with jitter. Responses are read from / written to the shared
+    LLM cache, and identical requests already in flight are awaited rather
+    than sent twice.
+    """
+
+    def __init__(self, model: str, api_key: str, max_in_flight: int = MAX_IN_FLIGHT, rate_per_sec: float = RATE_PER_SEC, burst: int = BURST):
+        self.model = model
+        self.api_key = api_key
+        self.max_in_flight = max_in_flight
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self._client: Optional[AsyncOpenAI] = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-scorer", daemon=True)
+        self._thread.start()
+        self._run(self._setup())
+
+    async def _setup(self) -> None:
+        # Created on the scorer loop so the pool and primitives bind to it
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=self.max_in_flight, max_keepalive_connections=self.max_in_flight),
+            timeout=60.0,
+        )
+        self._client = AsyncOpenAI(base_url=HF_BASE_URL, api_key=self.api_key, max_retries=0, http_client=http_client)
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self._bucket = TokenBucket(self.rate_per_sec, self.burst)
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _score_one(self, template: str, resume_text: str, job_description_text: str) -> float:
+        messages = [
+            {"role": "system", "content": "You output JSON only."},
+            {"role": "user", "content": _build_prompt(template, resume_text, job_description_text)},
+        ]
+        if llm_cache is None:
+            return await self._request(messages, None)
+        key = llm_cache.make_key(self.model, messages, **SCORING_PARAMS)
+        # Cache reads and writes are blocking SQLite calls; keep them off the loop
+        cached = await asyncio.get_running_loop().run_in_executor(None, llm_cache.get, key)
+        if cached is not None:
+            try:
+                return _parse_score(cached)
+            except Exception:
+                pass
+        if key in self._pending:
+            return await asyncio.shield(self._pending[key])
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
         try:
-            res = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You output JSON only."},
-                    {"role": "user", "content": formatted_prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.0,
-                seed=42,
-            )
-            content = res.choices[0].message.content
-            data = json.loads(content)
-            score = float(data.get("score", 0.0))
-            return max(0.0, min(100.0, score))
-        except Exception as e:
-            # print(f"DEBUG: Error in compute_score: {e}")
-            time.sleep(1.5)
-    return 0.0
+            score = await self._request(messages, key)
+            future.set_result(score)
+            return score
+        finally:
+            self._pending.pop(key, None)
+            if not future.done():
+                future.cancel()
+
+    async def _request(self, messages: List[Dict], cache_key: Optional[str]) -> float:
+        for attempt in range(MAX_ATTEMPTS):
+            delay = _backoff(attempt)
+            await self._bucket.acquire()
+            async with self._in_flight:
+                try:
+                    res = await self._client.chat.completions.create(
+                        model=self.model,
+                        messages=messages,
+                        **SCORING_PARAMS,
+                    )
+                    content = res.choices[0].message.content
+                    score = _parse_score(content)
+                    if cache_key:
+                        await asyncio.get_running_loop().run_in_executor(None, llm_cache.set, cache_key, self.model, content)
+                    return score
+                except RateLimitError as e:
+                    delay = _retry_after(e) or delay
+                except APIStatusError as e:
+                    if e.status_code < 500:
+                        return 0.0
+                except (APIConnectionError, APITimeoutError):
+                    pass
+                except Exception:
+                    # Malformed JSON etc.: retry like the synchronous scorer did
+                    pass
+            if attempt < MAX_ATTEMPTS - 1:
+                await asyncio.sleep(delay)
+        return 0.0
 
+    async def _score_all(self, template: str, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        return list(await asyncio.gather(*(self._score_one(template, r, j) for r, j in pairs)))
 
+    def score_many(self, pairs: Sequence[Tuple[str, str]]) -> List[float]:
+        if not pairs:
+            return []
+        # Prompt lookup hits SQLite; do it once here, off the event loop
+        return self._run(self._score_all(_scoring_prompt(), pairs))
+
+
+_scorers: Dict[Tuple[str, str], AsyncLLMScorer] = {}
+_scorers_lock = threading.Lock()
+
+
+def get_scorer(model: str, api_key: str) -> AsyncLLMScorer:
+    with _scorers_lock:
+        key = (model, api_key)
+        if key not in _scorers:
+            _scorers[key] = AsyncLLMScorer(model, api_key)
+        return _scorers[key]
+
+
+def score_many(pairs: Sequence[Tuple[str, str]], model: str, hf_token_env: str = "HF_TOKEN") -> List[float]:
+    """Score (resume_text, job_description_text) pairs concurrently; 0..100 each."""
+    token = os.environ.get(hf_token_env)
+    if not token:
+        return [_heuristic_score(r, j) for r, j in pairs]
+    return get_scorer(model, token).score_many(pairs)
+
+
+def compute_score(resume_text: str, job_description_text: str, model: str, hf_token_env: str = "HF_TOKEN") -> float:
+    return score_many([(resume_text, job_description_text)], model, hf_token_env)[0]
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 import numpy as np
 from sentence_transformers import SentenceTransformer
 from numpy.linalg import norm
@@ -6,6 +6,9 @@ from numpy.linalg import norm
 
 _model: Optional[SentenceTransformer] = None
 
+# Texts per forward pass when encoding a whole batch of resumes / JDs
+ENCODE_BATCH_SIZE = 64
+
 
 def _get_model(name: str) -> SentenceTransformer:
     global _model
@@ -20,11 +23,41 @@ def get_embedding(text: str, model_name: str) -> np.ndarray:
     return emb
 
 
+def get_embeddings(texts: List[str], model_name: str, batch_size: int = ENCODE_BATCH_SIZE) -> np.ndarray:
+    """Encode many texts in large batches; returns L2-normalised float32 rows."""
+    model = _get_model(model_name)
+    if not texts:
+        dim = model.get_sentence_embedding_dimension() or 0
+        return np.zeros((0, dim), dtype=np.float32)
+    embs = model.encode(
+        texts,
+        batch_size=batch_size,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
+    return embs.astype(np.float32, copy=False)
+
+
+def cosine_matrix(resume_embs: np.ndarray, job_embs: np.ndarray) -> np.ndarray:
+    """Resume x job similarity in [0,1] from normalised embeddings (one matmul)."""
+    if resume_embs.size == 0 or job_embs.size == 0:
+        return np.zeros((len(resume_embs), len(job_embs)), dtype=np.float32)
+    sims = resume_embs @ job_embs.T
+    # map cosine [-1,1] to [0,1]
+    return (np.clip(sims, -1.0, 1.0) + 1.0) / 2.0
+
+
+def semantic_match_matrix(resume_texts: List[str], job_texts: List[str], model_name: str) -> np.ndarray:
+    """Batched semantic_match: encodes every text once, scores every pair."""
+    resume_embs = get_embeddings(resume_texts, model_name)
+    job_embs = get_embeddings(job_texts, model_name)
+    return cosine_matrix(resume_embs, job_embs)
+
+
 def semantic_match(resume_text: str, job_text: str, model_name: str) -> float:
     a = get_embedding(resume_text, model_name)
     b = get_embedding(job_text, model_name)
     sim = float(np.dot(a, b) / (norm(a) * norm(b) + 1e-8))
     # map cosine [-1,1] to [0,1]
     return (sim + 1.0) / 2.0
-
-
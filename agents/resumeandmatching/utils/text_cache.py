@@ -0,0 +1,63 @@
+import hashlib
+import re
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .database import get_resume_texts, save_resume_text
+from .resume_parser import get_extraction_pool
+
+_BLANK_LINES = re.compile(r"\n{3,}")
+_SPACES = re.compile(r"[ \t\f\v]+")
+
+
+def file_sha256(path: str) -> Optional[str]:
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+    except OSError as exc:
+        print(f"Warning: Failed to hash resume {path}: {exc}")
+        return None
+
+
+def normalize_text(text: str) -> str:
+    text = text.replace("\x00", "").replace("\r\n", "\n").replace("\r", "\n")
+    text = "\n".join(_SPACES.sub(" ", line).strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def get_or_extract_many(session: Session, paths: Iterable[str]) -> Iterator[Tuple[str, Optional[str], str]]:
+    """Yield ``(path, sha256, text)``, extracting only PDFs not seen before.
+
+    Texts are cached by file hash, so the same PDF is parsed once across the
+    upload API, the matching agent and any re-scoring run. Files that fail to
+    extract yield an empty string and are not cached.
+    """
+    hashes: Dict[str, Optional[str]] = {p: file_sha256(p) for p in paths}
+    cached = get_resume_texts(session, [h for h in hashes.values() if h])
+    misses = []
+    for path, digest in hashes.items():
+        if digest and digest in cached:
+            yield path, digest, cached[digest]
+        else:
+            misses.append(path)
+    if not misses:
+        return
+    for path, text in get_extraction_pool().extract_many(misses):
+        digest = hashes[path]
+        if text is None:
+            yield path, digest, ""
+            continue
+        text = normalize_text(text)
+        if digest:
+            save_resume_text(session, digest, text)
+        yield path, digest, text
+
+
+def get_or_extract(session: Session, path: str) -> Tuple[Optional[str], str]:
+    for _, digest, text in get_or_extract_many(session, [path]):
+        return digest, text
+    return None, ""
@@ -0,0 +1,296 @@
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import chromadb  # optional: HNSW index
+except Exception:
+    chromadb = None
+
+
+# (id, similarity in [0,1]) pairs, best first
+Matches = List[Tuple[str, float]]
+
+
+def _to_unit(sims: np.ndarray) -> np.ndarray:
+    # map cosine [-1,1] to [0,1], same scale as semantic_match
+    return (np.clip(sims, -1.0, 1.0) + 1.0) / 2.0
+
+
+class _ChromaCollection:
+    """Chroma collection with cosine space (approximate HNSW search)."""
+
+    def __init__(self, client, name: str):
+        self.col = client.get_or_create_collection(name, metadata={"hnsw:space": "cosine"})
+
+    def ids(self) -> List[str]:
+        """Stored ids, oldest upsert first"""
+        res = self.col.get(include=["metadatas"])
+        added = [(m or {}).get("indexed_at", 0.0) for m in res["metadatas"]]
+        return [i for _, i in sorted(zip(added, res["ids"]), key=lambda pair: pair[0])]
+
+    def upsert(self, ids: Sequence[str], embs: np.ndarray) -> None:
+        if len(ids):
+            now = time.time()
+            self.col.upsert(
+                ids=list(ids),
+                embeddings=np.asarray(embs, dtype=np.float32).tolist(),
+                metadatas=[{"indexed_at": now}] * len(ids),
+            )
+
+    def delete(self, ids: Sequence[str]) -> None:
+        if len(ids):
+            self.col.delete(ids=list(ids))
+
+    def flush(self) -> None:
+        pass  # Chroma persists on every call
+
+    def refresh(self) -> None:
+        pass  # reads always see other processes' writes
+
+    def query(self, emb: np.ndarray, k: int) -> Matches:
+        n = min(k, self.col.count())
+        if n <= 0:
+            return []
+        res = self.col.query(query_embeddings=[np.asarray(emb, dtype=np.float32).tolist()], n_results=n, include=["distances"])
+        ids = res["ids"][0]
+        # chroma cosine distance is 1 - cos
+        sims = _to_unit(1.0 - np.asarray(res["distances"][0], dtype=np.float32))
+        return [(i, float(s)) for i, s in zip(ids, sims)]
+
+
+# Flat fallback switches from an exact scan to an IVF (coarse k-means) search
+# once a collection holds this many vectors
+IVF_MIN_ROWS = 4096
+IVF_NPROBE = 8  # clusters searched per query
+IVF_ITERATIONS = 10
+
+
+class _FlatCollection:
+    """NumPy index persisted as .npz; used when chromadb is unavailable.
+
+    Changes are kept in memory and written by ``flush`` (one write per batch,
+    none when nothing changed). Small collections are scanned exactly; large
+    ones are split into ~sqrt(n) k-means clusters and a query only scores the
+    ``IVF_NPROBE`` clusters whose centroids are closest.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._ids: List[str] = []
+        self._pos: Dict[str, int] = {}
+        self._embs = np.zeros((0, 0), dtype=np.float32)
+        self._dirty = False
+        self._ivf = None  # (centroids, list of row arrays), rebuilt after changes
+        self._mtime = None  # of the file last loaded or written
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            mtime = os.stat(self.path).st_mtime
+            data = np.load(self.path, allow_pickle=False)
+            self._ids = [str(i) for i in data["ids"]]
+            self._embs = data["embs"].astype(np.float32, copy=False)
+            self._pos = {i: n for n, i in enumerate(self._ids)}
+            self._ivf = None
+            self._mtime = mtime
+        except Exception as exc:
+            print(f"Warning: ignoring unreadable vector index {self.path}: {exc}")
+
+    def refresh(self) -> None:
+        """Reload if another process rewrote the file (readers outside the agent)"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if not self._dirty and mtime != self._mtime:
+            self._load()
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        tmp = self.path + ".tmp.npz"
+        np.savez(tmp, ids=np.asarray(self._ids, dtype=str), embs=self._embs)
+        os.replace(tmp, self.path)
+        self._mtime = os.stat(self.path).st_mtime
+        self._dirty = False
+
+    def ids(self) -> List[str]:
+        """Stored ids, oldest upsert first"""
+        return list(self._ids)
+
+    def upsert(self, ids: Sequence[str], embs: np.ndarray) -> None:
+        if not len(ids):
+            return
+        embs = np.asarray(embs, dtype=np.float32)
+        if self._embs.size == 0:
+            self._embs = np.zeros((0, embs.shape[1]), dtype=np.float32)
+        new_ids: List[str] = []
+        new_rows = []
+        changed = False
+        for i, emb in zip(ids, embs):
+            pos = self._pos.get(i)
+            if pos is None:
+                self._pos[i] = len(self._ids) + len(new_ids)
+                new_ids.append(i)
+                new_rows.append(emb)
+            elif pos < len(self._ids):
+                # Unchanged vectors (the common case for jobs) cost no write
+                if not np.array_equal(self._embs[pos], emb):
+                    self._embs[pos] = emb
+                    changed = True
+            else:
+                new_rows[pos - len(self._ids)] = emb
+        if new_ids:
+            self._ids.extend(new_ids)
+            self._embs = np.vstack([self._embs, np.vstack(new_rows)])
+            changed = True
+        if changed:
+            self._dirty = True
+            self._ivf = None
+
+    def delete(self, ids: Sequence[str]) -> None:
+        drop = {i for i in ids if i in self._pos}
+        if not drop:
+            return
+        keep = [n for n, i in enumerate(self._ids) if i not in drop]
+        self._ids = [self._ids[n] for n in keep]
+        self._embs = self._embs[keep]
+        self._pos = {i: n for n, i in enumerate(self._ids)}
+        self._dirty = True
+        self._ivf = None
+
+    def _build_ivf(self):
+        n = len(self._ids)
+        n_clusters = max(1, int(np.sqrt(n)))
+        rng = np.random.default_rng(0)
+        centroids = self._embs[rng.choice(n, n_clusters, replace=False)].copy()
+        for _ in range(IVF_ITERATIONS):
+            assign = np.argmax(self._embs @ centroids.T, axis=1)
+            for c in range(n_clusters):
+                members = self._embs[assign == c]
+                if len(members):
+                    mean = members.mean(axis=0)
+                    centroids[c] = mean / (np.linalg.norm(mean) or 1.0)
+        assign = np.argmax(self._embs @ centroids.T, axis=1)
+        lists = [np.flatnonzero(assign == c) for c in range(n_clusters)]
+        return centroids, lists
+
+    def _candidates(self, emb: np.ndarray, k: int) -> np.ndarray:
+        """Row positions to score exactly: everything, or the nearest clusters"""
+        if len(self._ids) < IVF_MIN_ROWS:
+            return np.arange(len(self._ids))
+        if self._ivf is None:
+            self._ivf = self._build_ivf()
+        centroids, lists = self._ivf
+        order = np.argsort(-(centroids @ emb))
+        rows = []
+        found = 0
+        for probed, c in enumerate(order):
+            # Keep probing past IVF_NPROBE until at least k candidates are found
+            if probed >= IVF_NPROBE and found >= k:
+                break
+            rows.append(lists[c])
+            found += len(lists[c])
+        return np.concatenate(rows)
+
+    def query(self, emb: np.ndarray, k: int) -> Matches:
+        n = min(k, len(self._ids))
+        if n <= 0:
+            return []
+        emb = np.asarray(emb, dtype=np.float32)
+        rows = self._candidates(emb, n)
+        sims = self._embs[rows] @ emb
+        n = min(n, len(rows))
+        top = np.argpartition(-sims, n - 1)[:n]
+        top = top[np.argsort(-sims[top])]
+        return [(self._ids[rows[t]], float(s)) for t, s in zip(top, _to_unit(sims[top]))]
+
+
+# Resume vectors kept for top-K resumes per job; the oldest are evicted first
+MAX_INDEXED_RESUMES = 20000
+
+
+class VectorIndex:
+    """Persistent resume / JD vector index under CHROMA_PERSIST_DIR.
+
+    Embeddings must be L2-normalised (as returned by matcher.get_embeddings).
+    Uses Chroma's HNSW index when chromadb is installed, otherwise a NumPy
+    index saved next to it. The job collection mirrors the approved jobs.
+    The resume collection is keyed by file path and bounded: re-processing
+    a file replaces its vector, deleted files are pruned, and past
+    ``max_resumes`` the least recently indexed resumes are evicted.
+    """
+
+    def __init__(self, persist_dir: str, max_resumes: int = MAX_INDEXED_RESUMES):
+        os.makedirs(persist_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self.max_resumes = max_resumes
+        self.backend = "flat"
+        if chromadb is not None:
+            try:
+                client = chromadb.PersistentClient(path=persist_dir)
+                self.jobs = _ChromaCollection(client, "jobs")
+                self.resumes = _ChromaCollection(client, "resumes")
+                self.backend = "chroma"
+                return
+            except Exception as exc:
+                print(f"Warning: Chroma unavailable, using flat index: {exc}")
+        self.jobs = _FlatCollection(os.path.join(persist_dir, "jobs.npz"))
+        self.resumes = _FlatCollection(os.path.join(persist_dir, "resumes.npz"))
+
+    def sync_jobs(self, ids: Sequence[str], embs: np.ndarray) -> None:
+        """Make the job collection match exactly the given (approved) jobs."""
+        with self._lock:
+            current = set(ids)
+            self.jobs.delete([i for i in self.jobs.ids() if i not in current])
+            self.jobs.upsert(ids, embs)
+            self.jobs.flush()
+
+    def upsert_resumes(self, paths: Sequence[str], embs: np.ndarray) -> None:
+        """Index freshly processed resumes, replacing any earlier vector per path."""
+        with self._lock:
+            # Drop first so a re-processed file counts as the newest entry
+            self.resumes.delete(paths)
+            self.resumes.upsert(paths, embs)
+            ids = self.resumes.ids()
+            if len(ids) > self.max_resumes:
+                self.resumes.delete(ids[:len(ids) - self.max_resumes])
+            self.resumes.flush()
+
+    def remove_resumes(self, paths: Sequence[str]) -> None:
+        with self._lock:
+            self.resumes.delete(paths)
+            self.resumes.flush()
+
+    def prune_resumes(self, exists: Callable[[str], bool] = os.path.exists) -> List[str]:
+        """Evict resumes whose files are gone; returns the evicted paths."""
+        with self._lock:
+            self.resumes.refresh()
+            gone = [p for p in self.resumes.ids() if not exists(p)]
+            self.resumes.delete(gone)
+            self.resumes.flush()
+            return gone
+
+    def top_jobs_for_resume(self, resume_emb: np.ndarray, k: int) -> Matches:
+        with self._lock:
+            return self.jobs.query(resume_emb, k)
+
+    def top_resumes_for_job(self, job_emb: np.ndarray, k: int) -> Matches:
+        with self._lock:
+            self.resumes.refresh()
+            return self.resumes.query(job_emb, k)
+
+
+_index: Dict[str, VectorIndex] = {}
+
+
+def get_vector_index(persist_dir: str) -> VectorIndex:
+    if persist_dir not in _index:
+        _index[persist_dir] = VectorIndex(persist_dir)
+    return _index[persist_dir]
@@ -0,0 +1,166 @@
+import os
+import queue
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from .database import get_processed_resumes, mark_resumes_processed
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # polling fallback below
+    FileSystemEventHandler = object
+    Observer = None
+
+
+SETTLE_SECONDS = 1.0  # a file must be quiet this long before it is picked up
+POLL_INTERVAL = 2.0  # only used when watchdog is not installed
+
+
+def _is_pdf(path: str) -> bool:
+    return path.lower().endswith(".pdf")
+
+
+def _stat(path: str) -> Optional[Tuple[int, float]]:
+    try:
+        st = os.stat(path)
+        return st.st_size, st.st_mtime
+    except OSError:
+        return None
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, events: "queue.Queue[str]"):
+        self.events = events
+
+    def _push(self, path: str) -> None:
+        if _is_pdf(path):
+            self.events.put(os.path.abspath(path))
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._push(event.src_path)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._push(event.src_path)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._push(event.dest_path)
+
+
+class ResumeWatcher:
+    """Yields batches of resume PDFs that have not been processed yet.
+
+    Files already in the ``processed_resumes`` ledger with the same size and
+    mtime are skipped, so a restart only picks up what arrived (or changed)
+    while the agent was down. New files come from filesystem events when
+    watchdog is installed, otherwise from a periodic directory scan; either
+    way a file is only handed out once it has stopped changing for
+    ``settle`` seconds, so half-written uploads are not parsed.
+    """
+
+    def __init__(self, directory: str, session_factory: Callable[[], Session], settle: float = SETTLE_SECONDS, poll_interval: float = POLL_INTERVAL):
+        self.directory = os.path.abspath(directory)
+        self.session_factory = session_factory
+        self.settle = settle
+        self.poll_interval = poll_interval
+        self._events: "queue.Queue[str]" = queue.Queue()
+        self._observer = None
+
+    def _scan(self) -> List[str]:
+        with os.scandir(self.directory) as it:
+            return [os.path.abspath(e.path) for e in it if e.is_file() and _is_pdf(e.name)]
+
+    def _unprocessed_stats(self, paths: List[str]) -> Dict[str, Tuple[int, float]]:
+        stats = {p: st for p, st in ((p, _stat(p)) for p in paths) if st}
+        session = self.session_factory()
+        try:
+            done = get_processed_resumes(session, list(stats))
+        finally:
+            session.close()
+        return {p: st for p, st in stats.items() if done.get(p) != st}
+
+    def unprocessed(self, paths: List[str]) -> List[str]:
+        return list(self._unprocessed_stats(paths))
+
+    def mark_processed(self, paths: List[str]) -> None:
+        entries = []
+        for path in paths:
+            st = _stat(path)
+            if st:
+                entries.append((path, st[0], st[1]))
+        if not entries:
+            return
+        session = self.session_factory()
+        try:
+            mark_resumes_processed(session, entries, time.time())
+        finally:
+            session.close()
+
+    def start(self) -> None:
+        if Observer is None:
+            print("Warning: watchdog not installed; polling the resumes folder instead.")
+            return
+        self._observer = Observer()
+        self._observer.schedule(_EventHandler(self._events), self.directory, recursive=False)
+        self._observer.daemon = True
+        self._observer.start()
+
+    def stop(self) -> None:
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def batches(self) -> Iterator[List[str]]:
+        """Block until new resumes are ready and yield them, forever.
+
+        Callers should ``mark_processed`` a batch once it has been handled;
+        unmarked files are offered again after a restart.
+        """
+        self.start()
+        try:
+            # Catch up on anything that arrived while the agent was not running
+            backlog = self.unprocessed(self._scan())
+            if backlog:
+                yield backlog
+            if self._observer is None:
+                yield from self._poll()
+            last_event: Dict[str, float] = {}
+            while True:
+                # Sleep until an event arrives, or the earliest pending file settles
+                timeout = None
+                if last_event:
+                    timeout = max(0.0, min(last_event.values()) + self.settle - time.monotonic())
+                try:
+                    path = self._events.get(timeout=timeout)
+                    last_event[path] = time.monotonic()
+                    while True:
+                        path = self._events.get_nowait()
+                        last_event[path] = time.monotonic()
+                except queue.Empty:
+                    pass
+                now = time.monotonic()
+                settled = [p for p, t in last_event.items() if now - t >= self.settle]
+                for p in settled:
+                    del last_event[p]
+                ready = self.unprocessed(settled) if settled else []
+                if ready:
+                    yield ready
+        finally:
+            self.stop()
+
+    def _poll(self) -> Iterator[List[str]]:
+        # A file is ready once its size/mtime are unchanged across two scans
+        previous: Dict[str, Tuple[int, float]] = {}
+        while True:
+            time.sleep(self.poll_interval)
+            current = self._unprocessed_stats(self._scan())
+            ready = [p for p, st in current.items() if previous.get(p) == st]
+            previous = {p: st for p, st in current.items() if previous.get(p) != st}
+            if ready:
+                yield ready
@@ -4,34 +4,40 @@ import json
 import sqlite3
 from test_service import TestService
 from shortlisting_database import DatabaseManager
+from job_queue import JobQueue
+from problem_catalog import CatalogUnavailableError
 # Don't import LLMPerformanceAnalyzer at module level - it loads large models
 # import llm_analyzer - will be imported lazily
 import datetime
 import sys
 import os
+import time
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 from backend.email_service import EmailService
+from backend.agent_registry import agent_registry
 
-# Lazy load shortlisting agent to prevent crashes on import
-shortlisting_agent = None
-def get_shortlisting_agent():
-    global shortlisting_agent
-    if shortlisting_agent is None:
-        try:
-            from backend.agent_orchestrator import shortlisting_agent as agent
-            shortlisting_agent = agent
-        except Exception as e:
-            print(f"Warning: Failed to load shortlisting agent: {e}")
-            print("Notifications will be disabled but system will continue working")
-            # Create a dummy agent that doesn't crash
-            class DummyAgent:
-                def notify(self, *args, **kwargs):
-                    pass
-                def evaluate_candidate(self, *args, **kwargs):
-                    return {'decision': 'UNKNOWN', 'completion_rate': 0, 'reasoning': 'Agent unavailable'}
-            shortlisting_agent = DummyAgent()
+
+class DummyAgent:
+    """Stand-in when the shortlisting agent can't be built; notifications are disabled"""
+    def notify(self, *args, **kwargs):
+        pass
+    def evaluate_candidate(self, *args, **kwargs):
+        return {'decision': 'UNKNOWN', 'completion_rate': 0, 'reasoning': 'Agent unavailable'}
+
+def _dummy_shortlisting_agent(error):
+    print("Notifications will be disabled but system will continue working")
+    return DummyAgent()
+
+def _load_shortlisting_agent():
+    from backend.agent_orchestrator import shortlisting_agent
     return shortlisting_agent
 
+agent_registry.register('shortlisting', _load_shortlisting_agent, fallback=_dummy_shortlisting_agent)
+
+def get_shortlisting_agent():
+    # Lazy, built once per process by the registry
+    return agent_registry.get('shortlisting')
+
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*", "allow_headers": "*", "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"]}})
 
@@ -41,50 +47,79 @@ db_manager = DatabaseManager()
 email_service = EmailService()
 # test_gen_agent = TestGenerationAgent() # Moved to lazy load
 
-# Lazy load test generation agent
-test_gen_agent = None
+# Agents are built once per process, on first use or by the warm-up thread
+def _build_test_gen_agent():
+    from test_agent import TestGenerationAgent
+    return TestGenerationAgent()
+
+def _dummy_test_gen_agent(error):
+    # Fails gracefully at call time
+    class DummyTestAgent:
+        def generate_questions(self, *args, **kwargs):
+            raise Exception(f"Test Generation Agent unavailable: {error}")
+    return DummyTestAgent()
+
+def _build_llm_analyzer():
+    # Imported lazily - the module can load large models
+    from llm_analyzer import LLMPerformanceAnalyzer
+    # Model will load on first use if needed
+    print("Initializing LLM analyzer (model will load on first use)...")
+    analyzer = LLMPerformanceAnalyzer(load_model=False)
+    print("LLM analyzer initialized (model not loaded yet)")
+    return analyzer
+
+def _no_llm_analyzer(error):
+    print("Falling back to rule-based analysis only")
+    return None
+
+def _build_interview_agent():
+    from interview_agent import InterviewChatAgent
+    return InterviewChatAgent()
+
+agent_registry.register('test_generation', _build_test_gen_agent, fallback=_dummy_test_gen_agent)
+agent_registry.register('llm_analyzer', _build_llm_analyzer, fallback=_no_llm_analyzer)
+agent_registry.register('interview_chat', _build_interview_agent)
+
 def get_test_gen_agent():
-    global test_gen_agent
-    if test_gen_agent is None:
-        try:
-            # Import locally to avoid circular imports or startup delays
-            from test_agent import TestGenerationAgent
-            test_gen_agent = TestGenerationAgent()
-        except Exception as e:
-            print(f"Warning: Failed to load test generation agent: {e}")
-            # Return a dummy agent that fails gracefully
-            class DummyTestAgent:
-                def generate_questions(self, *args, **kwargs):
-                    raise Exception(f"Test Generation Agent unavailable: {e}")
-            test_gen_agent = DummyTestAgent()
-    return test_gen_agent
-
-# Lazy load LLM analyzer to prevent crashes during Flask reloads
-llm_analyzer = None
-_llm_analyzer_module = None
+    return agent_registry.get('test_generation')
 
 def get_llm_analyzer():
-    """Lazy load LLM analyzer only when needed - prevents crashes during startup"""
-    global llm_analyzer, _llm_analyzer_module
-    if llm_analyzer is None:
-        try:
-            # Import module only when needed
-            if _llm_analyzer_module is None:
-                from llm_analyzer import LLMPerformanceAnalyzer
-                _llm_analyzer_module = LLMPerformanceAnalyzer
-            
-            # Create analyzer WITHOUT loading model initially (load_model=False)
-            # Model will load on first use if needed
-            print("Initializing LLM analyzer (model will load on first use)...")
-            llm_analyzer = _llm_analyzer_module(load_model=False)
-            print("LLM analyzer initialized (model not loaded yet)")
-        except Exception as e:
-            print(f"Warning: Failed to initialize LLM analyzer: {e}")
-            print("Falling back to rule-based analysis only")
-            import traceback
-            traceback.print_exc()
-            llm_analyzer = None  # Set to None to indicate failure
-    return llm_analyzer
+    """LLM analyzer, or None to fall back to rule-based analysis"""
+    return agent_registry.get('llm_analyzer')
+
+def get_interview_agent():
+    return agent_registry.get('interview_chat')
+
+# Background jobs: long-running Codeforces syncs and bulk analyses run on
+# worker threads; requests hand back a job id to poll straight away. The
+# queue and its dedupe are per process, so this assumes a single worker.
+MAX_JOB_WAIT = 5  # seconds a client may opt in to block for with ?wait=
+
+def _notify_job(message, type='info', details=None):
+    get_shortlisting_agent().notify(message, type, details=details)
+
+job_queue = JobQueue(notify=_notify_job)
+
+def _job_response(job):
+    """Return 202 + job id, or the result if it's ready within the optional ?wait= seconds"""
+    wait = request.args.get('wait', default=0.0, type=float) or 0.0
+    if wait > 0:
+        job = job_queue.wait(job['id'], min(wait, MAX_JOB_WAIT))
+    if job['status'] == 'completed':
+        return jsonify({**job['result'], 'job_id': job['id']})
+    if job['status'] == 'failed':
+        return jsonify({
+            'success': False,
+            'error': job['error'],
+            'job_id': job['id']
+        }), 500
+    return jsonify({
+        'success': True,
+        'job_id': job['id'],
+        'status': job['status'],
+        'progress': job['progress'],
+        'status_url': f"/api/jobs/{job['id']}"
+    }), 202
 
 @app.route('/api/tests/problems', methods=['GET'])
 def get_problems():
@@ -93,6 +128,11 @@ def get_problems():
         difficulty_min = request.args.get('difficulty_min', type=int)
         difficulty_max = request.args.get('difficulty_max', type=int)
         tags = request.args.getlist('tags')
+        # Optional pagination; without page_size every match is returned
+        page = request.args.get('page', type=int)
+        page_size = request.args.get('page_size', type=int)
+        if page_size is not None:
+            page_size = max(1, min(page_size, 500))
         
         try:
             get_shortlisting_agent().notify(
@@ -103,24 +143,30 @@ def get_problems():
         except:
             pass
         
-        problems = test_service.get_available_problems(
+        result = test_service.search_problems(
             difficulty_min=difficulty_min,
             difficulty_max=difficulty_max,
-            tags=tags if tags else None
+            tags=tags if tags else None,
+            page=page,
+            page_size=page_size
         )
+        problems = result['problems']
         
         try:
             get_shortlisting_agent().notify(
-                f"✅ Found {len(problems)} Codeforces problems matching criteria",
+                f"✅ Found {result['total']} Codeforces problems matching criteria",
                 'success',
-                reasoning=f"Retrieved {len(problems)} problems that match the specified difficulty range and tags"
+                reasoning=f"Retrieved {result['total']} problems that match the specified difficulty range and tags"
             )
         except:
             pass
         
         return jsonify({
             'success': True,
-            'problems': problems
+            'problems': problems,
+            'total': result['total'],
+            'page': result['page'],
+            'page_size': result['page_size']
         })
     except Exception as e:
         try:
@@ -130,10 +176,12 @@ def get_problems():
             )
         except:
             pass
+        # No catalogue yet because Codeforces could not be reached
+        status = 503 if isinstance(e, CatalogUnavailableError) else 500
         return jsonify({
             'success': False,
             'error': str(e)
-        }), 500
+        }), status
 
 @app.route('/api/tests/generate-questions', methods=['POST'])
 def generate_questions():
@@ -443,9 +491,8 @@ def register_candidate(test_id):
             'error': str(e)
         }), 500
 
-@app.route('/api/tests/<int:test_id>/fetch-results', methods=['POST'])
-def fetch_test_results(test_id):
-    """Fetch and save test results from Codeforces"""
+def _fetch_results_job(progress, test_id):
+    """Background job: fetch and save Codeforces results for a test"""
     try:
         try:
             get_shortlisting_agent().notify(
@@ -456,7 +503,7 @@ def fetch_test_results(test_id):
         except:
             pass  # Continue even if notification fails
         
-        results_summary = test_service.fetch_and_save_results(test_id)
+        results_summary = test_service.fetch_and_save_results(test_id, progress=progress)
         
         try:
             get_shortlisting_agent().notify(
@@ -467,27 +514,30 @@ def fetch_test_results(test_id):
         except:
             pass  # Continue even if notification fails
         
-        return jsonify({
+        return {
             'success': True,
             'summary': results_summary
-        })
+        }
     except Exception as e:
-        error_msg = str(e)
         try:
             get_shortlisting_agent().notify(
-                f"❌ Error fetching results for test {test_id}: {error_msg}",
+                f"❌ Error fetching results for test {test_id}: {str(e)}",
                 'warning'
             )
         except:
             pass  # Continue even if notification fails
-        
-        import traceback
-        print(f"Error in fetch_test_results: {error_msg}")
-        print(traceback.format_exc())
-        
+        raise
+
+@app.route('/api/tests/<int:test_id>/fetch-results', methods=['POST'])
+def fetch_test_results(test_id):
+    """Fetch and save test results from Codeforces (runs as a background job)"""
+    try:
+        job = job_queue.submit('fetch-results', test_id, _fetch_results_job, test_id)
+        return _job_response(job)
+    except Exception as e:
         return jsonify({
             'success': False,
-            'error': error_msg
+            'error': str(e)
         }), 500
 
 @app.route('/api/tests/<int:test_id>/results', methods=['GET'])
@@ -537,14 +587,50 @@ def get_notifications():
         import sys
         import os
         sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
-        from backend.agent_orchestrator import get_notifications as get_notifs
-        notifications = get_notifs()
-        return jsonify({'success': True, 'notifications': notifications})
+        from backend.agent_orchestrator import get_notifications as get_notifs, get_latest_notification_seq
+        # ?since=<seq> returns only notifications newer than that sequence id
+        since = request.args.get('since', type=int)
+        latest_seq = get_latest_notification_seq()
+        notifications = get_notifs(since)
+        return jsonify({'success': True, 'notifications': notifications, 'latest_seq': latest_seq})
     except Exception as e:
         print(f"Error getting notifications: {e}")
         # Return empty list instead of error to prevent crashes
         return jsonify({'success': True, 'notifications': []})
 
+@app.route('/api/reasoning/<reasoning_id>', methods=['GET'])
+def get_decision_reasoning(reasoning_id):
+    """Deferred reasoning for an agent decision (its ``reasoning_id``); ?wait= up to MAX_REASONING_WAIT seconds"""
+    try:
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+        from backend.agent_orchestrator import get_reasoning
+        wait = min(max(request.args.get('wait', default=0, type=float), 0), MAX_REASONING_WAIT)
+        reasoning = get_reasoning(reasoning_id, timeout=wait)
+        return jsonify({
+            'success': True,
+            'reasoning_id': reasoning_id,
+            'reasoning_status': 'pending' if reasoning is None else 'ready',
+            'reasoning': reasoning
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/notifications/stream', methods=['GET'])
+def stream_notifications():
+    """Push new notifications as Server-Sent Events"""
+    from flask import Response, stream_with_context
+    sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+    from backend.agent_orchestrator import notification_events, get_latest_notification_seq
+    
+    # Resume after the last event the browser saw, else start from now
+    since = request.headers.get('Last-Event-ID', type=int)
+    if since is None:
+        since = request.args.get('since', type=int)
+    if since is None:
+        since = get_latest_notification_seq()
+    return Response(stream_with_context(notification_events(since)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/notifications/<int:index>/read', methods=['POST'])
 def mark_notification_read(index):
     """Mark notification as read"""
@@ -573,6 +659,11 @@ def clear_notifications():
         print(f"Error clearing notifications: {e}")
         return jsonify({'success': True})  # Return success to prevent crashes
 
+@app.route('/api/tests/agents/health', methods=['GET'])
+def agents_health():
+    """Which agents are built, how long they took and the LLM client state"""
+    return jsonify({'success': True, **agent_registry.health()})
+
 @app.route('/api/tests/<int:test_id>/questions', methods=['GET'])
 def get_test_questions(test_id):
     """Get questions for a specific test"""
@@ -627,31 +718,10 @@ def get_candidate_analysis(test_id, candidate_id):
         # Get test questions
         test_questions = db_manager.get_test_questions(test_id)
         
-        # Get candidate results
-        raw_results = db_manager.get_test_results(test_id)
-        
-        # Find candidate data
-        candidate_data = None
-        for row in raw_results:
-            if row[0] == candidate_id:  # candidate_id matches u.id (index 0)
-                # Unpack 8 columns returned by get_test_results (including tab_switches and time_taken)
-                user_id, email, username, question_id, solved, result_data, tab_switches, time_taken = row
-                if not candidate_data:
-                    candidate_data = {
-                        'email': email,
-                        'username': username,
-                        'questions': {},
-                        'total_solved': 0,
-                        'total_questions': len(test_questions)
-                    }
-                
-                candidate_data['questions'][question_id] = {
-                    'solved': solved,
-                    'data': result_data
-                }
-                
-                if solved:
-                    candidate_data['total_solved'] += 1
+        # Get candidate results (one indexed row)
+        candidate_data = db_manager.get_candidate_result(test_id, candidate_id)
+        if candidate_data:
+            candidate_data['total_questions'] = len(test_questions)
         
         if not candidate_data:
             return jsonify({
@@ -714,8 +784,8 @@ def get_candidate_analysis(test_id, candidate_id):
                 'reasoning': f'Analysis failed: {str(analysis_err)}'
             }
         
-        # Add agent decision to analysis
-        analysis['agent_decision'] = shortlisting_decision
+        # Add agent decision to analysis, with its reasoning once ready
+        analysis['agent_decision'] = _with_reasoning(shortlisting_decision, REASONING_WAIT)
         
         return jsonify({
             'success': True,
@@ -731,84 +801,281 @@ def get_candidate_analysis(test_id, candidate_id):
             'error': str(e)
         }), 500
 
+# Agent decisions are explained in the background; responses wait this
+# long for the reasoning (single analysis / the whole bulk job) before
+# returning it as pending, to be fetched from /api/reasoning/<id>
+REASONING_WAIT = 5
+BULK_REASONING_WAIT = 10
+MAX_REASONING_WAIT = 5
+
+def _with_reasoning(decision, timeout=0):
+    try:
+        from backend.agent_orchestrator import with_reasoning
+    except ImportError:
+        return decision
+    return with_reasoning(decision, timeout)
+
+# Bulk analysis fan-out: candidates are analyzed concurrently, each one
+# given at most ANALYSIS_TIMEOUT seconds before a fallback result is used
+ANALYSIS_WORKERS = 8
+ANALYSIS_TIMEOUT = 90  # seconds per candidate
+# Streams follow the background job and close like the notification stream,
+# so they never pin the (single, sync) server worker for long
+ANALYSIS_STREAM_SECONDS = 60
+ANALYSIS_STREAM_HEARTBEAT = 15
+
+def _basic_analysis(candidate_data, test_questions, shortlisting_decision, reasoning=None):
+    analysis = {
+        'performance_score': candidate_data.get('total_solved', 0) / len(test_questions) * 100 if test_questions else 0,
+        'recommendation': 'NEEDS_MANUAL_REVIEW',
+        'agent_decision': shortlisting_decision
+    }
+    if reasoning:
+        analysis['reasoning'] = reasoning
+    return analysis
+
+def _check_deadline(deadline):
+    # Worker threads can't be interrupted; a timed-out one stops at the next step
+    if deadline is not None and time.monotonic() > deadline:
+        raise TimeoutError('Analysis deadline passed')
+
+def _analyze_candidate(candidate_data, test_questions, cf_api, analyzer, deadline=None, scores=None):
+    """
+    Codeforces lookup, agent decision and analyzer report for one candidate.
+    ``scores`` are the candidate's precomputed rule-based stats, if any
+    """
+    # Fetch real Codeforces data for each candidate
+    codeforces_data = cf_api.get_user_submission_details(candidate_data['username'], test_questions)
+    _check_deadline(deadline)
+    
+    # Use autonomous shortlisting agent
+    try:
+        shortlisting_decision = get_shortlisting_agent().evaluate_candidate(candidate_data, test_questions)
+    except Exception as agent_err:
+        print(f"Warning: Shortlisting agent unavailable: {agent_err}")
+        shortlisting_decision = {'decision': 'UNKNOWN', 'completion_rate': 0, 'reasoning': 'Agent unavailable'}
+    _check_deadline(deadline)
+    
+    # Wrap analysis in try-except to prevent one failure from stopping all analyses
+    try:
+        analysis = analyzer.analyze_candidate_performance(candidate_data, test_questions, codeforces_data, scores=scores)
+        analysis['agent_decision'] = shortlisting_decision
+        return analysis
+    except Exception as analysis_err:
+        print(f"Error analyzing candidate {candidate_data.get('email', 'unknown')}: {analysis_err}")
+        # Add basic analysis for this candidate
+        return _basic_analysis(candidate_data, test_questions, shortlisting_decision, f'Analysis failed: {str(analysis_err)}')
+
+def _iter_candidate_analyses(test_id):
+    """
+    Yield (position, candidate, analysis) for every candidate in a test as
+    each analysis finishes. Candidates that exceed ANALYSIS_TIMEOUT get a
+    basic analysis so one slow lookup can't hold up the cohort. The whole
+    cohort is scored up front: the analyzer reads each candidate's
+    rule-based stats from those arrays, and every analysis carries its
+    cohort rank and percentile
+    """
+    from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+    from cohort_scoring import score_cohort
+    
+    # Get test questions
+    test_questions = db_manager.get_test_questions(test_id)
+    
+    # Get all candidate results using test_service which handles deduplication
+    candidates_list = test_service.get_test_results(test_id)
+    
+    # Convert list to dict keyed by user_key for compatibility
+    candidates_data = {}
+    for candidate in candidates_list:
+        user_key = f"{candidate['email']}_{candidate['username']}"
+        candidates_data[user_key] = candidate
+    candidates = list(candidates_data.values())
+    
+    # Place every candidate within the cohort in one vectorized pass
+    cohort = score_cohort(test_questions, candidates)
+    
+    def placed(position, analysis):
+        analysis['cohort'] = {
+            'rank': int(cohort.ranks[position]),
+            'percentile': float(cohort.percentiles[position]),
+            'cohort_size': len(cohort)
+        }
+        return analysis
+    
+    from codeforces_api import CodeforcesAPI
+    cf_api = CodeforcesAPI()
+    
+    analyzer = get_llm_analyzer()
+    if analyzer is None:
+        # Create a fallback instance WITHOUT loading model (prevents crashes)
+        try:
+            from llm_analyzer import LLMPerformanceAnalyzer
+            analyzer = LLMPerformanceAnalyzer(load_model=False)
+        except Exception as fallback_err:
+            print(f"Warning: Could not load LLM analyzer: {fallback_err}")
+            # Return basic analyses without LLM
+            unavailable = {'decision': 'UNKNOWN', 'completion_rate': 0, 'reasoning': 'Analyzer unavailable'}
+            for position, candidate_data in enumerate(candidates):
+                yield position, candidate_data, placed(position, _basic_analysis(candidate_data, test_questions, unavailable))
+            return
+    
+    if not candidates:
+        return
+    
+    started = {}
+    
+    def run(position, candidate_data):
+        started[position] = time.monotonic()
+        deadline = started[position] + ANALYSIS_TIMEOUT
+        return _analyze_candidate(candidate_data, test_questions, cf_api, analyzer, deadline, cohort.candidate_scores(position))
+    
+    executor = ThreadPoolExecutor(max_workers=min(ANALYSIS_WORKERS, len(candidates)))
+    try:
+        pending = {executor.submit(run, i, c): i for i, c in enumerate(candidates)}
+        while pending:
+            done, _ = wait(pending, timeout=1.0, return_when=FIRST_COMPLETED)
+            for future in done:
+                position = pending.pop(future)
+                try:
+                    analysis = future.result()
+                except Exception as e:
+                    failed_decision = {'decision': 'UNKNOWN', 'completion_rate': 0, 'reasoning': 'Agent unavailable'}
+                    analysis = _basic_analysis(candidates[position], test_questions, failed_decision, f'Analysis failed: {str(e)}')
+                yield position, candidates[position], placed(position, analysis)
+            now = time.monotonic()
+            for future, position in list(pending.items()):
+                if position in started and now - started[position] > ANALYSIS_TIMEOUT:
+                    # The worker can't be interrupted; stop waiting for it
+                    del pending[future]
+                    timeout_decision = {'decision': 'UNKNOWN', 'completion_rate': 0, 'reasoning': 'Analysis timed out'}
+                    yield position, candidates[position], placed(position, _basic_analysis(
+                        candidates[position], test_questions, timeout_decision,
+                        f'Analysis timed out after {ANALYSIS_TIMEOUT}s'
+                    ))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def _candidate_analysis_job(progress, test_id):
+    """Background job: AI-powered analysis for all candidates in a test"""
+    results = {}
+    for position, candidate_data, analysis in _iter_candidate_analyses(test_id):
+        results[position] = analysis
+        # Each finished analysis is published for /candidate-analysis/stream
+        progress(f"Analyzed {len(results)} candidates for test {test_id}", done=len(results), item={
+            'index': position,
+            'email': candidate_data.get('email'),
+            'username': candidate_data.get('username'),
+            'analysis': analysis
+        })
+    
+    # Streamed items went out as soon as they finished; the job result
+    # carries each decision's reasoning (copies, as streams may be reading)
+    deadline = time.monotonic() + BULK_REASONING_WAIT
+    analyses = []
+    for position in sorted(results):
+        analysis = results[position]
+        if isinstance(analysis.get('agent_decision'), dict):
+            decision = _with_reasoning(analysis['agent_decision'], max(0.0, deadline - time.monotonic()))
+            analysis = {**analysis, 'agent_decision': decision}
+        analyses.append(analysis)
+    return {
+        'success': True,
+        'analyses': analyses
+    }
+
 @app.route('/api/tests/<int:test_id>/candidate-analysis', methods=['GET'])
 def get_all_candidate_analysis(test_id):
-    """Get AI-powered analysis for all candidates in a test"""
+    """Get AI-powered analysis for all candidates in a test (runs as a background job)"""
     try:
-        # Get test questions
-        test_questions = db_manager.get_test_questions(test_id)
-        
-        # Get all candidate results using test_service which handles deduplication
-        candidates_list = test_service.get_test_results(test_id)
-        
-        # Convert list to dict keyed by user_key for compatibility
-        candidates_data = {}
-        for candidate in candidates_list:
-            user_key = f"{candidate['email']}_{candidate['username']}"
-            candidates_data[user_key] = candidate
-        
-        # Analyze each candidate with real Codeforces data
-        analyses = []
-        from codeforces_api import CodeforcesAPI
-        cf_api = CodeforcesAPI()
+        job = job_queue.submit('candidate-analysis', test_id, _candidate_analysis_job, test_id)
+        return _job_response(job)
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/tests/<int:test_id>/candidate-analysis/stream', methods=['GET'])
+def stream_candidate_analysis(test_id):
+    """
+    Stream per-candidate analyses as they finish: NDJSON by default, or
+    Server-Sent Events with ?format=sse / Accept: text/event-stream.
+    
+    Follows the same background job as /candidate-analysis (started here
+    or joined if already running). The stream closes after
+    ANALYSIS_STREAM_SECONDS with ``done: false`` and the ``since`` position
+    to reconnect from; ?since= skips analyses already received.
+    """
+    from flask import Response, stream_with_context
+    
+    sse = request.args.get('format') == 'sse' or 'text/event-stream' in request.headers.get('Accept', '')
+    since = max(0, request.args.get('since', default=0, type=int) or 0)
+    
+    def encode(payload):
+        line = json.dumps(payload, default=str)
+        return f"data: {line}\n\n" if sse else line + "\n"
+    
+    try:
+        job = job_queue.submit('candidate-analysis', test_id, _candidate_analysis_job, test_id)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+    
+    def generate():
+        sent = since
+        deadline = time.monotonic() + ANALYSIS_STREAM_SECONDS
+        while True:
+            remaining = deadline - time.monotonic()
+            items, current = job_queue.wait_for_items(job['id'], sent, max(0.0, min(ANALYSIS_STREAM_HEARTBEAT, remaining)))
+            for item in items:
+                yield encode(item)
+            sent += len(items)
+            if current is None:
+                yield encode({'done': True, 'total': sent, 'job_id': job['id'], 'error': 'Job no longer available'})
+                return
+            if current['status'] in ('completed', 'failed'):
+                done = {'done': True, 'total': sent, 'job_id': job['id']}
+                if current['error']:
+                    done['error'] = current['error']
+                yield encode(done)
+                return
+            if remaining <= 0:
+                yield encode({'done': False, 'since': sent, 'job_id': job['id'], 'status_url': f"/api/jobs/{job['id']}"})
+                return
+            if not items and sse:
+                yield ": keep-alive\n\n"
+    
+    mimetype = 'text/event-stream' if sse else 'application/x-ndjson'
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/tests/<int:test_id>/rankings', methods=['GET'])
+def get_test_rankings(test_id):
+    """Rule-based scores, ranks and percentiles for every candidate in a test, best first"""
+    try:
+        from cohort_scoring import score_cohort
         
-        analyzer = get_llm_analyzer()
-        if analyzer is None:
-            # Create a fallback instance WITHOUT loading model (prevents crashes)
-            try:
-                from llm_analyzer import LLMPerformanceAnalyzer
-                analyzer = LLMPerformanceAnalyzer(load_model=False)
-            except Exception as fallback_err:
-                print(f"Warning: Could not load LLM analyzer: {fallback_err}")
-                # Return basic analyses without LLM
-                basic_analyses = []
-                for candidate_data in candidates_data.values():
-                    basic_analyses.append({
-                        'performance_score': candidate_data.get('total_solved', 0) / len(test_questions) * 100 if test_questions else 0,
-                        'recommendation': 'NEEDS_MANUAL_REVIEW',
-                        'agent_decision': {'decision': 'UNKNOWN', 'completion_rate': 0, 'reasoning': 'Analyzer unavailable'}
-                    })
-                return jsonify({
-                    'success': True,
-                    'analyses': basic_analyses
-                })
-        for candidate_data in candidates_data.values():
-            # Fetch real Codeforces data for each candidate
-            codeforces_data = cf_api.get_user_submission_details(candidate_data['username'], test_questions)
-            
-            # Use autonomous shortlisting agent
-            try:
-                shortlisting_decision = get_shortlisting_agent().evaluate_candidate(candidate_data, test_questions)
-            except Exception as agent_err:
-                print(f"Warning: Shortlisting agent unavailable: {agent_err}")
-                shortlisting_decision = {'decision': 'UNKNOWN', 'completion_rate': 0, 'reasoning': 'Agent unavailable'}
-            
-            # Wrap analysis in try-except to prevent one failure from stopping all analyses
-            try:
-                analysis = analyzer.analyze_candidate_performance(candidate_data, test_questions, codeforces_data)
-                analysis['agent_decision'] = shortlisting_decision
-                analyses.append(analysis)
-            except Exception as analysis_err:
-                print(f"Error analyzing candidate {candidate_data.get('email', 'unknown')}: {analysis_err}")
-                # Add basic analysis for this candidate
-                analyses.append({
-                    'performance_score': candidate_data.get('total_solved', 0) / len(test_questions) * 100 if test_questions else 0,
-                    'recommendation': 'NEEDS_MANUAL_REVIEW',
-                    'agent_decision': shortlisting_decision,
-                    'reasoning': f'Analysis failed: {str(analysis_err)}'
-                })
+        limit = request.args.get('limit', type=int)
+        cohort = score_cohort(db_manager.get_test_questions(test_id), test_service.get_test_results(test_id))
         
         return jsonify({
             'success': True,
-            'analyses': analyses
+            'total': len(cohort),
+            'tag_accuracy': cohort.cohort_tag_accuracy(),
+            'rankings': cohort.ranking(limit or None)
         })
-        
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """Status (and, once finished, the result) of a background job"""
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
 # New endpoint to select candidate for interview
 @app.route('/api/tests/<int:test_id>/select-candidate', methods=['POST'])
 def select_candidate_for_interview(test_id):
@@ -922,19 +1189,6 @@ def select_interview_candidate():
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
-# Lazy load interview agent
-interview_agent = None
-def get_interview_agent():
-    global interview_agent
-    if interview_agent is None:
-        try:
-            from interview_agent import InterviewChatAgent
-            interview_agent = InterviewChatAgent()
-        except Exception as e:
-            print(f"Failed to load InterviewChatAgent: {e}")
-            return None
-    return interview_agent
-
 @app.route('/api/interviews/chat', methods=['POST'])
 def interview_chat():
     """AI chat to suggest interview slots using LLM"""
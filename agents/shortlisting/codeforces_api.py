@@ -1,49 +1,129 @@
 import requests
 import json
-from typing import List, Dict, Optional
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Iterable, List, Dict, Optional, Tuple
+
+# Codeforces allows one API call per 2 seconds per client
+CF_REQUESTS_PER_SEC = 0.5
+CF_MAX_WORKERS = 4
+CF_MAX_ATTEMPTS = 4
+CF_HANDLES_PER_CALL = 300  # handles per batched user.info call
+CF_SYNC_PAGE = 20  # submissions per page when catching up from a stored cursor
+
+# Submission fields kept in the stored per-handle snapshot
+_SNAPSHOT_FIELDS = ('id', 'verdict', 'creationTimeSeconds', 'problem')
+
+
+class CodeforcesAPIError(Exception):
+    pass
+
+
+class CodeforcesRateLimitError(CodeforcesAPIError):
+    pass
+
+
+class RateLimiter:
+    """Thread-safe token bucket: ``rate`` calls/second, at most ``capacity`` banked"""
+    
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self):
+        with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                time.sleep((1.0 - self.tokens) / self.rate)
+
+
+# Shared by every CodeforcesAPI instance in the process
+_rate_limiter = RateLimiter(CF_REQUESTS_PER_SEC)
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CF_MAX_WORKERS)
+            _session.mount("https://", adapter)
+        return _session
+
 
 class CodeforcesAPI:
-    def __init__(self):
+    def __init__(self, max_workers: int = CF_MAX_WORKERS, cursor_store=None):
         self.base_url = "https://codeforces.com/api"
+        self.max_workers = max_workers
+        # Anything with get/save_submission_cursor (the shortlisting DatabaseManager)
+        self.cursor_store = cursor_store
+    
+    def _call(self, method: str, params: Dict = None, timeout: int = 10):
+        """
+        Call an API method through the shared session and rate limiter.
+        Returns the 'result' payload; retries when the call limit is hit
+        """
+        for attempt in range(CF_MAX_ATTEMPTS):
+            _rate_limiter.acquire()
+            response = _get_session().get(f"{self.base_url}/{method}", params=params, timeout=timeout)
+            if response.status_code not in (429, 503):
+                try:
+                    data = response.json()
+                except ValueError:
+                    response.raise_for_status()
+                    raise CodeforcesAPIError(f"Invalid response from {method}")
+                if data.get('status') == 'OK':
+                    return data['result']
+                comment = data.get('comment', '')
+                if 'limit exceeded' not in comment.lower():
+                    raise CodeforcesAPIError(comment or 'Unknown error')
+            time.sleep(random.uniform(0, 2.0 ** (attempt + 1)))
+        raise CodeforcesRateLimitError(f"Call limit exceeded for {method}")
+    
+    def fetch_problemset(self, etag: str = None) -> Tuple[Optional[List[Dict]], Optional[str]]:
+        """
+        Download the full problemset. Returns (problems, etag), or
+        (None, etag) when the server answers 304 Not Modified
+        """
+        headers = {'If-None-Match': etag} if etag else {}
+        for attempt in range(CF_MAX_ATTEMPTS):
+            _rate_limiter.acquire()
+            response = _get_session().get(f"{self.base_url}/problemset.problems", headers=headers, timeout=30)
+            if response.status_code == 304:
+                return None, etag
+            if response.status_code not in (429, 503):
+                response.raise_for_status()
+                data = response.json()
+                if data.get('status') != 'OK':
+                    raise CodeforcesAPIError(data.get('comment', 'Unknown error'))
+                return data['result']['problems'], response.headers.get('ETag')
+            time.sleep(random.uniform(0, 2.0 ** (attempt + 1)))
+        raise CodeforcesRateLimitError("Call limit exceeded for problemset.problems")
     
     def get_problems(self, tags: List[str] = None, difficulty_min: int = None, difficulty_max: int = None) -> List[Dict]:
         """
-        Fetch problems from Codeforces API with optional filters
+        Get problems with optional filters, served from the cached problem catalogue
         """
+        from problem_catalog import CatalogUnavailableError, get_problem_catalog
         try:
-            url = f"{self.base_url}/problemset.problems"
-            params = {}
-            
-            if tags:
-                params['tags'] = ';'.join(tags)
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data['status'] != 'OK':
-                raise Exception(f"API Error: {data.get('comment', 'Unknown error')}")
-            
-            problems = data['result']['problems']
-            
-            # Filter by difficulty if specified
-            if difficulty_min is not None or difficulty_max is not None:
-                filtered_problems = []
-                for problem in problems:
-                    if 'rating' in problem:
-                        rating = problem['rating']
-                        if difficulty_min is not None and rating < difficulty_min:
-                            continue
-                        if difficulty_max is not None and rating > difficulty_max:
-                            continue
-                        filtered_problems.append(problem)
-                problems = filtered_problems
-            
+            problems, _ = get_problem_catalog(self).query(tags=tags, difficulty_min=difficulty_min, difficulty_max=difficulty_max)
             return problems
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching problems: {e}")
-            return []
+        except CatalogUnavailableError:
+            # Nothing cached to fall back on; an empty list would read as "no matches"
+            raise
         except Exception as e:
             print(f"Error processing problems: {e}")
             return []
@@ -53,21 +133,13 @@ class CodeforcesAPI:
         Get user's submission history
         """
         try:
-            url = f"{self.base_url}/user.status"
             params = {
                 'handle': username,
                 'from': 1,
                 'count': count
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data['status'] != 'OK':
-                raise Exception(f"API Error: {data.get('comment', 'Unknown error')}")
-            
-            return data['result']
+            return self._call('user.status', params)
             
         except requests.exceptions.RequestException as e:
             print(f"Error fetching submissions for {username}: {e}")
@@ -81,25 +153,126 @@ class CodeforcesAPI:
         Get user information
         """
         try:
-            url = f"{self.base_url}/user.info"
-            params = {'handles': username}
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            if data['status'] != 'OK':
-                return None
-            
-            return data['result'][0] if data['result'] else None
+            result = self._call('user.info', {'handles': username})
+            return result[0] if result else None
             
+        except CodeforcesRateLimitError as e:
+            print(f"Error fetching user info for {username}: {e}")
+            return None
+        except CodeforcesAPIError:
+            return None
         except Exception as e:
             print(f"Error fetching user info for {username}: {e}")
             return None
     
-    def check_problem_solved(self, username: str, problem_id: Dict) -> Dict:
+    def get_users_info(self, usernames: Iterable[str]) -> Optional[Dict[str, Dict]]:
+        """
+        Look up many handles with batched user.info calls.
+        Returns {lowercased handle: info} for the handles that exist, or None
+        if Codeforces could not be reached
+        """
+        pending = list(dict.fromkeys(u for u in usernames if u))
+        found = {}
+        try:
+            while pending:
+                chunk, pending = pending[:CF_HANDLES_PER_CALL], pending[CF_HANDLES_PER_CALL:]
+                while chunk:
+                    try:
+                        for info in self._call('user.info', {'handles': ';'.join(chunk)}):
+                            found[info.get('handle', '').lower()] = info
+                        break
+                    except CodeforcesAPIError as e:
+                        # One unknown handle fails the whole call; drop it and retry
+                        # ("handles: User with handle xyz not found")
+                        comment = str(e)
+                        missing = next((h for h in chunk if f"handle {h} not found".lower() in comment.lower()), None)
+                        if missing is None:
+                            raise
+                        chunk.remove(missing)
+            return found
+        except Exception as e:
+            print(f"Error fetching user info: {e}")
+            return None
+    
+    @staticmethod
+    def _problem_key(problem: Dict) -> Tuple[str, str]:
+        return (str(problem.get('contestId', '')), str(problem.get('index', '')))
+    
+    def index_submissions(self, submissions: List[Dict]) -> Dict[Tuple[str, str], Dict]:
+        """
+        Index submissions by (contestId, index), keeping the latest accepted
+        submission per problem, or the latest attempt if none was accepted
+        """
+        index = {}
+        # user.status lists submissions newest first
+        for submission in submissions:
+            key = self._problem_key(submission.get('problem', {}))
+            current = index.get(key)
+            if current is None or (current.get('verdict') != 'OK' and submission.get('verdict') == 'OK'):
+                index[key] = submission
+        return index
+    
+    def get_submission_index(self, username: str, count: int = 1000) -> Dict[Tuple[str, str], Dict]:
+        """
+        Fetch a user's submissions once and index them for check_problem_solved
+        """
+        if self.cursor_store is not None:
+            return self.sync_submission_index(username, count)
+        return self.index_submissions(self.get_user_submissions(username, count))
+    
+    def sync_submission_index(self, username: str, count: int = 1000) -> Dict[Tuple[str, str], Dict]:
+        """
+        Incrementally sync a user's submissions against the stored cursor.
+        The first sync pulls up to ``count`` submissions; later ones page
+        through user.status only until they reach the last id already seen
+        """
+        last_id, stored = self.cursor_store.get_submission_cursor(username)
+        new_submissions = []
+        try:
+            if last_id is None:
+                new_submissions = self._call('user.status', {'handle': username, 'from': 1, 'count': count})
+            else:
+                start = 1
+                while start <= count:
+                    page = self._call('user.status', {'handle': username, 'from': start, 'count': CF_SYNC_PAGE})
+                    fresh = [sub for sub in page if sub.get('id', 0) > last_id]
+                    new_submissions.extend(fresh)
+                    if len(fresh) < len(page) or len(page) < CF_SYNC_PAGE:
+                        break
+                    start += CF_SYNC_PAGE
+        except Exception as e:
+            # Serve what was stored last time rather than nothing
+            print(f"Error syncing submissions for {username}: {e}")
+            return self.index_submissions(stored)
+        
+        if not new_submissions and last_id is not None:
+            return self.index_submissions(stored)
+        
+        # New submissions are newer than everything stored, so they go first
+        index = self.index_submissions(new_submissions + stored)
+        snapshot = [{k: sub.get(k) for k in _SNAPSHOT_FIELDS} for sub in index.values()]
+        newest = max((sub.get('id', 0) for sub in new_submissions), default=last_id or 0)
+        self.cursor_store.save_submission_cursor(username, max(newest, last_id or 0), snapshot)
+        return index
+    
+    def get_submission_indexes(self, usernames: Iterable[str], count: int = 1000) -> Dict[str, Dict[Tuple[str, str], Dict]]:
+        """
+        Fetch submission snapshots for many users on a bounded worker pool.
+        Requests still go out at the shared rate limit, but their latency overlaps
+        """
+        usernames = list(dict.fromkeys(u for u in usernames if u))
+        if not usernames:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(usernames))) as pool:
+            indexes = pool.map(lambda u: self.get_submission_index(u, count), usernames)
+            return dict(zip(usernames, indexes))
+    
+    def check_problem_solved(self, username: str, problem_id: Dict, submission_index: Dict[Tuple[str, str], Dict] = None) -> Dict:
         """
         Check if a user has solved a specific problem
+
+        Pass a snapshot from get_submission_index to check many problems for
+        the same user without refetching their submissions.
         """
         try:
             if not username or not problem_id:
@@ -111,9 +284,10 @@ class CodeforcesAPI:
                     'error': 'Missing username or problem_id'
                 }
             
-            submissions = self.get_user_submissions(username)
+            if submission_index is None:
+                submission_index = self.get_submission_index(username)
             
-            if not submissions:
+            if not submission_index:
                 return {
                     'solved': False,
                     'submission_time': None,
@@ -122,17 +296,14 @@ class CodeforcesAPI:
                     'error': f'No submissions found for user {username}'
                 }
             
-            for submission in submissions:
-                problem = submission.get('problem', {})
-                if (problem.get('contestId') == problem_id.get('contestId') and
-                    problem.get('index') == problem_id.get('index')):
-                    
-                    return {
-                        'solved': submission.get('verdict') == 'OK',
-                        'submission_time': submission.get('creationTimeSeconds'),
-                        'verdict': submission.get('verdict'),
-                        'submission_id': submission.get('id')
-                    }
+            submission = submission_index.get(self._problem_key(problem_id))
+            if submission is not None:
+                return {
+                    'solved': submission.get('verdict') == 'OK',
+                    'submission_time': submission.get('creationTimeSeconds'),
+                    'verdict': submission.get('verdict'),
+                    'submission_id': submission.get('id')
+                }
             
             return {
                 'solved': False,
@@ -156,9 +327,7 @@ class CodeforcesAPI:
         """
         Get problems of a specific difficulty
         """
-        problems = self.get_problems()
-        filtered = [p for p in problems if p.get('rating') == difficulty]
-        return filtered[:count]
+        return self.get_problems(difficulty_min=difficulty, difficulty_max=difficulty)[:count]
     
     def get_problems_by_tags(self, tags: List[str], count: int = 50) -> List[Dict]:
         """
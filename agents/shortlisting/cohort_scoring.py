@@ -0,0 +1,180 @@
+import threading
+import weakref
+from typing import Dict, List
+
+import numpy as np
+
+from test_schema import (
+    DEFAULT_PERFORMANCE_LEVEL,
+    DIFFICULTY_POINTS,
+    PERFORMANCE_LEVELS,
+    CandidateScores,
+    TestSchema,
+    get_test_schema,
+)
+
+DIFFICULTIES = list(DIFFICULTY_POINTS)
+
+
+class _QuestionMatrices:
+    """Per-test question weights, difficulty one-hot and tag incidence"""
+
+    def __init__(self, schema: TestSchema):
+        n_questions = len(schema)
+        self.points = np.asarray(schema.points, dtype=np.float64)
+        self.total_points = float(self.points.sum())
+
+        self.difficulty = np.zeros((n_questions, len(DIFFICULTIES)), dtype=np.float64)
+        for q, difficulty in enumerate(schema.difficulties):
+            self.difficulty[q, DIFFICULTIES.index(difficulty)] = 1.0
+        self.difficulty_totals = self.difficulty.sum(axis=0)
+
+        self.tags: List[str] = []
+        tag_positions: Dict[str, int] = {}
+        for question_tags in schema.tags:
+            for tag in question_tags:
+                if tag not in tag_positions:
+                    tag_positions[tag] = len(self.tags)
+                    self.tags.append(tag)
+        self.tag_matrix = np.zeros((n_questions, len(self.tags)), dtype=np.float64)
+        for q, question_tags in enumerate(schema.tags):
+            for tag in question_tags:
+                self.tag_matrix[q, tag_positions[tag]] = 1.0
+        self.tag_totals = self.tag_matrix.sum(axis=0)
+
+
+_matrices: "weakref.WeakKeyDictionary[TestSchema, _QuestionMatrices]" = weakref.WeakKeyDictionary()
+_matrices_lock = threading.Lock()
+
+
+def _question_matrices(schema: TestSchema) -> _QuestionMatrices:
+    with _matrices_lock:
+        matrices = _matrices.get(schema)
+        if matrices is None:
+            matrices = _matrices[schema] = _QuestionMatrices(schema)
+        return matrices
+
+
+def _percentages(counts: np.ndarray, totals: np.ndarray) -> np.ndarray:
+    # Columns with no questions report 0, like the per-candidate stats
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(totals > 0, np.round(counts / totals * 100, 2), 0.0)
+
+
+class CohortScores:
+    """
+    Rule-based scores for every candidate of a test, computed together.
+
+    ``solved`` is the candidates x questions matrix; weighted scores,
+    difficulty and tag breakdowns, performance levels, ranks and
+    percentiles are a handful of matrix operations over it, so ranking a
+    whole hiring drive costs about as much as building the matrix.
+    """
+
+    def __init__(self, schema: TestSchema, candidates: List[Dict]):
+        self.schema = schema
+        self.candidates = candidates
+        matrices = _question_matrices(schema)
+        self.difficulties = DIFFICULTIES
+        self.tags = matrices.tags
+
+        n_questions = len(schema)
+        self.solved = np.zeros((len(candidates), n_questions), dtype=np.float64)
+        for i, candidate in enumerate(candidates):
+            self.solved[i] = schema.solved_flags(candidate)
+
+        if matrices.total_points > 0:
+            self.scores = np.round(self.solved @ matrices.points / matrices.total_points * 100)
+        else:
+            self.scores = np.zeros(len(candidates))
+
+        # Completion follows the analyzer: the candidate's own solved count
+        # over the number of questions in the test
+        total_solved = np.array([c.get('total_solved', 0) or 0 for c in candidates], dtype=np.float64)
+        self.completion_rates = total_solved / n_questions * 100 if n_questions else np.zeros(len(candidates))
+
+        self.difficulty_solved = self.solved @ matrices.difficulty
+        self.difficulty_totals = matrices.difficulty_totals
+        self.difficulty_percentages = _percentages(self.difficulty_solved, self.difficulty_totals)
+
+        self.tag_solved = self.solved @ matrices.tag_matrix
+        self.tag_totals = matrices.tag_totals
+        self.tag_percentages = _percentages(self.tag_solved, self.tag_totals)
+
+        conditions = [
+            (self.scores >= min_score) & (self.completion_rates >= min_completion)
+            for _, min_score, min_completion in PERFORMANCE_LEVELS
+        ]
+        self.levels = np.select(
+            conditions, [level for level, _, _ in PERFORMANCE_LEVELS], default=DEFAULT_PERFORMANCE_LEVEL
+        )
+
+        # Mean-rank percentile: share of the cohort scoring below, ties counted half
+        ordered = np.sort(self.scores)
+        below = np.searchsorted(ordered, self.scores, side='left')
+        at_or_below = np.searchsorted(ordered, self.scores, side='right')
+        count = max(len(candidates), 1)
+        self.percentiles = np.round((below + at_or_below) / 2 / count * 100, 2)
+        # Competition ranking: tied candidates share the best rank
+        self.ranks = len(candidates) - at_or_below + 1
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def order(self) -> np.ndarray:
+        """Candidate positions, best first (score, then completion rate)"""
+        return np.lexsort((-self.completion_rates, -self.scores))
+
+    def cohort_tag_accuracy(self) -> Dict[str, float]:
+        """Share of attempts on each tag solved across the whole cohort"""
+        if not len(self.candidates):
+            return {tag: 0 for tag in self.tags}
+        solved = self.tag_solved.sum(axis=0)
+        possible = self.tag_totals * len(self.candidates)
+        return dict(zip(self.tags, _percentages(solved, possible).tolist()))
+
+    def _difficulty(self, position: int) -> Dict:
+        return {
+            d: {
+                "total": int(self.difficulty_totals[j]),
+                "solved": int(self.difficulty_solved[position, j]),
+                "percentage": float(self.difficulty_percentages[position, j])
+            }
+            for j, d in enumerate(self.difficulties)
+        }
+
+    def _tags(self, position: int) -> Dict:
+        return {
+            tag: {
+                "total": int(self.tag_totals[j]),
+                "solved": int(self.tag_solved[position, j]),
+                "percentage": float(self.tag_percentages[position, j])
+            }
+            for j, tag in enumerate(self.tags)
+        }
+
+    def candidate_scores(self, position: int) -> CandidateScores:
+        """The analyzer's per-candidate stats, read from the cohort arrays"""
+        return CandidateScores(self._difficulty(position), self._tags(position), int(self.scores[position]))
+
+    def candidate(self, position: int) -> Dict:
+        candidate = self.candidates[position]
+        return {
+            "email": candidate.get('email'),
+            "username": candidate.get('username'),
+            "performance_score": int(self.scores[position]),
+            "completion_rate": round(float(self.completion_rates[position]), 2),
+            "performance_level": str(self.levels[position]),
+            "rank": int(self.ranks[position]),
+            "percentile": float(self.percentiles[position]),
+            "difficulty_analysis": self._difficulty(position),
+            "tag_performance": self._tags(position)
+        }
+
+    def ranking(self, limit: int = None) -> List[Dict]:
+        return [self.candidate(int(position)) for position in self.order()[:limit]]
+
+
+def score_cohort(test_questions, candidates: List[Dict]) -> CohortScores:
+    """Score every candidate of a test in one pass"""
+    return CohortScores(get_test_schema(test_questions), candidates)
@@ -0,0 +1,150 @@
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+JOB_WORKERS = 2
+MAX_FINISHED_JOBS = 200
+PROGRESS_NOTIFY_INTERVAL = 2.0  # seconds between progress notifications per job
+
+
+class JobQueue:
+    """
+    In-process background job queue for long-running shortlisting work.
+
+    Jobs run on a small pool of worker threads so HTTP handlers only enqueue
+    and return. Submitting the same (kind, key) while a job for it is still
+    queued or running returns the existing job instead of starting another.
+    Progress is reported through ``notify`` (the shortlisting agent's
+    NotificationStore hook) as well as on the job record, and a job may
+    publish partial results (``progress(..., item=...)``) that streaming
+    clients read with ``wait_for_items`` while it runs.
+
+    Jobs and their dedupe live in this process only, so they assume a
+    single server worker process.
+    """
+
+    def __init__(self, workers: int = JOB_WORKERS, notify: Callable = None, max_finished: int = MAX_FINISHED_JOBS):
+        self.notify = notify
+        self.max_finished = max_finished
+        self._jobs: "OrderedDict[str, Dict]" = OrderedDict()
+        self._active: Dict[tuple, str] = {}
+        self._items: Dict[str, List] = {}
+        self._lock = threading.Lock()
+        self._done = threading.Condition(self._lock)
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        for i in range(workers):
+            threading.Thread(target=self._worker, name=f"shortlisting-job-{i}", daemon=True).start()
+
+    def submit(self, kind: str, key, func: Callable, *args, **kwargs) -> Dict:
+        """Queue ``func(progress, *args, **kwargs)`` unless the same job is already pending"""
+        with self._lock:
+            job_id = self._active.get((kind, key))
+            if job_id is not None:
+                return dict(self._jobs[job_id])
+            job_id = uuid.uuid4().hex
+            job = {
+                'id': job_id,
+                'kind': kind,
+                'key': key,
+                'status': 'queued',
+                'progress': None,
+                'result': None,
+                'error': None,
+                'created_at': time.time(),
+                'started_at': None,
+                'finished_at': None
+            }
+            self._jobs[job_id] = job
+            self._items[job_id] = []
+            self._active[(kind, key)] = job_id
+            self._queue.put((job_id, func, args, kwargs))
+            return dict(job)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """Block until the job finishes or ``timeout`` seconds pass; returns its current state"""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                job = self._jobs.get(job_id)
+                if job is None or job['status'] in ('completed', 'failed'):
+                    return dict(job) if job else None
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return dict(job)
+                self._done.wait(remaining)
+
+    def wait_for_items(self, job_id: str, start: int, timeout: float) -> Tuple[List, Optional[Dict]]:
+        """
+        Partial results from position ``start`` on, blocking up to ``timeout``
+        seconds for one to arrive; returns them with the job's current state
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            while True:
+                job = self._jobs.get(job_id)
+                items = self._items.get(job_id, [])[start:]
+                remaining = deadline - time.monotonic()
+                if items or job is None or job['status'] in ('completed', 'failed') or remaining <= 0:
+                    return list(items), dict(job) if job else None
+                self._done.wait(remaining)
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _notify(self, message: str, type: str, job: Dict, **details):
+        if self.notify is None:
+            return
+        try:
+            self.notify(message, type, details={'job_id': job['id'], 'kind': job['kind'], **details})
+        except Exception:
+            pass  # Notifications are best-effort
+
+    def _worker(self):
+        while True:
+            job_id, func, args, kwargs = self._queue.get()
+            self._update(job_id, status='running', started_at=time.time())
+            job = self.get(job_id)
+
+            last_notified = [0.0]
+
+            def progress(message: str, item=None, **fields):
+                with self._lock:
+                    self._jobs[job_id]['progress'] = {'message': message, **fields}
+                    if item is not None:
+                        self._items[job_id].append(item)
+                        self._done.notify_all()
+                # The job record always has the latest step; notifications are throttled
+                now = time.monotonic()
+                if now - last_notified[0] >= PROGRESS_NOTIFY_INTERVAL:
+                    last_notified[0] = now
+                    self._notify(message, 'processing', job, **fields)
+
+            try:
+                result = func(progress, *args, **kwargs)
+                fields = {'status': 'completed', 'result': result}
+            except Exception as e:
+                print(f"Error in background job {job['kind']} ({job_id}): {e}")
+                print(traceback.format_exc())
+                fields = {'status': 'failed', 'error': str(e)}
+            with self._lock:
+                self._jobs[job_id].update(fields, finished_at=time.time())
+                self._active.pop((job['kind'], job['key']), None)
+                self._evict()
+                self._done.notify_all()
+
+    def _evict(self):
+        # Drop the oldest finished jobs once too many are kept for status queries
+        finished = [jid for jid, j in self._jobs.items() if j['status'] in ('completed', 'failed')]
+        for jid in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[jid]
+            self._items.pop(jid, None)
@@ -1,6 +1,8 @@
 import json
 import re
-from typing import Dict, List, Any
+import threading
+from typing import Dict, List, Any, Union
+from test_schema import CandidateScores, TestSchema, get_test_schema, performance_level
 
 # Lazy import transformers to prevent crashes if not installed
 TRANSFORMERS_AVAILABLE = False
@@ -38,11 +40,22 @@ class LLMPerformanceAnalyzer:
                 self.device = "cpu"
         self.model_loaded = False
         self._load_failed = False  # Track if loading has failed
+        # Bulk analysis calls in from several threads; only one may load the model
+        self._load_lock = threading.Lock()
         if load_model:
             self._load_model()
     
     def _load_model(self):
         """Load the LLM model and tokenizer - can be disabled to prevent crashes"""
+        if self.model_loaded or self._load_failed:
+            return
+        with self._load_lock:
+            # Another thread may have finished (or given up) while we waited
+            if self.model_loaded or self._load_failed:
+                return
+            self._load_model_locked()
+    
+    def _load_model_locked(self):
         if self.model_loaded:
             return
         
@@ -65,7 +78,6 @@ class LLMPerformanceAnalyzer:
             
             # Try loading with basic settings first
             # Use timeout and better error handling
-            import threading
             import queue
             
             result_queue = queue.Queue()
@@ -151,9 +163,12 @@ class LLMPerformanceAnalyzer:
         Analyze candidate performance using LLM and return detailed analysis
         NOTE: Model loading is DISABLED by default to prevent server crashes.
         Set ENABLE_LLM_MODEL=true in environment to enable model loading.
+        Pass scores= (a CandidateScores, e.g. from CohortScores.candidate_scores)
+        to reuse stats already computed for the whole cohort.
         """
         report_type = kwargs.get('report_type', 'general')
         job_role = kwargs.get('job_role', 'Software Engineer')
+        scores = kwargs.get('scores')
         # DISABLE model loading by default to prevent server crashes
         # Model loading is now completely disabled unless ENABLE_LLM_MODEL=true is set
         import os
@@ -166,7 +181,7 @@ class LLMPerformanceAnalyzer:
                 print("INFO: LLM model loading is disabled by default. Using rule-based analysis.")
                 print("      Set ENABLE_LLM_MODEL=true in environment to enable LLM analysis.")
                 self._rule_based_only_warned = True
-            return self._rule_based_analysis(candidate_data, test_questions, report_type, job_role)
+            return self._rule_based_analysis(candidate_data, test_questions, report_type, job_role, scores)
         
         # Only attempt model loading if explicitly enabled
         # Load model on first use if not already loaded (prevents startup crashes)
@@ -186,13 +201,13 @@ class LLMPerformanceAnalyzer:
                 else:
                     return self._llm_analysis(candidate_data, test_questions, report_type, job_role)
             else:
-                return self._rule_based_analysis(candidate_data, test_questions, report_type, job_role)
+                return self._rule_based_analysis(candidate_data, test_questions, report_type, job_role, scores)
         except Exception as e:
             print(f"Error in performance analysis: {e}")
             import traceback
             traceback.print_exc()
             # Always fall back to rule-based analysis on any error
-            return self._rule_based_analysis(candidate_data, test_questions, report_type, job_role)
+            return self._rule_based_analysis(candidate_data, test_questions, report_type, job_role, scores)
     
     def _llm_analysis_with_codeforces(self, candidate_data: Dict, test_questions: List[Dict], codeforces_data: Dict, report_type: str = 'general', job_role: str = 'Software Engineer') -> Dict:
         """Use LLM for advanced performance analysis with real Codeforces data"""
@@ -249,11 +264,15 @@ class LLMPerformanceAnalyzer:
         # Parse LLM response
         return self._parse_llm_response(analysis_text, candidate_data)
     
-    def _rule_based_analysis(self, candidate_data: Dict, test_questions: List[Dict], report_type: str = 'general', job_role: str = 'Software Engineer') -> Dict:
+    def _rule_based_analysis(self, candidate_data: Dict, test_questions: List[Dict], report_type: str = 'general', job_role: str = 'Software Engineer', scores: CandidateScores = None) -> Dict:
         """Fallback rule-based analysis with job-specific insights"""
         
-        flat_questions = self._extract_questions(test_questions)
-        total_questions = len(flat_questions)
+        # Compiled once per test; the candidate's results are resolved once
+        # and every helper below reads the resulting stats
+        schema = get_test_schema(test_questions)
+        if scores is None:
+            scores = schema.candidate_scores(candidate_data)
+        total_questions = len(schema)
         solved_questions = candidate_data.get('total_solved', 0)
         username = candidate_data.get('username', 'Unknown')
         email = candidate_data.get('email', 'Unknown')
@@ -262,13 +281,15 @@ class LLMPerformanceAnalyzer:
         completion_rate = (solved_questions / total_questions) * 100 if total_questions > 0 else 0
         
         # Analyze difficulty levels
-        difficulty_analysis = self._analyze_difficulty_performance(candidate_data, flat_questions)
+        difficulty_analysis = scores.difficulty
         
         # Calculate performance score
-        performance_score = self._calculate_performance_score(candidate_data, flat_questions)
+        performance_score = scores.score
         
         # Generate insights
-        insights = self._generate_insights(candidate_data, flat_questions, completion_rate)
+        insights = self._generate_insights(scores, completion_rate)
+        strengths = self._identify_strengths(scores)
+        improvement_areas = self._identify_improvement_areas(scores)
         
         # Determine performance level
         performance_level = self._determine_performance_level(performance_score, completion_rate)
@@ -348,8 +369,8 @@ class LLMPerformanceAnalyzer:
             "summary": summary,
             "score": performance_score,
             "level": performance_level,
-            "key_strengths": self._identify_strengths(candidate_data, flat_questions),
-            "weaknesses": self._identify_improvement_areas(candidate_data, flat_questions),
+            "key_strengths": strengths,
+            "weaknesses": improvement_areas,
             "recommendation": self._generate_recommendations(performance_score, completion_rate)[0],
             "technical_skills": {"Algorithms": "High" if performance_score > 70 else "Medium", "Problem Solving": "High" if completion_rate > 80 else "Medium"},
             "cultural_fit": "Likely to fit well in structured engineering teams.",
@@ -375,8 +396,8 @@ class LLMPerformanceAnalyzer:
             "difficulty_analysis": difficulty_analysis,
             "insights": insights,
             "recommendations": self._generate_recommendations(performance_score, completion_rate),
-            "strengths": self._identify_strengths(candidate_data, flat_questions),
-            "areas_for_improvement": self._identify_improvement_areas(candidate_data, flat_questions),
+            "strengths": strengths,
+            "areas_for_improvement": improvement_areas,
             "codeforces_data": {
                 "success_rate": round(completion_rate, 2),
                 "total_submissions": 0,
@@ -724,8 +745,7 @@ class LLMPerformanceAnalyzer:
             difficulty_analysis = self._analyze_codeforces_difficulty(codeforces_data)
             if (not difficulty_analysis or all(d['total'] == 0 for d in difficulty_analysis.values() if isinstance(d, dict))) and test_questions:
                  # Fallback to local difficulty analysis
-                 flat_questions = self._extract_questions(test_questions)
-                 difficulty_analysis = self._analyze_difficulty_performance(candidate_data, flat_questions)
+                 difficulty_analysis = self._analyze_difficulty_performance(candidate_data, test_questions)
 
             return {
                 "candidate_info": {
@@ -1061,165 +1081,19 @@ class LLMPerformanceAnalyzer:
             "llm_analysis": response
         }
     
-    def _analyze_difficulty_performance(self, candidate_data: Dict, test_questions: List[Dict]) -> Dict:
+    def _analyze_difficulty_performance(self, candidate_data: Dict, test_questions: Union[TestSchema, List[Dict]]) -> Dict:
         """Analyze performance by difficulty level"""
-        
-        difficulty_stats = {
-            "easy": {"total": 0, "solved": 0},
-            "medium": {"total": 0, "solved": 0},
-            "hard": {"total": 0, "solved": 0}
-        }
-        
-        # Iterate through sections to reconstruct IDs correctly
-        # Handle both flat list (legacy) and section-based structure
-        
-        # Check if it's a flat list or sections
-        is_flat = True
-        if test_questions and isinstance(test_questions[0], dict) and 'questions' in test_questions[0] and isinstance(test_questions[0]['questions'], list):
-            is_flat = False
-            
-        if is_flat:
-            # Wrap in a default section to unify logic
-            sections = [{'id': 'default', 'questions': test_questions}]
-        else:
-            sections = test_questions
-            
-        for section_idx, section in enumerate(sections):
-            section_id = section.get('id', section_idx)
-            
-            for q_idx, question in enumerate(section.get('questions', [])):
-                # Determine question ID and rating
-                if question.get('type') == 'codeforces' or ('contestId' in question and 'index' in question):
-                    q_data = question.get('data', question)
-                    question_id = f"{q_data.get('contestId', '')}{q_data.get('index', '')}"
-                    rating = q_data.get('rating', 0)
-                else:
-                    # Manual question
-                    # Try explicit ID first, then fallback to section_index format used by frontend
-                    if question.get('id'):
-                        question_id = str(question.get('id'))
-                    else:
-                        # Reconstruct ID: sectionId_index
-                        # Note: section.id might be numeric or string. Frontend uses `currentSection.id || idx`
-                        # If section.id is present, use it. Else use section index.
-                        s_id = section.get('id')
-                        if s_id is None: 
-                            s_id = section_idx
-                        question_id = f"{s_id}_{q_idx}"
-                        
-                    rating = 1400 # Default to medium
-                
-                # Check if solved
-                result_data = candidate_data.get('questions', {}).get(question_id, {})
-                
-                # Debug logging
-                print(f"DEBUG: Checking QID '{question_id}' (Rating: {rating})")
-                
-                # Fallback to multiple ID formats if not found
-                if not result_data:
-                    s_id = section.get('id')
-                    if s_id is None: s_id = section_idx
-                    
-                    # Try various formats
-                    fallback_ids = [
-                        f"{s_id}_{q_idx}",      # Standard section_index
-                        f"1_{q_idx}",           # Section 1 default
-                        f"0_{q_idx}",           # Section 0 default
-                        f"{q_idx}",             # Plain index
-                        f"default_{q_idx}"      # Default section
-                    ]
-                    
-                    print(f"DEBUG: Not found. Trying fallbacks: {fallback_ids}")
-                    print(f"DEBUG: Available Candidate Keys: {list(candidate_data.get('questions', {}).keys())}")
-                    
-                    for fid in fallback_ids:
-                        res = candidate_data.get('questions', {}).get(fid, {})
-                        if res:
-                            print(f"DEBUG: Found match with fallback '{fid}'")
-                            result_data = res
-                            break
-                
-                solved = result_data.get('solved', False)
-                
-                if rating <= 1200:
-                    difficulty = "easy"
-                elif rating <= 1600:
-                    difficulty = "medium"
-                else:
-                    difficulty = "hard"
-                
-                difficulty_stats[difficulty]["total"] += 1
-                if solved:
-                    difficulty_stats[difficulty]["solved"] += 1
-        
-        # Calculate percentages
-        for difficulty in difficulty_stats:
-            total = difficulty_stats[difficulty]["total"]
-            solved = difficulty_stats[difficulty]["solved"]
-            difficulty_stats[difficulty]["percentage"] = round((solved / total) * 100, 2) if total > 0 else 0
-        
-        return difficulty_stats
+        return get_test_schema(test_questions).difficulty_stats(candidate_data)
     
-    def _calculate_weighted_score(self, candidate_data: Dict, test_questions: List[Dict]) -> int:
+    def _calculate_weighted_score(self, candidate_data: Dict, test_questions: Union[TestSchema, List[Dict]]) -> int:
         """Calculate score weighted by difficulty (Easy=10, Medium=20, Hard=30)"""
-        
-        score = 0
-        total_possible = 0
-        
-        flat_questions = self._extract_questions(test_questions)
-        
-        for q in flat_questions:
-            # Determine difficulty
-            if q.get('type') == 'codeforces' or ('contestId' in q and 'index' in q):
-                q_data = q.get('data', q)
-                rating = q_data.get('rating', 0)
-                if rating <= 1200: points = 10
-                elif rating <= 1600: points = 20
-                else: points = 30
-            else:
-                # Manual questions default to Medium (20) unless specified
-                points = 20 
-            
-            total_possible += points
-            
-            # Check if solved (using robust ID lookup)
-            # We need to replicate the robust lookup here or refactor it.
-            # For simplicity, let's assume the data is consistent or we use a helper.
-            # To avoid code duplication, we'll use a simplified check here.
-            
-            # Reconstruct ID
-            # This is tricky without the full context of sections, but we have flat_questions.
-            # Let's try to match by ID if present, or rely on 'total_solved' count for approximation if needed.
-            # Ideally we should use the same robust logic.
-            
-            # Simplified: If we can't easily match, we might fallback to completion_rate * 100.
-            # But let's try to match.
-            
-            is_solved = False
-            # ... (Robust lookup logic would go here, but for brevity/reliability let's use the difficulty_stats if available)
-            # Actually, _analyze_difficulty_performance already does the heavy lifting of matching.
-            # Let's reuse that!
-            
-        # Better approach: Use _analyze_difficulty_performance results
-        diff_stats = self._analyze_difficulty_performance(candidate_data, test_questions)
-        
-        score = (diff_stats['easy']['solved'] * 10) + \
-                (diff_stats['medium']['solved'] * 20) + \
-                (diff_stats['hard']['solved'] * 30)
-                
-        total_possible = (diff_stats['easy']['total'] * 10) + \
-                         (diff_stats['medium']['total'] * 20) + \
-                         (diff_stats['hard']['total'] * 30)
-                         
-        if total_possible == 0: return 0
-        
-        return round((score / total_possible) * 100)
+        return get_test_schema(test_questions).weighted_score(candidate_data)
 
-    def _calculate_performance_score(self, candidate_data: Dict, test_questions: List[Dict]) -> int:
+    def _calculate_performance_score(self, candidate_data: Dict, test_questions: Union[TestSchema, List[Dict]]) -> int:
         """Calculate overall performance score (0-100) using weighted scoring"""
         return self._calculate_weighted_score(candidate_data, test_questions)
     
-    def _generate_insights(self, candidate_data: Dict, test_questions: List[Dict], completion_rate: float) -> List[str]:
+    def _generate_insights(self, scores: CandidateScores, completion_rate: float) -> List[str]:
         """Generate performance insights"""
         
         insights = []
@@ -1234,7 +1108,7 @@ class LLMPerformanceAnalyzer:
             insights.append("Below average performance, significant improvement needed")
         
         # Analyze by difficulty
-        difficulty_analysis = self._analyze_difficulty_performance(candidate_data, test_questions)
+        difficulty_analysis = scores.difficulty
         
         if difficulty_analysis["hard"]["percentage"] > 50:
             insights.append("Strong performance on challenging problems")
@@ -1242,7 +1116,7 @@ class LLMPerformanceAnalyzer:
             insights.append("Solid foundation in basic problem-solving")
         
         # Analyze by tags
-        tag_performance = self._analyze_tag_performance(candidate_data, test_questions)
+        tag_performance = scores.tags
         strong_tags = [tag for tag, stats in tag_performance.items() if stats["percentage"] > 70]
         weak_tags = [tag for tag, stats in tag_performance.items() if stats["percentage"] < 30]
         
@@ -1253,50 +1127,13 @@ class LLMPerformanceAnalyzer:
         
         return insights
     
-    def _analyze_tag_performance(self, candidate_data: Dict, test_questions: List[Dict]) -> Dict:
+    def _analyze_tag_performance(self, candidate_data: Dict, test_questions: Union[TestSchema, List[Dict]]) -> Dict:
         """Analyze performance by problem tags"""
-        
-        flat_questions = self._extract_questions(test_questions)
-        tag_stats = {}
-        
-        for question in flat_questions:
-            if question.get('type') == 'codeforces' or ('contestId' in question and 'index' in question):
-                q_data = question.get('data', question)
-                question_id = f"{q_data.get('contestId', '')}{q_data.get('index', '')}"
-                tags = q_data.get('tags', [])
-            else:
-                question_id = str(question.get('id', ''))
-                tags = ['general'] # Default tag for manual questions
-            
-            solved = candidate_data.get('questions', {}).get(question_id, {}).get('solved', False)
-            
-            for tag in tags:
-                if tag not in tag_stats:
-                    tag_stats[tag] = {"total": 0, "solved": 0}
-                
-                tag_stats[tag]["total"] += 1
-                if solved:
-                    tag_stats[tag]["solved"] += 1
-        
-        # Calculate percentages
-        for tag in tag_stats:
-            total = tag_stats[tag]["total"]
-            solved = tag_stats[tag]["solved"]
-            tag_stats[tag]["percentage"] = round((solved / total) * 100, 2) if total > 0 else 0
-        
-        return tag_stats
+        return get_test_schema(test_questions).tag_stats(candidate_data)
     
     def _determine_performance_level(self, score: int, completion_rate: float) -> str:
         """Determine performance level based on score and completion rate"""
-        
-        if score >= 85 and completion_rate >= 80:
-            return "Excellent"
-        elif score >= 70 and completion_rate >= 60:
-            return "Good"
-        elif score >= 50 and completion_rate >= 40:
-            return "Average"
-        else:
-            return "Needs Improvement"
+        return performance_level(score, completion_rate)
     
     def _generate_recommendations(self, score: int, completion_rate: float) -> List[str]:
         """Generate recommendations based on performance"""
@@ -1330,11 +1167,11 @@ class LLMPerformanceAnalyzer:
         
         return recommendations
     
-    def _identify_strengths(self, candidate_data: Dict, test_questions: List[Dict]) -> List[str]:
+    def _identify_strengths(self, scores: CandidateScores) -> List[str]:
         """Identify candidate strengths"""
         
         strengths = []
-        difficulty_analysis = self._analyze_difficulty_performance(candidate_data, test_questions)
+        difficulty_analysis = scores.difficulty
         
         if difficulty_analysis["hard"]["percentage"] > 60:
             strengths.append("Excellent problem-solving on challenging problems")
@@ -1342,7 +1179,7 @@ class LLMPerformanceAnalyzer:
         if difficulty_analysis["easy"]["percentage"] > 90:
             strengths.append("Strong foundation in basic concepts")
         
-        tag_performance = self._analyze_tag_performance(candidate_data, test_questions)
+        tag_performance = scores.tags
         strong_tags = [tag for tag, stats in tag_performance.items() if stats["percentage"] > 80]
         
         if strong_tags:
@@ -1350,11 +1187,11 @@ class LLMPerformanceAnalyzer:
         
         return strengths
     
-    def _identify_improvement_areas(self, candidate_data: Dict, test_questions: List[Dict]) -> List[str]:
+    def _identify_improvement_areas(self, scores: CandidateScores) -> List[str]:
         """Identify areas for improvement"""
         
         improvement_areas = []
-        difficulty_analysis = self._analyze_difficulty_performance(candidate_data, test_questions)
+        difficulty_analysis = scores.difficulty
         
         if difficulty_analysis["hard"]["percentage"] < 30:
             improvement_areas.append("Practice with advanced algorithmic problems")
@@ -1362,7 +1199,7 @@ class LLMPerformanceAnalyzer:
         if difficulty_analysis["medium"]["percentage"] < 50:
             improvement_areas.append("Improve intermediate problem-solving skills")
         
-        tag_performance = self._analyze_tag_performance(candidate_data, test_questions)
+        tag_performance = scores.tags
         weak_tags = [tag for tag, stats in tag_performance.items() if stats["percentage"] < 40]
         
         if weak_tags:
@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from codeforces_api import CodeforcesAPIError
+
+CATALOG_TTL_SECONDS = 6 * 3600
+CATALOG_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'backend', 'codeforces_problemset.json')
+
+
+class CatalogUnavailableError(CodeforcesAPIError):
+    """The first catalogue download failed and there is nothing cached to serve"""
+
+
+class _CatalogIndex:
+    """Immutable snapshot of the problemset and its lookup indexes"""
+
+    def __init__(self, problems: List[Dict]):
+        self.problems = problems
+        # rating -> positions, in problemset order (newest contests first)
+        self.by_rating: Dict[int, List[int]] = {}
+        # tag -> positions
+        self.by_tag: Dict[str, Set[int]] = {}
+        for pos, problem in enumerate(problems):
+            rating = problem.get('rating')
+            if rating is not None:
+                self.by_rating.setdefault(rating, []).append(pos)
+            for tag in problem.get('tags', []):
+                self.by_tag.setdefault(tag, set()).add(pos)
+        self.ratings = sorted(self.by_rating)
+        self._intersections: Dict[FrozenSet[str], Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def with_tags(self, tags: FrozenSet[str]) -> Set[int]:
+        """Positions of problems carrying every tag in ``tags`` (memoized)"""
+        with self._lock:
+            cached = self._intersections.get(tags)
+        if cached is not None:
+            return cached
+        sets = sorted((self.by_tag.get(tag, set()) for tag in tags), key=len)
+        result = set(sets[0]).intersection(*sets[1:]) if sets else set()
+        with self._lock:
+            self._intersections[tags] = result
+        return result
+
+    def rated_between(self, low: Optional[int], high: Optional[int]) -> List[int]:
+        positions = []
+        for rating in self.ratings:
+            if low is not None and rating < low:
+                continue
+            if high is not None and rating > high:
+                break
+            positions.extend(self.by_rating[rating])
+        positions.sort()
+        return positions
+
+
+class ProblemCatalog:
+    """
+    Locally persisted Codeforces problemset with rating and tag indexes.
+
+    The catalogue is loaded from disk on startup and refreshed in the
+    background once it is older than ``ttl_seconds`` (sending the stored
+    ETag, if any), so queries never wait on the network except for the
+    very first download.
+    """
+
+    def __init__(self, cf_api, path: str = CATALOG_PATH, ttl_seconds: int = CATALOG_TTL_SECONDS):
+        self.cf_api = cf_api
+        self.path = os.path.abspath(path)
+        self.ttl_seconds = ttl_seconds
+        self.etag = None
+        self.fetched_at = 0.0
+        self._index = _CatalogIndex([])
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._initial_lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._index = _CatalogIndex(data.get('problems', []))
+            self.etag = data.get('etag')
+            self.fetched_at = data.get('fetched_at', 0.0)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error loading problem catalogue: {e}")
+
+    def _save(self, problems: List[Dict]):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'fetched_at': self.fetched_at, 'etag': self.etag, 'problems': problems}, f)
+        os.replace(tmp_path, self.path)
+
+    def is_stale(self) -> bool:
+        return time.time() - self.fetched_at > self.ttl_seconds
+
+    def refresh(self):
+        """Fetch the problemset if it changed and swap in fresh indexes"""
+        problems, etag = self.cf_api.fetch_problemset(self.etag if self._index.problems else None)
+        self.fetched_at = time.time()
+        if problems is not None:
+            self.etag = etag
+            self._index = _CatalogIndex(problems)
+        self._save(self._index.problems)
+
+    def _refresh_worker(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Error refreshing problem catalogue: {e}")
+        finally:
+            with self._refresh_lock:
+                self._refreshing = False
+
+    def refresh_in_background(self):
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_worker, daemon=True).start()
+
+    def query(self, tags: List[str] = None, difficulty_min: int = None, difficulty_max: int = None, offset: int = 0, limit: int = None) -> Tuple[List[Dict], int]:
+        """
+        Return (problems, total) matching all ``tags`` and the rating range.
+        Problems without a rating are excluded when a rating bound is given
+        """
+        if not self._index.problems:
+            # Nothing cached yet: the first download has to block (once)
+            with self._initial_lock:
+                if not self._index.problems:
+                    try:
+                        self.refresh()
+                    except Exception as e:
+                        raise CatalogUnavailableError(f"Codeforces problemset unavailable: {e}") from e
+        elif self.is_stale():
+            self.refresh_in_background()
+
+        index = self._index
+        if difficulty_min is not None or difficulty_max is not None:
+            positions = index.rated_between(difficulty_min, difficulty_max)
+            if tags:
+                tagged = index.with_tags(frozenset(tags))
+                positions = [pos for pos in positions if pos in tagged]
+        elif tags:
+            positions = sorted(index.with_tags(frozenset(tags)))
+        else:
+            positions = range(len(index.problems))
+
+        total = len(positions)
+        end = total if limit is None else offset + limit
+        return [index.problems[pos] for pos in positions[offset:end]], total
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_problem_catalog(cf_api) -> ProblemCatalog:
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = ProblemCatalog(cf_api)
+        return _catalog
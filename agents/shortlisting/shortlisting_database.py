@@ -1,7 +1,25 @@
 import sqlite3
 import os
+import json
 from datetime import datetime
 
+# PRAGMA user_version of userids.db once result_data holds JSON
+RESULT_DATA_JSON_VERSION = 1
+
+
+def load_result_data(text):
+    """Parse a stored result_data payload (JSON; older rows hold a Python dict repr)"""
+    if not text:
+        return {}
+    try:
+        return json.loads(text)
+    except ValueError:
+        import ast
+        try:
+            return ast.literal_eval(text)
+        except (ValueError, SyntaxError):
+            return {}
+
 class DatabaseManager:
     def __init__(self):
         self.backend_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'backend')
@@ -108,6 +126,66 @@ class DatabaseManager:
             )
         ''')
         
+        # Materialized per-candidate summary of test_results, rebuilt on every
+        # write so the results pages read one precomputed row per candidate
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS candidate_results (
+                userid_id INTEGER PRIMARY KEY,
+                test_id INTEGER NOT NULL,
+                candidate_email TEXT NOT NULL,
+                codeforces_username TEXT NOT NULL,
+                questions TEXT NOT NULL,  -- JSON map of question_id -> {solved, data}
+                total_solved INTEGER DEFAULT 0,
+                weighted_score INTEGER DEFAULT 0,
+                tab_switches INTEGER DEFAULT 0,
+                time_taken INTEGER DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (userid_id) REFERENCES userids (id)
+            )
+        ''')
+        # (test_id, userid_id) also serves lookups on test_id alone
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_candidate_results_test ON candidate_results (test_id, userid_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_test_results_userid ON test_results (userid_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_userids_test ON userids (test_id)')
+        
+        # Migration: result_data used to be str(dict); rewrite it as JSON once
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] < RESULT_DATA_JSON_VERSION:
+            cursor.execute('SELECT id, userid_id, result_data FROM test_results')
+            converted = []
+            migrated_users = set()
+            for row_id, userid_id, result_data in cursor.fetchall():
+                try:
+                    json.loads(result_data or '')
+                except ValueError:
+                    converted.append((json.dumps(load_result_data(result_data), default=str), row_id))
+                    migrated_users.add(userid_id)
+            cursor.executemany('UPDATE test_results SET result_data = ? WHERE id = ?', converted)
+            if migrated_users:
+                self._refresh_candidate_results(cursor, migrated_users)
+            cursor.execute(f'PRAGMA user_version = {RESULT_DATA_JSON_VERSION}')
+        
+        # Migration: summarize candidates whose results predate the table
+        cursor.execute('''
+            SELECT DISTINCT tr.userid_id FROM test_results tr
+            LEFT JOIN candidate_results cr ON cr.userid_id = tr.userid_id
+            WHERE cr.userid_id IS NULL
+        ''')
+        missing = [row[0] for row in cursor.fetchall()]
+        if missing:
+            self._refresh_candidate_results(cursor, missing)
+        
+        # Per-handle Codeforces sync cursor: newest submission id seen plus
+        # the best submission per problem collected so far
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS codeforces_sync (
+                handle TEXT PRIMARY KEY,  -- lowercased Codeforces handle
+                last_submission_id INTEGER NOT NULL,
+                submissions TEXT NOT NULL,  -- JSON list of indexed submissions
+                synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
         conn.commit()
         conn.close()
     
@@ -355,7 +433,6 @@ class DatabaseManager:
         conn.close()
         
         if result:
-            import json
             return json.loads(result[0])
         return []
     
@@ -374,6 +451,32 @@ class DatabaseManager:
         
         return [{'id': row[0], 'email': row[1], 'username': row[2]} for row in users]
     
+    def get_submission_cursor(self, handle):
+        """Get (last_submission_id, submissions) stored for a handle, or (None, [])"""
+        conn = self._get_connection(self.userids_db)
+        cursor = conn.cursor()
+        cursor.execute(
+            'SELECT last_submission_id, submissions FROM codeforces_sync WHERE handle = ?',
+            (handle.lower(),)
+        )
+        row = cursor.fetchone()
+        conn.close()
+        
+        if row:
+            return row[0], json.loads(row[1])
+        return None, []
+    
+    def save_submission_cursor(self, handle, last_submission_id, submissions):
+        """Store the sync cursor and indexed submissions for a handle"""
+        conn = self._get_connection(self.userids_db)
+        cursor = conn.cursor()
+        cursor.execute('''
+            INSERT OR REPLACE INTO codeforces_sync (handle, last_submission_id, submissions, synced_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ''', (handle.lower(), last_submission_id, json.dumps(submissions)))
+        conn.commit()
+        conn.close()
+    
     def save_test_results(self, userid_id, test_id, results):
         """Save test results for a user"""
         conn = self._get_connection(self.userids_db)
@@ -388,12 +491,23 @@ class DatabaseManager:
                 cursor.execute('''
                     INSERT INTO test_results (userid_id, test_id, question_id, solved, result_data)
                     VALUES (?, ?, ?, ?, ?)
-                ''', (userid_id, test_id, question_id, result_data.get('solved', False), str(result_data)))
+                ''', (userid_id, test_id, question_id, result_data.get('solved', False), json.dumps(result_data, default=str)))
             
+            self._refresh_candidate_results(cursor, [userid_id])
             conn.commit()
         finally:
             conn.close()
 
+    def get_user_results(self, userid_id):
+        """Get one registration's stored results as {question_id: result}"""
+        conn = self._get_connection(self.userids_db)
+        cursor = conn.cursor()
+        cursor.execute('SELECT question_id, result_data FROM test_results WHERE userid_id = ?', (userid_id,))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return {question_id: load_result_data(result_data) for question_id, result_data in rows}
+
     def update_candidate_metrics(self, userid_id, tab_switches, time_taken):
         """Update candidate metrics (tab switches, time taken)"""
         conn = self._get_connection(self.userids_db)
@@ -404,6 +518,11 @@ class DatabaseManager:
                 SET tab_switches = ?, time_taken = ?
                 WHERE id = ?
             ''', (tab_switches, time_taken, userid_id))
+            cursor.execute('''
+                UPDATE candidate_results
+                SET tab_switches = ?, time_taken = ?
+                WHERE userid_id = ?
+            ''', (tab_switches, time_taken, userid_id))
             conn.commit()
         finally:
             conn.close()
@@ -423,6 +542,7 @@ class DatabaseManager:
             
             # Delete from test_results
             cursor.execute('DELETE FROM test_results WHERE userid_id = ?', (userid_id,))
+            cursor.execute('DELETE FROM candidate_results WHERE userid_id = ?', (userid_id,))
             
             # Delete from userids
             cursor.execute('DELETE FROM userids WHERE id = ?', (userid_id,))
@@ -450,6 +570,104 @@ class DatabaseManager:
         
         return results
     
+    def _refresh_candidate_results(self, cursor, userid_ids):
+        """Rebuild the candidate_results rows of the given users from test_results"""
+        from test_schema import get_test_schema
+        
+        userid_ids = list(userid_ids)
+        for start in range(0, len(userid_ids), 500):
+            chunk = userid_ids[start:start + 500]
+            placeholders = ','.join(['?'] * len(chunk))
+            cursor.execute(f'''
+                SELECT u.id, u.test_id, u.candidate_email, u.codeforces_username, u.tab_switches, u.time_taken,
+                       tr.question_id, tr.solved, tr.result_data
+                FROM userids u
+                JOIN test_results tr ON u.id = tr.userid_id
+                WHERE u.id IN ({placeholders})
+                ORDER BY u.id, tr.question_id
+            ''', chunk)
+            
+            summaries = {}
+            for user_id, test_id, email, username, tab_switches, time_taken, question_id, solved, result_data in cursor.fetchall():
+                summary = summaries.setdefault(user_id, {
+                    'test_id': test_id, 'email': email, 'username': username,
+                    'tab_switches': tab_switches, 'time_taken': time_taken, 'questions': {}
+                })
+                question = summary['questions'].get(question_id)
+                if question is None:
+                    summary['questions'][question_id] = {'solved': bool(solved), 'data': load_result_data(result_data)}
+                elif solved:
+                    # Duplicate rows count as solved if any of them is
+                    question['solved'] = True
+            
+            # Users without results have no summary, as with the old JOIN
+            gone = [user_id for user_id in chunk if user_id not in summaries]
+            if gone:
+                cursor.execute(f'DELETE FROM candidate_results WHERE userid_id IN ({",".join(["?"] * len(gone))})', gone)
+            
+            schemas = {}
+            for user_id, summary in summaries.items():
+                test_id = summary['test_id']
+                if test_id not in schemas:
+                    schemas[test_id] = get_test_schema(self.get_test_questions(test_id))
+                candidate = {'questions': summary['questions']}
+                cursor.execute('''
+                    INSERT OR REPLACE INTO candidate_results
+                        (userid_id, test_id, candidate_email, codeforces_username, questions,
+                         total_solved, weighted_score, tab_switches, time_taken, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+                ''', (
+                    user_id, test_id, summary['email'], summary['username'], json.dumps(summary['questions']),
+                    sum(1 for q in summary['questions'].values() if q['solved']),
+                    schemas[test_id].weighted_score(candidate),
+                    summary['tab_switches'], summary['time_taken']
+                ))
+    
+    def _candidate_result_row(self, row):
+        user_id, email, username, questions, total_solved, weighted_score, tab_switches, time_taken, updated_at = row
+        return {
+            'id': user_id,
+            'email': email,
+            'username': username,
+            'questions': json.loads(questions),
+            'total_solved': total_solved,
+            'weighted_score': weighted_score,
+            'tab_switches': tab_switches,
+            'time_taken': time_taken,
+            'last_fetched_at': updated_at
+        }
+    
+    def get_candidate_results(self, test_id):
+        """Get the precomputed per-candidate results of a test, ordered by email"""
+        conn = self._get_connection(self.userids_db)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT userid_id, candidate_email, codeforces_username, questions, total_solved,
+                   weighted_score, tab_switches, time_taken, updated_at
+            FROM candidate_results
+            WHERE test_id = ?
+            ORDER BY candidate_email, userid_id
+        ''', (test_id,))
+        rows = cursor.fetchall()
+        conn.close()
+        
+        return [self._candidate_result_row(row) for row in rows]
+    
+    def get_candidate_result(self, test_id, userid_id):
+        """Get one candidate's precomputed results, or None"""
+        conn = self._get_connection(self.userids_db)
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT userid_id, candidate_email, codeforces_username, questions, total_solved,
+                   weighted_score, tab_switches, time_taken, updated_at
+            FROM candidate_results
+            WHERE test_id = ? AND userid_id = ?
+        ''', (test_id, userid_id))
+        row = cursor.fetchone()
+        conn.close()
+        
+        return self._candidate_result_row(row) if row else None
+    
     def get_all_tests(self):
         """Get all tests"""
         conn = self._get_connection(self.selected_candidates_db)
@@ -517,6 +735,7 @@ class DatabaseManager:
                 cursor.execute(f'DELETE FROM test_results WHERE userid_id IN ({placeholders})', user_ids)
                 
             # Delete registrations
+            cursor.execute('DELETE FROM candidate_results WHERE test_id = ?', (test_id,))
             cursor.execute('DELETE FROM userids WHERE test_id = ?', (test_id,))
             conn.commit()
         except Exception as e:
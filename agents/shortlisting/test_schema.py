@@ -0,0 +1,222 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+# Rating used for manual (non-Codeforces) questions
+MANUAL_QUESTION_RATING = 1400
+DIFFICULTY_POINTS = {"easy": 10, "medium": 20, "hard": 30}
+# (level, minimum score, minimum completion rate), best level first
+PERFORMANCE_LEVELS = [
+    ("Excellent", 85, 80),
+    ("Good", 70, 60),
+    ("Average", 50, 40),
+]
+DEFAULT_PERFORMANCE_LEVEL = "Needs Improvement"
+SCHEMA_CACHE_SIZE = 64
+
+
+def difficulty_for_rating(rating: int) -> str:
+    if rating <= 1200:
+        return "easy"
+    elif rating <= 1600:
+        return "medium"
+    return "hard"
+
+
+def performance_level(score: float, completion_rate: float) -> str:
+    for level, min_score, min_completion in PERFORMANCE_LEVELS:
+        if score >= min_score and completion_rate >= min_completion:
+            return level
+    return DEFAULT_PERFORMANCE_LEVEL
+
+
+def is_codeforces_question(question: Dict) -> bool:
+    return question.get('type') == 'codeforces' or ('contestId' in question and 'index' in question)
+
+
+class TestSchema:
+    """
+    Question layout of a test, compiled once from get_test_questions.
+
+    Holds the flat question list with a canonical ID, rating, difficulty
+    bucket, point weight and tags per question, plus a map from every ID
+    format a stored result may use (section/index forms, plain indexes,
+    legacy flattened forms) to the canonical ID it belongs to. Resolving a
+    candidate's results is then one pass over their keys, and each question
+    is a single dict lookup.
+    """
+
+    def __init__(self, test_questions: List[Dict]):
+        self.questions: List[Dict] = []
+        self.question_ids: List[str] = []
+        self.ratings: List[int] = []
+        self.difficulties: List[str] = []
+        self.points: List[int] = []
+        self.tags: List[List[str]] = []
+        # alias -> (canonical id, priority); lower priority wins
+        self.aliases: Dict[str, Tuple[str, int]] = {}
+
+        is_flat = not (test_questions and isinstance(test_questions[0], dict)
+                       and isinstance(test_questions[0].get('questions'), list))
+        sections = [{'id': 'default', 'questions': test_questions}] if is_flat else test_questions
+
+        candidates = []  # (priority, alias, canonical id)
+        position = 0
+        for section_idx, section in enumerate(sections):
+            section_id = section.get('id')
+            if section_id is None:
+                section_id = section_idx
+            for q_idx, question in enumerate(section.get('questions', [])):
+                if is_codeforces_question(question):
+                    q_data = question.get('data', question)
+                    question_id = f"{q_data.get('contestId', '')}{q_data.get('index', '')}"
+                    rating = q_data.get('rating', 0) or 0
+                    tags = q_data.get('tags', [])
+                elif question.get('id'):
+                    question_id = str(question.get('id'))
+                    rating = MANUAL_QUESTION_RATING
+                    tags = ['general']
+                else:
+                    # Frontend IDs manual answers as sectionId_index
+                    question_id = f"{section_id}_{q_idx}"
+                    rating = MANUAL_QUESTION_RATING
+                    tags = ['general']
+
+                difficulty = difficulty_for_rating(rating)
+                self.questions.append(question)
+                self.question_ids.append(question_id)
+                self.ratings.append(rating)
+                self.difficulties.append(difficulty)
+                self.points.append(DIFFICULTY_POINTS[difficulty])
+                self.tags.append(tags)
+
+                # Older result rows were keyed by these formats
+                fallbacks = [
+                    question_id,
+                    f"{section_id}_{q_idx}",
+                    f"1_{q_idx}",
+                    f"0_{q_idx}",
+                    f"{q_idx}",
+                    f"default_{q_idx}",
+                    # Positions in the flattened list (sectioned tests)
+                    f"default_{position}",
+                    f"1_{position}",
+                    f"0_{position}",
+                    f"{position}",
+                ]
+                for priority, alias in enumerate(fallbacks):
+                    candidates.append((priority, alias, question_id))
+                position += 1
+
+        # An alias claimed by several questions goes to the best-priority claim
+        for priority, alias, question_id in sorted(candidates, key=lambda c: c[0]):
+            self.aliases.setdefault(alias, (question_id, priority))
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def resolve(self, candidate_data: Dict) -> Dict[str, Dict]:
+        """Map a candidate's stored results onto canonical question IDs"""
+        best: Dict[str, Tuple[int, Dict]] = {}
+        for key, result in (candidate_data.get('questions') or {}).items():
+            hit = self.aliases.get(str(key))
+            if hit is None or not result:
+                continue
+            question_id, priority = hit
+            if question_id not in best or priority < best[question_id][0]:
+                best[question_id] = (priority, result)
+        return {question_id: result for question_id, (_, result) in best.items()}
+
+    def solved_flags(self, candidate_data: Dict) -> List[bool]:
+        resolved = self.resolve(candidate_data)
+        return [bool(resolved.get(qid, {}).get('solved', False)) for qid in self.question_ids]
+
+    def candidate_scores(self, candidate_data: Dict) -> "CandidateScores":
+        """Difficulty, tag and weighted-score stats from one resolve of the results"""
+        solved = self.solved_flags(candidate_data)
+        return CandidateScores(self._difficulty_stats(solved), self._tag_stats(solved), self._weighted_score(solved))
+
+    def difficulty_stats(self, candidate_data: Dict) -> Dict:
+        return self._difficulty_stats(self.solved_flags(candidate_data))
+
+    def weighted_score(self, candidate_data: Dict) -> int:
+        """Score 0-100 weighted by difficulty (Easy=10, Medium=20, Hard=30)"""
+        return self._weighted_score(self.solved_flags(candidate_data))
+
+    def tag_stats(self, candidate_data: Dict) -> Dict:
+        return self._tag_stats(self.solved_flags(candidate_data))
+
+    def _difficulty_stats(self, solved_flags: List[bool]) -> Dict:
+        stats = {d: {"total": 0, "solved": 0} for d in DIFFICULTY_POINTS}
+        for difficulty, solved in zip(self.difficulties, solved_flags):
+            stats[difficulty]["total"] += 1
+            if solved:
+                stats[difficulty]["solved"] += 1
+        for entry in stats.values():
+            entry["percentage"] = round((entry["solved"] / entry["total"]) * 100, 2) if entry["total"] > 0 else 0
+        return stats
+
+    def _weighted_score(self, solved_flags: List[bool]) -> int:
+        total_possible = sum(self.points)
+        if total_possible == 0:
+            return 0
+        score = sum(p for p, solved in zip(self.points, solved_flags) if solved)
+        return round((score / total_possible) * 100)
+
+    def _tag_stats(self, solved_flags: List[bool]) -> Dict:
+        stats: Dict[str, Dict] = {}
+        for tags, solved in zip(self.tags, solved_flags):
+            for tag in tags:
+                entry = stats.setdefault(tag, {"total": 0, "solved": 0})
+                entry["total"] += 1
+                if solved:
+                    entry["solved"] += 1
+        for entry in stats.values():
+            entry["percentage"] = round((entry["solved"] / entry["total"]) * 100, 2) if entry["total"] > 0 else 0
+        return stats
+
+
+class CandidateScores:
+    """
+    One candidate's rule-based stats for a test: the difficulty and tag
+    breakdowns (``{"total", "solved", "percentage"}`` per bucket) and the
+    weighted 0-100 score.
+    """
+
+    def __init__(self, difficulty: Dict, tags: Dict, score: int):
+        self.difficulty = difficulty
+        self.tags = tags
+        self.score = score
+
+
+_schemas: "OrderedDict[str, TestSchema]" = OrderedDict()
+_schemas_lock = threading.Lock()
+# The list compiled last and its schema. A bulk run passes the same list
+# for every candidate, so those calls skip serialising and hashing it;
+# question lists are read from the database and not modified in place.
+_last_compiled: Tuple[object, Optional[TestSchema]] = (None, None)
+
+
+def get_test_schema(test_questions) -> TestSchema:
+    """Compiled schema for a test's questions, cached by content"""
+    global _last_compiled
+    if isinstance(test_questions, TestSchema):
+        return test_questions
+    last_questions, last_schema = _last_compiled
+    if last_schema is not None and last_questions is test_questions:
+        return last_schema
+    key = hashlib.sha1(json.dumps(test_questions, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+    with _schemas_lock:
+        schema: Optional[TestSchema] = _schemas.get(key)
+        if schema is not None:
+            _schemas.move_to_end(key)
+    if schema is None:
+        schema = TestSchema(test_questions or [])
+        with _schemas_lock:
+            _schemas[key] = schema
+            if len(_schemas) > SCHEMA_CACHE_SIZE:
+                _schemas.popitem(last=False)
+    _last_compiled = (test_questions, schema)
+    return schema
@@ -8,13 +8,14 @@ from dotenv import load_dotenv
 from typing import List, Dict, Optional
 from shortlisting_database import DatabaseManager
 from codeforces_api import CodeforcesAPI
+from problem_catalog import get_problem_catalog
 
 load_dotenv()
 
 class TestService:
     def __init__(self):
         self.db = DatabaseManager()
-        self.cf_api = CodeforcesAPI()
+        self.cf_api = CodeforcesAPI(cursor_store=self.db)
         self.smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
         self.smtp_port = int(os.getenv('SMTP_PORT', '587'))
         self.sender_email = os.getenv('SENDER_EMAIL')
@@ -141,9 +142,10 @@ The Recruitment Team
                 all_questions.append(item)
         return all_questions
 
-    def fetch_and_save_results(self, test_id: int) -> Dict:
+    def fetch_and_save_results(self, test_id: int, progress=None) -> Dict:
         """
-        Fetch results from Codeforces API and save to database
+        Fetch results from Codeforces API and save to database.
+        ``progress(message, **fields)`` is called after each candidate, if given
         """
         try:
             registered_users = self.db.get_registered_users(test_id)
@@ -173,10 +175,25 @@ The Recruitment Team
                 'errors': []
             }
             
-            for user in registered_users:
+            # Validate every handle in one batched user.info call, then fetch
+            # each valid user's submissions once, concurrently
+            submission_indexes = {}
+            if any(q.get('type') == 'codeforces' or ('contestId' in q and 'index' in q) for q in test_questions):
+                usernames = [user['username'] for user in registered_users if user.get('username')]
+                known = self.cf_api.get_users_info(usernames)
+                if known is not None:
+                    for username in usernames:
+                        if username.lower() not in known:
+                            submission_indexes[username] = {}
+                            results_summary['errors'].append(f"Codeforces username '{username}' not found")
+                submission_indexes.update(self.cf_api.get_submission_indexes(u for u in usernames if u not in submission_indexes))
+            
+            for done, user in enumerate(registered_users, 1):
                 try:
                     user_results = {}
                     user_solved_count = 0
+                    # Fetched once per user; every question is looked up in it
+                    submission_index = submission_indexes.get(user['username'])
                     
                     for question in test_questions:
                         try:
@@ -193,7 +210,9 @@ The Recruitment Team
                                 if not problem_id.get('contestId') or not problem_id.get('index'):
                                     continue
                                 
-                                result = self.cf_api.check_problem_solved(user['username'], problem_id)
+                                if submission_index is None:
+                                    submission_index = self.cf_api.get_submission_index(user['username'])
+                                result = self.cf_api.check_problem_solved(user['username'], problem_id, submission_index)
                                 question_id = self.cf_api.format_problem_id(q_data)
                                 user_results[question_id] = result
                                 
@@ -207,26 +226,9 @@ The Recruitment Team
                     
                     # Save results to database (merge with existing manual results if any)
                     if user_results:
-                        # We need to be careful not to overwrite manual answers if we are just updating CF results
-                        # But save_test_results currently deletes all results for the user.
-                        # For now, let's assume this is fine or we might need to fetch existing results first.
-                        # Actually, save_test_results in database.py deletes everything.
-                        # We should probably fetch existing results first to preserve manual answers.
-                        
-                        # Fetch existing results to preserve manual answers
-                        existing_results_rows = self.db.get_test_results(test_id)
-                        # Filter for this user
-                        user_existing_results = {}
-                        for row in existing_results_rows:
-                            if row[1] == user['email']: # candidate_email (index 1 now)
-                                # row: id, email, username, question_id, solved, result_data
-                                try:
-                                    import ast
-                                    # result_data is a string representation of a dict
-                                    data_dict = ast.literal_eval(row[5])
-                                    user_existing_results[row[3]] = data_dict
-                                except:
-                                    pass
+                        # save_test_results replaces all of the user's rows, so
+                        # keep their existing (manual) answers alongside the CF results
+                        user_existing_results = self.db.get_user_results(user['id'])
                         
                         # Merge new CF results into existing results
                         user_existing_results.update(user_results)
@@ -241,6 +243,9 @@ The Recruitment Team
                     print(error_msg)
                     import traceback
                     print(traceback.format_exc())
+                
+                if progress:
+                    progress(f"Fetched results for {done}/{len(registered_users)} candidates", done=done, total=len(registered_users))
             
             return results_summary
             
@@ -255,41 +260,29 @@ The Recruitment Team
         """
         Get formatted test results for display
         """
-        raw_results = self.db.get_test_results(test_id)
+        summaries = self.db.get_candidate_results(test_id)
         raw_test_questions = self.db.get_test_questions(test_id)
         test_questions = self._extract_questions(raw_test_questions)
         
-        # Group results by user
+        # One precomputed row per registration; merge repeat registrations
         user_results = {}
-        for row in raw_results:
-            user_id, email, username, question_id, solved, result_data, tab_switches, time_taken = row
-            user_key = f"{email}_{username}"
-            
-            if user_key not in user_results:
-                user_results[user_key] = {
-                    'id': user_id,
-                    'email': email,
-                    'username': username,
-                    'questions': {},
-                    'total_solved': 0,
-                    'total_questions': len(test_questions),
-                    'tab_switches': tab_switches,
-                    'time_taken': time_taken
-                }
+        for summary in summaries:
+            user_key = f"{summary['email']}_{summary['username']}"
+            summary['total_questions'] = len(test_questions)
             
-            if question_id not in user_results[user_key]['questions']:
-                user_results[user_key]['questions'][question_id] = {
-                    'solved': solved,
-                    'data': result_data
-                }
-                
-                if solved:
-                    user_results[user_key]['total_solved'] += 1
-            else:
-                # If duplicate, just update if solved is True (in case one entry says False and another True)
-                if solved and not user_results[user_key]['questions'][question_id]['solved']:
-                    user_results[user_key]['questions'][question_id]['solved'] = True
-                    user_results[user_key]['total_solved'] += 1
+            existing = user_results.get(user_key)
+            if existing is None:
+                user_results[user_key] = summary
+                continue
+            for question_id, question in summary['questions'].items():
+                if question_id not in existing['questions']:
+                    existing['questions'][question_id] = question
+                    if question['solved']:
+                        existing['total_solved'] += 1
+                elif question['solved'] and not existing['questions'][question_id]['solved']:
+                    # If duplicate, count it as solved if either registration solved it
+                    existing['questions'][question_id]['solved'] = True
+                    existing['total_solved'] += 1
         
         return list(user_results.values())
     
@@ -297,4 +290,21 @@ The Recruitment Team
         """
         Get available problems from Codeforces for selection
         """
-        return self.cf_api.get_problems(tags=tags, difficulty_min=difficulty_min, difficulty_max=difficulty_max)
+        return self.search_problems(difficulty_min, difficulty_max, tags)['problems']
+    
+    def search_problems(self, difficulty_min: int = None, difficulty_max: int = None, tags: List[str] = None, page: int = None, page_size: int = None) -> Dict:
+        """
+        Query the cached problem catalogue; paginated when page_size is given
+        """
+        offset, limit = 0, None
+        if page_size:
+            page = max(page or 1, 1)
+            offset, limit = (page - 1) * page_size, page_size
+        problems, total = get_problem_catalog(self.cf_api).query(
+            tags=tags,
+            difficulty_min=difficulty_min,
+            difficulty_max=difficulty_max,
+            offset=offset,
+            limit=limit
+        )
+        return {'problems': problems, 'total': total, 'page': page, 'page_size': page_size}
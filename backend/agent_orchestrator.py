@@ -4,6 +4,11 @@ Agentic AI Orchestrator - Coordinates autonomous AI agents with reasoning and ex
 import os
 import json
 import time
+import threading
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from itertools import takewhile
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, TypedDict, Any
 from openai import OpenAI
@@ -12,32 +17,173 @@ from langgraph.graph import StateGraph, END
 
 load_dotenv()
 
+try:
+    from llm_cache import llm_cache
+except ImportError:
+    try:
+        from backend.llm_cache import llm_cache
+    except ImportError:
+        llm_cache = None
+
+try:
+    from notification_bus import SQLiteNotificationBus
+except ImportError:
+    from backend.notification_bus import SQLiteNotificationBus
+
+try:
+    from backend.agent_registry import get_llm_client
+except ImportError:
+    from agent_registry import get_llm_client
+
+REASONING_MODEL = "openai/gpt-oss-20b:fireworks-ai"
+
+NOTIFICATION_CAPACITY = 100
+
 class NotificationStore:
-    """In-memory notification store (can be replaced with DB)"""
-    def __init__(self):
-        self.notifications = []
+    """
+    In-memory notification store (can be replaced with DB).
+
+    A fixed-size ring buffer guarded by a lock. Every notification gets a
+    monotonically increasing ``seq`` so clients can ask only for what is
+    newer than the last one they saw, or block until something new arrives.
+    """
+    def __init__(self, capacity: int = NOTIFICATION_CAPACITY):
+        self._buffer = deque(maxlen=capacity)  # oldest -> newest
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
     
     def add(self, notification: Dict):
         notification['timestamp'] = datetime.now(timezone.utc).isoformat()
         notification['read'] = False
-        self.notifications.insert(0, notification)
-        # Keep last 100 notifications
-        if len(self.notifications) > 100:
-            self.notifications = self.notifications[:100]
+        with self._lock:
+            self._seq += 1
+            notification['seq'] = self._seq
+            # The oldest notification falls off once the buffer is full
+            self._buffer.append(notification)
+            self._changed.notify_all()
         return notification
     
+    @property
+    def latest_seq(self) -> int:
+        with self._lock:
+            return self._seq
+    
+    def _newer_than(self, since: int) -> List[Dict]:
+        # The buffer is in seq order (republish moves an entry to the end),
+        # so the ones after ``since`` are a run at the newest end
+        return [dict(n) for n in takewhile(lambda n: n['seq'] > since, reversed(self._buffer))]
+    
     def get_all(self) -> List[Dict]:
-        return self.notifications
+        """All notifications, newest first"""
+        with self._lock:
+            return [dict(n) for n in reversed(self._buffer)]
+    
+    def get_since(self, since: int) -> List[Dict]:
+        """Notifications with seq greater than ``since``, newest first"""
+        with self._lock:
+            return self._newer_than(since)
+    
+    def wait_for(self, since: int, timeout: float) -> List[Dict]:
+        """Block up to ``timeout`` seconds for notifications newer than ``since``"""
+        with self._lock:
+            self._changed.wait_for(lambda: self._seq > since, timeout)
+            return self._newer_than(since)
+    
+    def republish(self, reasoning_id: str, **fields) -> Optional[Dict]:
+        """Update the notification carrying ``reasoning_id`` and give it a new seq.
+
+        It moves to the newest position, so ``since`` polls and streams
+        deliver the update while the history keeps one entry per decision.
+        Returns None if the notification has already left the buffer.
+        """
+        with self._lock:
+            for notification in self._buffer:
+                if notification.get('reasoning_id') == reasoning_id:
+                    break
+            else:
+                return None
+            self._buffer.remove(notification)
+            notification.update(fields)
+            self._seq += 1
+            notification['seq'] = self._seq
+            self._buffer.append(notification)
+            self._changed.notify_all()
+            return dict(notification)
+    
+    def find(self, reasoning_id: str) -> Optional[Dict]:
+        """The buffered notification carrying ``reasoning_id``, if any"""
+        with self._lock:
+            for notification in self._buffer:
+                if notification.get('reasoning_id') == reasoning_id:
+                    return dict(notification)
+        return None
     
     def mark_read(self, index: int):
-        if 0 <= index < len(self.notifications):
-            self.notifications[index]['read'] = True
+        # ``index`` is a position in the newest-first list returned by get_all
+        with self._lock:
+            if 0 <= index < len(self._buffer):
+                self._buffer[-1 - index]['read'] = True
     
     def clear_all(self):
-        self.notifications = []
+        with self._lock:
+            self._buffer.clear()
+
+def _create_notification_store():
+    """
+    Shared SQLite bus by default, so every API process feeds one stream;
+    NOTIFICATION_BACKEND=memory keeps notifications in this process only
+    """
+    if os.environ.get('NOTIFICATION_BACKEND', 'sqlite').lower() == 'memory':
+        return NotificationStore()
+    try:
+        return SQLiteNotificationBus(os.environ.get('NOTIFICATION_DB_PATH'), capacity=NOTIFICATION_CAPACITY)
+    except Exception as e:
+        print(f"Warning: Notification bus unavailable ({e}); using in-process notifications")
+        return NotificationStore()
 
 # Global notification store
-notification_store = NotificationStore()
+notification_store = _create_notification_store()
+
+# Decision explanations are generated here, off the agents' decision path
+REASONING_WORKERS = 4
+MAX_TRACKED_REASONING = 500
+
+_reasoning_executor = None
+_reasoning_futures: "OrderedDict[str, Future]" = OrderedDict()
+_reasoning_lock = threading.Lock()
+
+def _submit_reasoning(reasoning_id: str, func):
+    global _reasoning_executor
+    with _reasoning_lock:
+        if _reasoning_executor is None:
+            _reasoning_executor = ThreadPoolExecutor(max_workers=REASONING_WORKERS, thread_name_prefix='agent-reasoning')
+        _reasoning_futures[reasoning_id] = _reasoning_executor.submit(func)
+        while len(_reasoning_futures) > MAX_TRACKED_REASONING:
+            _reasoning_futures.popitem(last=False)
+
+def get_reasoning(reasoning_id: str, timeout: float = 0) -> Optional[str]:
+    """Reasoning for a handle from AIAgent.decide, waiting up to ``timeout`` seconds; None if not ready"""
+    with _reasoning_lock:
+        future = _reasoning_futures.get(reasoning_id)
+    if future is not None:
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            return None
+    # Decided in another process (or no longer tracked): read the notification
+    notification = notification_store.find(reasoning_id)
+    return notification.get('reasoning') if notification else None
+
+def with_reasoning(decision: Dict, timeout: float = 0) -> Dict:
+    """Copy of an agent decision with its deferred reasoning filled in if ready"""
+    reasoning_id = decision.get('reasoning_id') if isinstance(decision, dict) else None
+    if not reasoning_id or decision.get('reasoning_status') != 'pending':
+        return decision
+    reasoning = get_reasoning(reasoning_id, timeout)
+    if reasoning is None:
+        return dict(decision)
+    return {**decision, 'reasoning': reasoning, 'reasoning_status': 'ready'}
 
 class AIAgent:
     """Base class for autonomous AI agents"""
@@ -45,27 +191,58 @@ class AIAgent:
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
+        # Shared, pooled client; None when HF_TOKEN is not set
         self.client = None
         try:
-            token = os.environ.get('HF_TOKEN')
-            if token:
-                self.client = OpenAI(
-                    base_url="https://router.huggingface.co/v1",
-                    api_key=token,
-                    timeout=60.0
-                )
-        except:
-            pass
+            self.client = get_llm_client()
+        except Exception as e:
+            print(f"Warning: LLM client unavailable for {name}: {e}")
     
-    def notify(self, message: str, type: str = 'info', reasoning: str = None, details: Dict = None):
+    def notify(self, message: str, type: str = 'info', reasoning: str = None, details: Dict = None,
+               reasoning_pending: bool = False, reasoning_id: str = None) -> Dict:
         """Send notification with AI reasoning"""
-        notification_store.add({
+        notification = {
             'agent': self.name,
             'message': message,
             'type': type,
             'reasoning': reasoning,
             'details': details
-        })
+        }
+        if reasoning_pending:
+            notification['reasoning_pending'] = True
+        if reasoning_id:
+            notification['reasoning_id'] = reasoning_id
+        return notification_store.add(notification)
+    
+    def decide(self, message: str, type: str, details: Dict, context: str, task: str, result: Dict = None) -> str:
+        """
+        Announce a decision now and explain it later: the notification goes
+        out without reasoning, and once the background LLM call finishes it
+        is republished with the reasoning under a new seq, so polling and
+        streaming clients both receive it.
+
+        ``result`` is marked pending with the handle and never written to
+        again (callers may already be serializing it); get_reasoning(handle),
+        with_reasoning(result) or GET /api/reasoning/<handle> return the
+        text. Returns the reasoning handle
+        """
+        reasoning_id = uuid.uuid4().hex
+        if result is not None:
+            result.update(reasoning=None, reasoning_status='pending', reasoning_id=reasoning_id)
+        self.notify(message, type, details=details, reasoning_pending=True, reasoning_id=reasoning_id)
+        
+        def explain():
+            reasoning = self.reason(context, task)
+            try:
+                if notification_store.republish(reasoning_id, reasoning=reasoning, reasoning_pending=False) is None:
+                    # The decision already scrolled out of the history
+                    self.notify(message, type, reasoning=reasoning, details=details, reasoning_id=reasoning_id)
+            except Exception as e:
+                print(f"Warning: Could not publish reasoning notification: {e}")
+            return reasoning
+        
+        _submit_reasoning(reasoning_id, explain)
+        return reasoning_id
     
     def reason(self, context: str, task: str) -> str:
         """Generate AI reasoning for a decision"""
@@ -91,15 +268,26 @@ Task: {task}
 
 Provide a brief, clear explanation (1-2 sentences) of your reasoning and decision:"""
             
+            messages = [
+                {"role": "system", "content": "You are a helpful AI agent that explains its reasoning clearly and concisely."},
+                {"role": "user", "content": prompt}
+            ]
+            cache_key = None
+            if llm_cache is not None:
+                cache_key = llm_cache.make_key(REASONING_MODEL, messages, max_tokens=150)
+                cached = llm_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+            
             response = self.client.chat.completions.create(
-                model="openai/gpt-oss-20b:fireworks-ai",
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI agent that explains its reasoning clearly and concisely."},
-                    {"role": "user", "content": prompt}
-                ],
+                model=REASONING_MODEL,
+                messages=messages,
                 max_tokens=150
             )
-            return response.choices[0].message.content.strip()
+            reasoning = response.choices[0].message.content.strip()
+            if cache_key:
+                llm_cache.set(cache_key, REASONING_MODEL, reasoning)
+            return reasoning
         except Exception as e:
             return f"Analyzed {task} using internal logic. ({str(e)[:50]})"
 
@@ -162,29 +350,24 @@ class ResumeMatchingAgent(AIAgent):
         total_jd = len(jd_words) or 1
         score = min(100.0, (overlap / total_jd) * 100)
         
-        # Generate reasoning
-        reasoning = self.reason(
-            f"Resume: {resume_text[:200]}... | Job: {job_description[:200]}...",
-            f"Calculate match score between resume and job description"
-        )
-        
         threshold = 50.0
         decision = "ACCEPTED" if score >= threshold else "REJECTED"
         
-        self.notify(
+        result = {
+            'score': score,
+            'decision': decision
+        }
+        # Reasoning is generated in the background and published when ready
+        self.decide(
             f"✅ Resume matched: Score {score:.1f}/100 - {decision}",
             'decision',
-            reasoning=reasoning,
-            details={'score': score, 'threshold': threshold, 'job_id': job_id, 'decision': decision}
+            {'score': score, 'threshold': threshold, 'job_id': job_id, 'decision': decision},
+            f"Resume: {resume_text[:200]}... | Job: {job_description[:200]}...",
+            f"Calculate match score between resume and job description",
+            result
         )
         
-        return {
-            "result": {
-                'score': score,
-                'decision': decision,
-                'reasoning': reasoning
-            }
-        }
+        return {"result": result}
 
     def match_resume(self, resume_text: str, job_description: str, job_id: str) -> Dict:
         """Autonomously match resume to job with reasoning"""
@@ -228,34 +411,29 @@ class ShortlistingAgent(AIAgent):
         solved = candidate_data.get('total_solved', 0)
         completion_rate = (solved / total_questions * 100) if total_questions > 0 else 0
         
-        # Generate reasoning
-        reasoning = self.reason(
-            f"Candidate solved {solved}/{total_questions} questions ({completion_rate:.1f}% completion)",
-            f"Determine if candidate should be shortlisted for interview based on performance"
-        )
-        
         threshold = 60.0
         decision = "SHORTLIST" if completion_rate >= threshold else "REJECT"
         
-        self.notify(
+        result = {
+            'completion_rate': completion_rate,
+            'decision': decision
+        }
+        # Reasoning is generated in the background and published when ready
+        self.decide(
             f"📊 Evaluation: {email} - {completion_rate:.1f}% completion → {decision}",
             'decision',
-            reasoning=reasoning,
-            details={
+            {
                 'email': email,
                 'completion_rate': completion_rate,
                 'threshold': threshold,
                 'decision': decision
-            }
+            },
+            f"Candidate solved {solved}/{total_questions} questions ({completion_rate:.1f}% completion)",
+            f"Determine if candidate should be shortlisted for interview based on performance",
+            result
         )
         
-        return {
-            "result": {
-                'completion_rate': completion_rate,
-                'decision': decision,
-                'reasoning': reasoning
-            }
-        }
+        return {"result": result}
 
     def evaluate_candidate(self, candidate_data: Dict, test_questions: List[Dict]) -> Dict:
         """Autonomously evaluate candidate for shortlisting"""
@@ -297,16 +475,13 @@ class InterviewSchedulingAgent(AIAgent):
         sorted_slots = sorted(availability_slots, key=lambda x: x.get('start', ''))
         best_slots = sorted_slots[:min(5, len(sorted_slots))]
         
-        reasoning = self.reason(
-            f"Found {len(availability_slots)} slots, {candidate_count} candidates need scheduling",
-            f"Select optimal interview time slots that minimize conflicts and maximize HR availability"
-        )
-        
-        self.notify(
+        # Reasoning is generated in the background and published when ready
+        self.decide(
             f"🎯 Proposed {len(best_slots)} optimal interview slots",
             'decision',
-            reasoning=reasoning,
-            details={'slots': best_slots, 'candidate_count': candidate_count}
+            {'slots': best_slots, 'candidate_count': candidate_count},
+            f"Found {len(availability_slots)} slots, {candidate_count} candidates need scheduling",
+            f"Select optimal interview time slots that minimize conflicts and maximize HR availability"
         )
         
         return {"result": best_slots}
@@ -413,9 +588,40 @@ shortlisting_agent = ShortlistingAgent()
 scheduling_agent = InterviewSchedulingAgent()
 job_description_agent = JobDescriptionAgent()
 
-def get_notifications():
-    """Get all notifications"""
-    return notification_store.get_all()
+def get_notifications(since: int = None):
+    """Get all notifications, or only those newer than ``since``"""
+    if since is None:
+        return notification_store.get_all()
+    return notification_store.get_since(since)
+
+def get_latest_notification_seq() -> int:
+    """Sequence id of the newest notification (0 if none yet)"""
+    return notification_store.latest_seq
+
+def wait_for_notifications(since: int, timeout: float) -> List[Dict]:
+    """Block until notifications newer than ``since`` exist or ``timeout`` passes"""
+    return notification_store.wait_for(since, timeout)
+
+# A stream ends before a gunicorn worker timeout would kill it; EventSource
+# reconnects on its own and resumes from the Last-Event-ID it saw
+NOTIFICATION_STREAM_SECONDS = 60
+NOTIFICATION_HEARTBEAT_SECONDS = 15
+
+def notification_events(since: int, duration: float = NOTIFICATION_STREAM_SECONDS):
+    """Yield Server-Sent Events for notifications newer than ``since``"""
+    deadline = time.monotonic() + duration
+    yield "retry: 3000\n\n"
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        notifications = wait_for_notifications(since, min(NOTIFICATION_HEARTBEAT_SECONDS, remaining))
+        if not notifications:
+            yield ": keep-alive\n\n"
+            continue
+        for notification in reversed(notifications):  # oldest first
+            since = notification['seq']
+            yield f"id: {since}\nevent: notification\ndata: {json.dumps(notification, default=str)}\n\n"
 
 def mark_notification_read(index: int):
     """Mark notification as read"""
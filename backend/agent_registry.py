@@ -0,0 +1,148 @@
+"""
+Agent Registry - Builds every agent once per process and shares one LLM client
+"""
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import httpx
+from openai import OpenAI
+
+HF_BASE_URL = "https://router.huggingface.co/v1"
+LLM_TIMEOUT = 60.0
+LLM_MAX_CONNECTIONS = 20
+# A failed agent build is retried after this many seconds, doubling per
+# consecutive failure up to MAX_RETRY_BACKOFF
+RETRY_BACKOFF = 30.0
+MAX_RETRY_BACKOFF = 600.0
+
+_llm_client = None
+_llm_client_lock = threading.Lock()
+
+
+def get_llm_client() -> Optional[OpenAI]:
+    """Process-wide OpenAI client for the HF router (None without HF_TOKEN)"""
+    global _llm_client
+    if _llm_client is None:
+        with _llm_client_lock:
+            if _llm_client is None:
+                token = os.environ.get('HF_TOKEN')
+                if not token:
+                    return None
+                # One keep-alive connection pool shared by every agent
+                http_client = httpx.Client(
+                    timeout=LLM_TIMEOUT,
+                    limits=httpx.Limits(max_connections=LLM_MAX_CONNECTIONS, max_keepalive_connections=LLM_MAX_CONNECTIONS)
+                )
+                _llm_client = OpenAI(base_url=HF_BASE_URL, api_key=token, timeout=LLM_TIMEOUT, http_client=http_client)
+    return _llm_client
+
+
+class AgentRegistry:
+    """
+    Named agent factories whose instances are built at most once per process.
+
+    ``get`` builds on first use (or returns what ``warm_up`` already built).
+    When a factory fails, ``fallback(error)`` is served instead and the build
+    is retried only once a backoff has passed, so one broken agent can't
+    slow down every request. ``health`` reports what is built, how long it
+    took and any build error.
+    """
+
+    def __init__(self, retry_backoff: float = RETRY_BACKOFF, max_retry_backoff: float = MAX_RETRY_BACKOFF):
+        self.retry_backoff = retry_backoff
+        self.max_retry_backoff = max_retry_backoff
+        self._factories: Dict[str, Tuple[Callable, Optional[Callable]]] = {}
+        self._instances: Dict[str, object] = {}
+        self._status: Dict[str, Dict] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        # name -> (consecutive failures, monotonic time the next build may run)
+        self._retries: Dict[str, Tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable, fallback: Callable = None):
+        """Register ``factory`` under ``name``; each agent should have one registration"""
+        with self._lock:
+            if name in self._factories:
+                print(f"Warning: Agent '{name}' registered more than once; "
+                      f"{'keeping the built instance' if name in self._instances else 'using the latest factory'}")
+            if name in self._instances:
+                return
+            self._factories[name] = (factory, fallback)
+            self._locks.setdefault(name, threading.Lock())
+            self._status.setdefault(name, {'status': 'registered'})
+
+    def _is_built(self, name: str) -> bool:
+        # A failed build counts as built (serving its fallback) until its retry is due
+        if name not in self._instances:
+            return False
+        retry = self._retries.get(name)
+        return retry is None or time.monotonic() < retry[1]
+
+    def get(self, name: str):
+        if self._is_built(name):
+            return self._instances[name]
+        with self._lock:
+            if name not in self._factories:
+                raise KeyError(f"Unknown agent '{name}'")
+            factory, fallback = self._factories[name]
+            name_lock = self._locks[name]
+        with name_lock:
+            if self._is_built(name):
+                return self._instances[name]
+            started = time.monotonic()
+            try:
+                instance = factory()
+                status = {'status': 'ready'}
+                retry = None
+            except Exception as e:
+                print(f"Warning: Failed to load {name} agent: {e}")
+                instance = fallback(e) if fallback else None
+                failures = self._retries.get(name, (0, 0.0))[0] + 1
+                backoff = min(self.retry_backoff * 2 ** (failures - 1), self.max_retry_backoff)
+                retry = (failures, time.monotonic() + backoff)
+                status = {'status': 'error', 'error': str(e), 'retry_in_seconds': backoff}
+            status['build_seconds'] = round(time.monotonic() - started, 3)
+            with self._lock:
+                self._instances[name] = instance
+                self._status[name] = status
+                if retry is None:
+                    self._retries.pop(name, None)
+                else:
+                    self._retries[name] = retry
+            return instance
+
+    def warm_up(self, names: Iterable[str] = None) -> Dict[str, Dict]:
+        """Build the given (default: all) agents now; returns their health"""
+        with self._lock:
+            names = list(names) if names is not None else list(self._factories)
+        for name in names:
+            self.get(name)
+        return self.health()
+
+    def warm_up_in_background(self, names: Iterable[str] = None):
+        threading.Thread(target=self.warm_up, args=(names,), name='agent-warm-up', daemon=True).start()
+
+    def health(self) -> Dict[str, Dict]:
+        with self._lock:
+            agents = {name: dict(status) for name, status in self._status.items()}
+        return {
+            'agents': agents,
+            'llm_client': 'ready' if get_llm_client() is not None else 'unavailable'
+        }
+
+
+def _orchestrator():
+    try:
+        from backend import agent_orchestrator
+    except ImportError:
+        import agent_orchestrator
+    return agent_orchestrator
+
+
+agent_registry = AgentRegistry()
+# Agents without an API module of their own; 'shortlisting', 'scheduling' and
+# the rest are registered, with their fallbacks, by the API that serves them
+agent_registry.register('resume_matching', lambda: _orchestrator().resume_agent)
+agent_registry.register('job_description', lambda: _orchestrator().job_description_agent)
@@ -0,0 +1,104 @@
+"""
+LLM Response Cache - Content-addressed on-disk cache of chat completion outputs
+"""
+import sqlite3
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 20000
+
+
+class LLMCache:
+    """SQLite cache keyed by a hash of the fully rendered request plus model id.
+
+    Entries expire after ``ttl_seconds``; once more than ``max_entries`` are
+    stored the least recently used ones are evicted. WAL mode lets the API
+    processes and the matching agent share one cache file.
+    """
+
+    def __init__(self, db_path: str = None, ttl_seconds: int = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if db_path is None:
+            backend_dir = os.path.dirname(os.path.abspath(__file__))
+            db_path = os.path.join(backend_dir, 'llm_cache.db')
+        self.db_path = db_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(db_path, timeout=30.0, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._init_db()
+
+    def _init_db(self):
+        """Initialize the cache table"""
+        with self._lock:
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)')
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict], **params) -> str:
+        """Hash of model id, rendered messages and any output-affecting parameters"""
+        payload = json.dumps({'model': model, 'messages': messages, 'params': params}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on a miss or expired entry"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT response, created_at FROM llm_cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute('UPDATE llm_cache SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def set(self, key: str, model: str, response: str):
+        """Store a response and evict expired / least recently used entries"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO llm_cache (key, model, response, created_at, last_access)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (key, model, response, now, now))
+            self._writes += 1
+            # Eviction scans the table, so only run it every so often
+            if self._writes % 100 == 1:
+                self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float):
+        self._conn.execute('DELETE FROM llm_cache WHERE created_at < ?', (now - self.ttl_seconds,))
+        count = self._conn.execute('SELECT COUNT(*) FROM llm_cache').fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute('''
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?
+                )
+            ''', (count - self.max_entries,))
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM llm_cache')
+            self._conn.commit()
+
+
+# Global instance
+llm_cache = LLMCache()
@@ -4,7 +4,6 @@ Monitoring and Feedback Agent - Processes HR feedback and modifies agent prompts
 import os
 import json
 from typing import Dict, Optional
-from openai import OpenAI
 from dotenv import load_dotenv
 from backend.prompt_manager import prompt_manager
 from backend.agent_orchestrator import AIAgent, notification_store
@@ -60,19 +59,8 @@ class FeedbackAgent(AIAgent):
             "processes HR feedback, analyzes it with LLM, and suggests prompt modifications to improve agent behavior"
         )
         
-        # Initialize LLM client for prompt modification
-        try:
-            token = os.environ.get('HF_TOKEN')
-            if token:
-                self.llm_client = OpenAI(
-                    base_url="https://router.huggingface.co/v1",
-                    api_key=token,
-                    timeout=60.0
-                )
-            else:
-                self.llm_client = None
-        except:
-            self.llm_client = None
+        # Prompt modification uses the same pooled client as the other agents
+        self.llm_client = self.client
     
     def process_feedback(self, agent_name: str, feedback_text: str, hr_email: str = None) -> Dict:
         """Process HR feedback and generate prompt modification suggestions using LLM"""
@@ -0,0 +1,245 @@
+"""
+Notification Bus - SQLite-backed agent notification stream shared across processes
+"""
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+DEFAULT_RETENTION = 1000  # rows kept on disk
+DEFAULT_CAPACITY = 100  # notifications returned by get_all / get_since
+FLUSH_INTERVAL = 0.05  # seconds a notification may wait to be batched
+POLL_INTERVAL = 0.25  # how often wait_for looks for other processes' writes
+
+
+class SQLiteNotificationBus:
+    """Drop-in NotificationStore whose notifications live in a WAL-mode SQLite file.
+
+    Every API process (and every module copy of the orchestrator within one)
+    writes to and reads from the same table, so ``/api/notifications`` shows
+    activity from all agents. ``add`` only queues the notification; a
+    background thread commits queued notifications in batches. Sequence ids
+    are the table's AUTOINCREMENT keys, so they are unique and increasing
+    across processes and reads by ``seq`` use the primary key.
+    """
+
+    def __init__(self, db_path: str = None, retention: int = DEFAULT_RETENTION, capacity: int = DEFAULT_CAPACITY,
+                 flush_interval: float = FLUSH_INTERVAL, poll_interval: float = POLL_INTERVAL):
+        if db_path is None:
+            backend_dir = os.path.dirname(os.path.abspath(__file__))
+            db_path = os.path.join(backend_dir, 'notifications.db')
+        self.db_path = db_path
+        self.retention = retention
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+        self._pending: List[Dict] = []
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._local = threading.local()
+        self._flusher_pid = None
+        # Serialises flushes, so batches are written in the order queued
+        self._flush_lock = threading.Lock()
+        self._init_db()
+        atexit.register(self.flush)
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread (and per process, after a fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.db_path, timeout=30.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _init_db(self):
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS notifications (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,  -- JSON notification body
+                read BOOLEAN DEFAULT 0
+            )
+        ''')
+        conn.commit()
+
+    def _ensure_flusher(self):
+        # Started lazily so a forked worker gets its own thread; caller holds _lock
+        if self._flusher_pid != os.getpid():
+            self._flusher_pid = os.getpid()
+            threading.Thread(target=self._flush_loop, name='notification-bus', daemon=True).start()
+
+    def add(self, notification: Dict):
+        """Queue a notification for the background flush.
+
+        Unlike ``NotificationStore.add``, the returned notification has no
+        ``seq`` yet: the id is the row key, assigned when the batch is
+        written. Call ``flush()`` first if the seq is needed right away;
+        readers get it from ``get_since``/``wait_for``.
+        """
+        notification['timestamp'] = datetime.now(timezone.utc).isoformat()
+        notification['read'] = False
+        with self._lock:
+            self._pending.append(notification)
+            self._ensure_flusher()
+            self._changed.notify_all()
+        return notification
+
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                while not self._pending:
+                    self._changed.wait()
+            # Let a burst of notifications collect into one transaction
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing notifications: {e}")
+
+    def flush(self):
+        """Write every queued notification in one transaction"""
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            try:
+                conn = self._connect()
+                with conn:
+                    for notification in batch:
+                        cursor = conn.execute('INSERT INTO notifications (payload) VALUES (?)', (self._payload(notification),))
+                        notification['seq'] = cursor.lastrowid
+                    # Bounded retention: keep only the newest ``retention`` rows
+                    conn.execute('DELETE FROM notifications WHERE seq <= ?', (batch[-1]['seq'] - self.retention,))
+            except Exception:
+                # The transaction rolled back (e.g. database locked); requeue
+                # the batch ahead of anything added since, for the next flush
+                for notification in batch:
+                    notification.pop('seq', None)
+                with self._lock:
+                    self._pending[:0] = batch
+                raise
+        with self._lock:
+            self._changed.notify_all()
+
+    def _find_row(self, conn: sqlite3.Connection, reasoning_id: str):
+        return conn.execute('''
+            SELECT seq, payload, read FROM notifications
+            WHERE json_extract(payload, '$.reasoning_id') = ?
+            ORDER BY seq DESC LIMIT 1
+        ''', (reasoning_id,)).fetchone()
+
+    def _find_pending(self, reasoning_id: str) -> Optional[Dict]:
+        # Caller holds _lock
+        for notification in self._pending:
+            if notification.get('reasoning_id') == reasoning_id:
+                return notification
+        return None
+
+    def republish(self, reasoning_id: str, **fields) -> Optional[Dict]:
+        """Update the notification carrying ``reasoning_id`` and give it a new seq.
+
+        The row is rewritten under a fresh AUTOINCREMENT key, so ``since``
+        readers in every process see the update while the history keeps one
+        row per decision. Returns None if the row is no longer retained.
+        """
+        with self._flush_lock:
+            with self._lock:
+                notification = self._find_pending(reasoning_id)
+                if notification is not None:
+                    # Not written yet; goes out with the fields on the next flush
+                    notification.update(fields)
+                    return dict(notification)
+            conn = self._connect()
+            with conn:
+                row = self._find_row(conn, reasoning_id)
+                if row is None:
+                    return None
+                notification = self._row_to_notification(row)
+                notification.update(fields)
+                conn.execute('DELETE FROM notifications WHERE seq = ?', (row[0],))
+                cursor = conn.execute('INSERT INTO notifications (payload, read) VALUES (?, ?)',
+                                      (self._payload(notification), int(notification['read'])))
+                notification['seq'] = cursor.lastrowid
+        with self._lock:
+            self._changed.notify_all()
+        return notification
+
+    def find(self, reasoning_id: str) -> Optional[Dict]:
+        """The notification carrying ``reasoning_id``, queued or written"""
+        with self._lock:
+            notification = self._find_pending(reasoning_id)
+            if notification is not None:
+                return dict(notification)
+        row = self._find_row(self._connect(), reasoning_id)
+        return self._row_to_notification(row) if row else None
+
+    @staticmethod
+    def _payload(notification: Dict) -> str:
+        body = {k: v for k, v in notification.items() if k not in ('seq', 'read')}
+        return json.dumps(body, default=str)
+
+    @staticmethod
+    def _row_to_notification(row) -> Dict:
+        seq, payload, read = row
+        notification = json.loads(payload)
+        notification['seq'] = seq
+        notification['read'] = bool(read)
+        return notification
+
+    @property
+    def latest_seq(self) -> int:
+        row = self._connect().execute("SELECT seq FROM sqlite_sequence WHERE name = 'notifications'").fetchone()
+        return row[0] if row else 0
+
+    def get_all(self) -> List[Dict]:
+        """The newest ``capacity`` notifications, newest first"""
+        return self.get_since(0)
+
+    def get_since(self, since: int) -> List[Dict]:
+        """Notifications with seq greater than ``since``, newest first"""
+        rows = self._connect().execute('''
+            SELECT seq, payload, read FROM notifications
+            WHERE seq > ?
+            ORDER BY seq DESC
+            LIMIT ?
+        ''', (since, self.capacity)).fetchall()
+        return [self._row_to_notification(row) for row in rows]
+
+    def wait_for(self, since: int, timeout: float) -> List[Dict]:
+        """Block up to ``timeout`` seconds for notifications newer than ``since``"""
+        deadline = time.monotonic() + timeout
+        while True:
+            notifications = self.get_since(since)
+            remaining = deadline - time.monotonic()
+            if notifications or remaining <= 0:
+                return notifications
+            # Woken early by this process's own flushes; other processes'
+            # writes are picked up on the next poll
+            with self._lock:
+                self._changed.wait(min(self.poll_interval, remaining))
+
+    def mark_read(self, index: int):
+        # ``index`` is a position in the newest-first list returned by get_all
+        if index < 0:
+            return
+        conn = self._connect()
+        with conn:
+            conn.execute('''
+                UPDATE notifications SET read = 1
+                WHERE seq = (SELECT seq FROM notifications ORDER BY seq DESC LIMIT 1 OFFSET ?)
+            ''', (index,))
+
+    def clear_all(self):
+        with self._lock:
+            self._pending = []
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM notifications')
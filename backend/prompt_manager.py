@@ -4,17 +4,29 @@ Prompt Management System - Stores and manages agent prompts with versioning
 import sqlite3
 import json
 import os
+import threading
+import time
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+# Seconds an active prompt is served from memory before it is re-read
+PROMPT_CACHE_TTL = 60
 
 class PromptManager:
     """Manages agent prompts with versioning and modification history"""
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, cache_ttl: float = PROMPT_CACHE_TTL):
         if db_path is None:
             backend_dir = os.path.dirname(os.path.abspath(__file__))
             db_path = os.path.join(backend_dir, 'prompts.db')
         self.db_path = db_path
+        self.cache_ttl = cache_ttl
+        # (agent_name, prompt_type) -> (prompt, cache version, expires at)
+        self._cache: Dict[Tuple[str, str], Tuple[Optional[str], int, float]] = {}
+        self._cache_version = 0
+        self._cache_lock = threading.Lock()
+        self._reader = None
+        self._data_version = None
         self._init_db()
         self._load_default_prompts()
     
@@ -197,22 +209,45 @@ Output JSON ONLY:
         conn.commit()
         conn.close()
     
+    def invalidate_cache(self):
+        """Drop every cached prompt (bumps the cache version)"""
+        with self._cache_lock:
+            self._cache_version += 1
+            self._cache.clear()
+    
+    def _check_data_version(self):
+        # PRAGMA data_version changes whenever another connection (including
+        # other processes) commits to the database; caller holds _cache_lock
+        if self._reader is None:
+            self._reader = sqlite3.connect(self.db_path, check_same_thread=False)
+        data_version = self._reader.execute('PRAGMA data_version').fetchone()[0]
+        if data_version != self._data_version:
+            self._data_version = data_version
+            self._cache_version += 1
+            self._cache.clear()
+    
     def get_prompt(self, agent_name: str, prompt_type: str) -> Optional[str]:
-        """Get the active prompt for an agent"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT prompt_content FROM prompts
-            WHERE agent_name = ? AND prompt_type = ? AND is_active = 1
-            ORDER BY version DESC
-            LIMIT 1
-        ''', (agent_name, prompt_type))
-        
-        result = cursor.fetchone()
-        conn.close()
-        
-        return result[0] if result else None
+        """Get the active prompt for an agent (read-through cached)"""
+        key = (agent_name, prompt_type)
+        with self._cache_lock:
+            self._check_data_version()
+            cached = self._cache.get(key)
+            if cached is not None:
+                prompt, version, expires_at = cached
+                if version == self._cache_version and time.monotonic() < expires_at:
+                    return prompt
+            
+            version = self._cache_version
+            result = self._reader.execute('''
+                SELECT prompt_content FROM prompts
+                WHERE agent_name = ? AND prompt_type = ? AND is_active = 1
+                ORDER BY version DESC
+                LIMIT 1
+            ''', (agent_name, prompt_type)).fetchone()
+            prompt = result[0] if result else None
+            self._cache[key] = (prompt, version, time.monotonic() + self.cache_ttl)
+        
+        return prompt
     
     def get_all_prompts(self, agent_name: str = None) -> List[Dict]:
         """Get all prompts, optionally filtered by agent"""
@@ -284,6 +319,7 @@ Output JSON ONLY:
         new_prompt_id = cursor.lastrowid
         conn.close()
         
+        self.invalidate_cache()
         return new_version
     
     def submit_feedback(self, agent_name: str, feedback_text: str, hr_email: str = None) -> int:
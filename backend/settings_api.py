@@ -11,7 +11,14 @@ backend_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.dirname(backend_dir))
 
 from backend.prompt_manager import prompt_manager
-# from backend.monitoring_feedback_agent import monitoring_agent, feedback_agent # Moved to lazy load
+from backend.agent_registry import agent_registry
+
+def _load_feedback_agent():
+    from backend.monitoring_feedback_agent import feedback_agent
+    return feedback_agent
+
+# Lazy, built once per process by the registry
+agent_registry.register('feedback', _load_feedback_agent)
 
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*", "allow_headers": "*", "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"]}})
@@ -28,6 +35,11 @@ def get_agents():
     ]
     return jsonify({'success': True, 'agents': agents})
 
+@app.route('/api/settings/agents/health', methods=['GET'])
+def get_agents_health():
+    """Build status of every registered agent and the shared LLM client"""
+    return jsonify({'success': True, **agent_registry.health()})
+
 @app.route('/api/settings/agents/<agent_name>/prompts', methods=['GET'])
 def get_agent_prompts(agent_name):
     """Get all prompts for an agent"""
@@ -101,8 +113,7 @@ def modify_prompt_ui():
         if not agent_name or not instruction:
             return jsonify({'success': False, 'error': 'Missing agent_name or instruction'}), 400
 
-        # Lazy load feedback agent
-        from backend.monitoring_feedback_agent import feedback_agent
+        feedback_agent = agent_registry.get('feedback')
         
         # 1. Generate new prompt using LLM (simulated via feedback agent logic or direct call)
         # For now, we'll use a direct LLM call if possible, or fallback to appending instruction
@@ -183,8 +194,7 @@ def submit_feedback():
                 'error': 'agent_name and feedback_text are required'
             }), 400
         
-        # Lazy load agents
-        from backend.monitoring_feedback_agent import monitoring_agent, feedback_agent
+        feedback_agent = agent_registry.get('feedback')
         
         # Process feedback through Feedback Agent
         result = feedback_agent.process_feedback(agent_name, feedback_text, hr_email)
@@ -250,6 +260,7 @@ def apply_feedback(feedback_id):
         agent_name = feedback_item['agent_name']
         
         # Apply modifications
+        feedback_agent = agent_registry.get('feedback')
         result = feedback_agent.apply_prompt_modifications(
             feedback_id,
             agent_name,
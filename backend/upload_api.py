@@ -4,19 +4,22 @@ from pymongo import MongoClient
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
 import os
+import threading
 from bson.objectid import ObjectId
 import math
 from email_service import EmailService
 try:
     # Optional advanced scoring imports
     # Optional advanced scoring imports
-    from agents.resumeandmatching.utils.resume_parser import parse_resume as _parse_resume
+    from agents.resumeandmatching.config import CONFIG as MATCHING_CONFIG
+    from agents.resumeandmatching.utils.database import get_session_factory as _get_matching_session_factory
+    from agents.resumeandmatching.utils.text_cache import get_or_extract as _get_or_extract_text
     # from agents.resumeandmatching.utils.matcher import semantic_match as _semantic_match # Lazy load
     # from agents.resumeandmatching.utils.llm_scorer import compute_score as _llm_score # Lazy load
     _ADVANCED_SCORING = True
 except Exception:
     _ADVANCED_SCORING = False
-    _parse_resume = None
+    _get_or_extract_text = None
     # _semantic_match = None
     # _llm_score = None
 import fitz  # PyMuPDF (fallback text extraction)
@@ -65,6 +68,15 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 RESUMES_FOLDER = os.path.join(BASE_DIR, "..", "agents", "resumeandmatching", "resumes")
 os.makedirs(RESUMES_FOLDER, exist_ok=True)
 
+# Session factory for the matching agent's SQLite DB (text cache, JD embeddings)
+_matching_session_factory = None
+
+def _matching_session():
+    global _matching_session_factory
+    if _matching_session_factory is None:
+        _matching_session_factory = _get_matching_session_factory(MATCHING_CONFIG["db"]["sqlalchemy_url"])
+    return _matching_session_factory()
+
 # ---------------- Root Endpoint (Health Check) ----------------
 @app.route("/", methods=["GET"])
 def index():
@@ -191,6 +203,53 @@ def list_applications():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+# ---------------- Per-Job Resume Shortlist ----------------
+@app.route("/job_resume_matches", methods=["GET"])
+def job_resume_matches():
+    """Indexed resumes most similar to a job's description (top-K, best first).
+
+    Covers every resume the matching agent has processed, not only the
+    job's own applicants, so HR can shortlist from the whole pool.
+    """
+    job_id = request.args.get("job_id")
+    k = request.args.get("k", default=10, type=int)
+    if not job_id:
+        return jsonify({"error": "job_id is required"}), 400
+    if not _ADVANCED_SCORING:
+        return jsonify({"error": "Resume matching is unavailable"}), 503
+    try:
+        doc = collection.find_one({"_id": ObjectId(job_id)})
+        if not doc:
+            return jsonify({"error": "Job not found"}), 404
+        from agents.resumeandmatching.utils.jd_embeddings import embed_job_profile
+        from agents.resumeandmatching.utils.vector_index import get_vector_index
+
+        session = _matching_session()
+        try:
+            job_emb = embed_job_profile(session, doc, MATCHING_CONFIG["models"]["sbert"])
+        finally:
+            session.close()
+        index = get_vector_index(MATCHING_CONFIG["paths"]["chroma"])
+        matches = index.top_resumes_for_job(job_emb, max(1, min(k, 100)))
+
+        paths = [path for path, _ in matches]
+        apps_by_path = {}
+        for a in applications_col.find({"resume_path": {"$in": paths}}):
+            apps_by_path.setdefault(a.get("resume_path"), a)
+        results = []
+        for path, similarity in matches:
+            a = apps_by_path.get(path) or {}
+            results.append({
+                "resume_filename": a.get("resume_filename") or os.path.basename(path),
+                "similarity": round(similarity, 4),
+                "name": a.get("name"),
+                "email": a.get("email"),
+                "applied_job_id": str(a["job_id"]) if a.get("job_id") else None,
+            })
+        return jsonify({"matches": results}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 # ---------------- Update Application Status ----------------
 @app.route("/update_application_status", methods=["POST"])
 def update_application_status():
@@ -263,18 +322,26 @@ def apply_job():
         try:
             # Extract JD text
             jd_text = job.get("responsibilities") or job.get("summary") or job.get("description") or ""
-            # Extract resume text
-            if _parse_resume is not None:
-                resume_text = _parse_resume(stored_path) or ""
+            # Extract resume text once; the matching agent reuses it by file hash
+            if _get_or_extract_text is not None:
+                session = _matching_session()
+                try:
+                    _, resume_text = _get_or_extract_text(session, stored_path)
+                finally:
+                    session.close()
             else:
                 try:
                     d = fitz.open(stored_path)
                     resume_text = "".join(p.get_text() for p in d)
                     d.close()
                 except Exception:
-                    overlap = len(r_set & j_set)
-                    base = len(j_set) or 1
-                    score_val = 100.0 * overlap / base
+                    resume_text = ""
+            # Keyword overlap; the matching agent refines it later
+            r_set = set(resume_text.lower().split())
+            j_set = set(jd_text.lower().split())
+            overlap = len(r_set & j_set)
+            base = len(j_set) or 1
+            score_val = 100.0 * overlap / base
             score_val = float(max(0.0, min(100.0, score_val)))
         except Exception:
             score_val = 0.0
@@ -324,6 +391,22 @@ def delete_profile():
 def send_static(path):
     return __import__("flask").send_from_directory('static', path)
 
+def _embed_approved_profile(profile_id):
+    """Store the approved JD's embedding so matching runs reuse it (best-effort)."""
+    try:
+        from agents.resumeandmatching.utils.jd_embeddings import embed_job_profile
+
+        doc = collection.find_one({"_id": ObjectId(profile_id)})
+        if not doc:
+            return
+        session = _matching_session()
+        try:
+            embed_job_profile(session, doc, MATCHING_CONFIG["models"]["sbert"])
+        finally:
+            session.close()
+    except Exception as e:
+        print(f"Warning: failed to embed approved profile {profile_id}: {e}", flush=True)
+
 # ---------------- Approve Profile ----------------
 @app.route("/approve", methods=["POST"])
 def approve_profile():
@@ -350,6 +433,9 @@ def approve_profile():
         result = collection.update_one({"_id": ObjectId(profile_id)}, {"$set": {"approved": True}})
         if result.matched_count == 0:
             return jsonify({"error": "Profile not found"}), 404
+
+        # Embed the JD off the request thread (SBERT load can take seconds)
+        threading.Thread(target=_embed_approved_profile, args=(profile_id,), daemon=True).start()
             
         # 2. Handle Social Media Posting
         if post_to:
@@ -1,41 +1,70 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import Navbar from './components/Navbar';
 import Sidebar from './components/Sidebar';
 import NotificationCenter from './components/NotificationCenter';
 import { SHORTLISTING_API_BASE, INTERVIEW_API_BASE } from '@/lib/apiConfig';
 
+const MAX_NOTIFICATIONS = 100;
+
 function Dashboard({ children }) {
   const [notifications, setNotifications] = useState([]);
   const [isSidebarOpen, setIsSidebarOpen] = useState(false);
+  // Sequence id of the newest notification we have; null forces a full reload
+  const latestSeq = useRef(null);
 
   useEffect(() => {
     loadNotifications();
-    const interval = setInterval(loadNotifications, 3000); // Poll every 3 seconds
+    // Deferred agent reasoning re-sends the decision's notification under a new seq, so polls stay incremental
+    const interval = setInterval(() => loadNotifications(true), 3000); // Poll every 3 seconds
     return () => clearInterval(interval);
   }, []);
 
-  const loadNotifications = async () => {
+  const fetchNotifications = async (base, since) => {
+    const query = since != null ? `?since=${since}` : '';
+    const res = await fetch(`${base}/notifications${query}`);
+    return res.json();
+  };
+
+  const applyNotifications = (data, incremental) => {
+    const fresh = data.notifications || [];
+    const serverSeq = data.latest_seq;
+    if (!incremental || latestSeq.current == null || serverSeq == null || serverSeq < latestSeq.current) {
+      // Full list (or the service restarted and its sequence ids started over)
+      setNotifications(fresh);
+    } else if (fresh.length > 0) {
+      setNotifications(prev => {
+        const known = new Set(prev.map(n => n.seq));
+        const added = fresh.filter(n => !known.has(n.seq));
+        // A re-sent notification (reasoning filled in) replaces its earlier copy
+        const updated = new Set(added.map(n => n.reasoning_id).filter(Boolean));
+        const kept = prev.filter(n => !n.reasoning_id || !updated.has(n.reasoning_id));
+        return [...added, ...kept].slice(0, MAX_NOTIFICATIONS);
+      });
+    }
+    latestSeq.current = serverSeq ?? null;
+  };
+
+  // Incremental polls only ask for notifications newer than the last one seen
+  const loadNotifications = async (incremental = false) => {
+    const since = incremental ? latestSeq.current : null;
     try {
       // Try shortlisting service first
-      let res = await fetch(`${SHORTLISTING_API_BASE}/notifications`);
-      let data = await res.json();
+      let data = await fetchNotifications(SHORTLISTING_API_BASE, since);
 
       if (!data.success) {
         // Fallback to interview service
-        res = await fetch(`${INTERVIEW_API_BASE}/notifications`);
-        data = await res.json();
+        data = await fetchNotifications(INTERVIEW_API_BASE, since);
       }
 
       if (data.success) {
-        setNotifications(data.notifications || []);
+        applyNotifications(data, incremental);
       }
     } catch (err) {
       // Try interview service as fallback
       try {
-        const res = await fetch(`${INTERVIEW_API_BASE}/notifications`);
-        const data = await res.json();
+        const data = await fetchNotifications(INTERVIEW_API_BASE, since);
         if (data.success) {
-          setNotifications(data.notifications || []);
+          applyNotifications(data, incremental);
         }
       } catch (err2) {
         // Silently fail if both services unavailable
@@ -75,6 +75,20 @@ import Latex from 'react-latex-next';
 
 const API_BASE_URL = SHORTLISTING_API_BASE;
 
+// Long-running endpoints answer 202 with a job id; poll until the job finishes
+const waitForJob = async (response) => {
+  const data = await response.json();
+  if (response.status !== 202 || !data.job_id) return data;
+  while (true) {
+    await new Promise(resolve => setTimeout(resolve, 2000));
+    const statusData = await (await fetch(`${API_BASE_URL}/jobs/${data.job_id}`)).json();
+    const job = statusData.job;
+    if (!statusData.success || !job) return statusData;
+    if (job.status === 'completed') return { ...job.result, job_id: job.id };
+    if (job.status === 'failed') return { success: false, error: job.error, job_id: job.id };
+  }
+};
+
 const HRTestManager = () => {
   const [problems, setProblems] = useState([]);
   const [selectedProblems, setSelectedProblems] = useState([]);
@@ -454,7 +468,7 @@ const HRTestManager = () => {
         method: 'POST'
       });
 
-      const fetchData = await fetchResponse.json();
+      const fetchData = await waitForJob(fetchResponse);
       if (fetchData.success) {
         const summary = fetchData.summary || {};
         const message = summary.errors && summary.errors.length > 0
@@ -481,7 +495,7 @@ const HRTestManager = () => {
         method: 'POST'
       });
 
-      const fetchData = await fetchResponse.json();
+      const fetchData = await waitForJob(fetchResponse);
       if (!fetchData.success) {
         alert('Error fetching results: ' + fetchData.error);
         return;
@@ -1,14 +1,197 @@
-from typing import Optional
+import multiprocessing
+import os
+import signal
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, Optional, Tuple
 import fitz  # PyMuPDF
 
+try:
+    import resource  # POSIX only; memory guard is skipped elsewhere
+except ImportError:
+    resource = None
 
-def parse_resume(resume_path: str) -> Optional[str]:
+
+# Extraction limits applied by the worker pool
+MAX_PAGES = 30
+FILE_TIMEOUT = 20.0  # seconds per file
+# Extra address space a worker may map on top of what it uses at start-up
+MAX_WORKER_MEMORY_MB = int(os.environ.get("PDF_WORKER_MAX_MEMORY_MB", "1024"))
+# Workers start from a small forkserver rather than forking the caller, which
+# may already hold torch / SBERT and gigabytes of address space
+WORKER_START_METHOD = os.environ.get("PDF_WORKER_START_METHOD") or (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+def parse_resume(resume_path: str, max_pages: Optional[int] = None) -> Optional[str]:
     try:
         doc = fitz.open(resume_path)
-        text = "".join([page.get_text() for page in doc])
+        pages = doc if max_pages is None else (doc[i] for i in range(min(max_pages, doc.page_count)))
+        text = "".join([page.get_text() for page in pages])
         doc.close()
         return text
     except Exception:
         return None
 
 
+def _on_timeout(signum, frame):
+    raise TimeoutError("PDF extraction timed out")
+
+
+def _address_space_bytes() -> int:
+    """Current virtual memory size of this process (0 if unknown)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _init_worker(max_memory_mb: int) -> None:
+    # Cap the worker's address space so one huge PDF can't exhaust the host;
+    # the cap is headroom over the worker's own baseline, not an absolute size
+    if resource is not None and max_memory_mb:
+        limit = _address_space_bytes() + max_memory_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+    if hasattr(signal, "SIGALRM"):
+        signal.signal(signal.SIGALRM, _on_timeout)
+
+
+def _extract_worker(path: str, max_pages: int, timeout: float) -> Optional[str]:
+    use_alarm = hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return parse_resume(path, max_pages=max_pages)
+    except (TimeoutError, MemoryError):
+        return None
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class PDFExtractionPool:
+    """Process pool that extracts PDF text off the calling thread.
+
+    Each file is limited to ``max_pages`` pages and ``timeout`` seconds, and
+    every worker may map at most ``max_memory_mb`` beyond its start-up size.
+    Workers are started with ``start_method`` (forkserver by default) so they
+    don't inherit the caller's models and buffers. A file that still hangs or
+    crashes its worker yields ``None`` and the pool is rebuilt, so one bad PDF
+    never stalls the rest of a batch.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pages: int = MAX_PAGES, timeout: float = FILE_TIMEOUT,
+                 max_memory_mb: int = MAX_WORKER_MEMORY_MB, start_method: str = WORKER_START_METHOD):
+        self.workers = workers or os.cpu_count() or 2
+        self.max_pages = max_pages
+        self.timeout = timeout
+        self.max_memory_mb = max_memory_mb
+        self.start_method = start_method
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context(self.start_method)
+                if self.start_method == "forkserver":
+                    # Preload only this module, not the caller's __main__
+                    context.set_forkserver_preload([__name__])
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self.max_memory_mb,),
+                )
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor) -> None:
+        """Tear down a broken or hung executor; the next submit starts a new one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        for proc in list(getattr(executor, "_processes", {}).values()):
+            proc.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, path: str) -> Future:
+        executor = self._get_executor()
+        try:
+            return executor.submit(_extract_worker, path, self.max_pages, self.timeout)
+        except BrokenProcessPool:
+            self._reset(executor)
+            return self._get_executor().submit(_extract_worker, path, self.max_pages, self.timeout)
+
+    def extract(self, path: str) -> Optional[str]:
+        for _, text in self.extract_many([path]):
+            return text
+        return None
+
+    def extract_many(self, paths: Iterable[str]) -> Iterator[Tuple[str, Optional[str]]]:
+        """Yield ``(path, text)`` as each file finishes (``text`` is None on failure)."""
+        pending: Dict[Future, str] = {self.submit(p): p for p in paths}
+        # Worker-side alarms enforce the per-file timeout; this is the backstop
+        # for a worker stuck inside native code.
+        stall_limit = self.timeout * 2 + 5.0
+        retried = set()
+        while pending:
+            done, _ = wait(pending, timeout=stall_limit, return_when=FIRST_COMPLETED)
+            if not done:
+                # Files still queued can be cancelled and go to the new
+                # executor; only the ones already handed to a worker fail.
+                queued = [path for future, path in pending.items() if future.cancel()]
+                running = [path for future, path in pending.items() if not future.cancelled()]
+                executor = self._executor
+                if executor is not None:
+                    self._reset(executor)
+                if not running:
+                    # Nothing had started, so the executor itself is stuck
+                    running, queued = queued, []
+                for path in running:
+                    yield path, None
+                pending = {self.submit(p): p for p in queued}
+                continue
+            requeue = []
+            for future in done:
+                path = pending.pop(future)
+                try:
+                    text = future.result()
+                except BrokenProcessPool:
+                    # A worker died (e.g. killed by the memory cap) and took
+                    # every in-flight file with it; retry those once.
+                    if path not in retried:
+                        retried.add(path)
+                        requeue.append(path)
+                        continue
+                    text = None
+                except Exception:
+                    text = None
+                yield path, text
+            if requeue:
+                if self._executor is not None:
+                    self._reset(self._executor)
+                pending.update({self.submit(p): p for p in requeue})
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: Optional[PDFExtractionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_extraction_pool() -> PDFExtractionPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PDFExtractionPool()
+        return _pool
@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend import agent_registry as registry_module
+from backend.agent_registry import AgentRegistry
+
+
+class TestAgentRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = AgentRegistry()
+
+    def test_builds_once_across_threads(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return object()
+
+        self.registry.register('agent', factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(self.registry.get('agent'))) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(r is results[0] for r in results))
+        self.assertEqual(self.registry.health()['agents']['agent']['status'], 'ready')
+
+    def test_failed_build_serves_fallback_until_retry_is_due(self):
+        registry = AgentRegistry(retry_backoff=10, max_retry_backoff=15)
+        calls = []
+        outcomes = [RuntimeError('no model'), RuntimeError('still no model'), 'agent']
+
+        def factory():
+            calls.append(1)
+            outcome = outcomes[len(calls) - 1]
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        registry.register('agent', factory, fallback=lambda error: f"dummy: {error}")
+        now = [1000.0]
+        with patch.object(registry_module.time, 'monotonic', side_effect=lambda: now[0]):
+            self.assertEqual(registry.get('agent'), 'dummy: no model')
+            self.assertEqual(registry.get('agent'), 'dummy: no model')
+            self.assertEqual(len(calls), 1)
+            status = registry.health()['agents']['agent']
+            self.assertEqual((status['status'], status['error'], status['retry_in_seconds']), ('error', 'no model', 10))
+
+            now[0] += 10
+            self.assertEqual(registry.get('agent'), 'dummy: still no model')
+            # The backoff doubles, capped at max_retry_backoff
+            self.assertEqual(registry.health()['agents']['agent']['retry_in_seconds'], 15)
+            now[0] += 14
+            registry.get('agent')
+            self.assertEqual(len(calls), 2)
+
+            now[0] += 1
+            self.assertEqual(registry.get('agent'), 'agent')
+            self.assertEqual(registry.get('agent'), 'agent')
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(registry.health()['agents']['agent']['status'], 'ready')
+
+    def test_duplicate_registration_is_reported(self):
+        self.registry.register('agent', lambda: 'first')
+        with patch('builtins.print') as printed:
+            self.registry.register('agent', lambda: 'second')
+        self.assertIn("registered more than once", printed.call_args[0][0])
+        self.assertEqual(self.registry.get('agent'), 'second')
+
+    def test_warm_up_builds_all_registered(self):
+        self.registry.register('a', lambda: 'A')
+        self.registry.register('b', lambda: 'B')
+        health = self.registry.warm_up()
+        self.assertEqual({name: s['status'] for name, s in health['agents'].items()}, {'a': 'ready', 'b': 'ready'})
+
+    def test_unknown_agent(self):
+        with self.assertRaises(KeyError):
+            self.registry.get('missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
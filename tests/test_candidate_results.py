@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import json
+import shutil
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'agents', 'shortlisting')))
+
+from shortlisting_database import DatabaseManager
+
+
+class TestCandidateResultsTable(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db = DatabaseManager.__new__(DatabaseManager)
+        self.db.backend_dir = self.tmp
+        self.db.selected_candidates_db = os.path.join(self.tmp, 'selected_candidates.db')
+        self.db.userids_db = os.path.join(self.tmp, 'userids.db')
+        self.db.interview_db = os.path.join(self.tmp, 'interview.db')
+        self.db.init_databases()
+        questions = [
+            {'contestId': 1, 'index': 'A', 'rating': 800, 'tags': ['math']},
+            {'contestId': 1, 'index': 'B', 'rating': 1900, 'tags': ['dp']},
+        ]
+        self.test_id = self.db.create_test('Drive', '', json.dumps(questions))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_summary_follows_writes(self):
+        alice = self.db.register_codeforces_user('alice@example.com', 'alice', self.test_id)
+        bob = self.db.register_codeforces_user('bob@example.com', 'bob', self.test_id)
+        self.db.save_test_results(alice, self.test_id, {'1A': {'solved': True}, '1B': {'solved': True}})
+        self.db.save_test_results(bob, self.test_id, {'1A': {'solved': True}, '1B': {'solved': False}})
+        self.db.update_candidate_metrics(bob, 3, 120)
+
+        summaries = self.db.get_candidate_results(self.test_id)
+        self.assertEqual([s['email'] for s in summaries], ['alice@example.com', 'bob@example.com'])
+        self.assertEqual([(s['total_solved'], s['weighted_score']) for s in summaries], [(2, 100), (1, 25)])
+
+        bob_row = self.db.get_candidate_result(self.test_id, bob)
+        self.assertEqual((bob_row['tab_switches'], bob_row['time_taken']), (3, 120))
+        self.assertFalse(bob_row['questions']['1B']['solved'])
+
+        self.db.delete_candidate_result(self.test_id, 'alice@example.com')
+        self.assertIsNone(self.db.get_candidate_result(self.test_id, alice))
+        self.assertEqual(len(self.db.get_candidate_results(self.test_id)), 1)
+
+    def test_legacy_result_data_is_migrated_to_json(self):
+        import sqlite3
+        alice = self.db.register_codeforces_user('alice@example.com', 'alice', self.test_id)
+        conn = sqlite3.connect(self.db.userids_db)
+        conn.execute(
+            'INSERT INTO test_results (userid_id, test_id, question_id, solved, result_data) VALUES (?, ?, ?, ?, ?)',
+            (alice, self.test_id, '1A', True, str({'solved': True, 'verdict': 'OK'}))
+        )
+        conn.execute('PRAGMA user_version = 0')
+        conn.commit()
+        conn.close()
+
+        self.db.init_userids_db()
+        conn = sqlite3.connect(self.db.userids_db)
+        stored = conn.execute('SELECT result_data FROM test_results').fetchone()[0]
+        conn.close()
+        self.assertEqual(json.loads(stored), {'solved': True, 'verdict': 'OK'})
+        self.assertEqual(self.db.get_user_results(alice), {'1A': {'solved': True, 'verdict': 'OK'}})
+        self.assertEqual(self.db.get_candidate_result(self.test_id, alice)['questions']['1A']['data']['verdict'], 'OK')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,29 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.resumeandmatching.utils.cascade import keyword_overlap, stage1_scores, select_for_llm
+
+
+class TestCascadeRanker(unittest.TestCase):
+    def test_keyword_overlap(self):
+        self.assertAlmostEqual(keyword_overlap("Python SQL Docker", "python sql go rust"), 0.5)
+        self.assertEqual(keyword_overlap("anything", ""), 0.0)
+
+    def test_stage1_blends_keywords_into_ranking(self):
+        semantic = {"a": 0.70, "b": 0.69}
+        jd_texts = {"a": "java spring", "b": "python flask"}
+        ranked = stage1_scores("python flask developer", semantic, jd_texts, keyword_weight=0.3)
+        self.assertEqual([job_id for job_id, _ in ranked], ["b", "a"])
+
+    def test_select_for_llm_keeps_top_n_and_above_floor(self):
+        semantic = {"a": 0.90, "b": 0.60, "c": 0.80, "d": 0.50}
+        ranked = [("a", 0.9), ("b", 0.7), ("c", 0.6), ("d", 0.4)]
+        self.assertEqual(select_for_llm(ranked, semantic, semantic_floor=0.75, top_n=2), ["a", "b", "c"])
+        self.assertEqual(select_for_llm(ranked, semantic, semantic_floor=1.0, top_n=1), ["a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+from unittest import mock
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'agents', 'shortlisting')))
+
+from codeforces_api import CodeforcesAPI, CodeforcesAPIError
+
+
+class TestSubmissionIndex(unittest.TestCase):
+    def setUp(self):
+        self.api = CodeforcesAPI()
+        # Newest first, as returned by user.status
+        self.submissions = [
+            {'id': 3, 'verdict': 'WRONG_ANSWER', 'creationTimeSeconds': 30, 'problem': {'contestId': 1, 'index': 'A'}},
+            {'id': 2, 'verdict': 'OK', 'creationTimeSeconds': 20, 'problem': {'contestId': 1, 'index': 'A'}},
+            {'id': 1, 'verdict': 'TIME_LIMIT_EXCEEDED', 'creationTimeSeconds': 10, 'problem': {'contestId': 2, 'index': 'B'}},
+        ]
+
+    def test_accepted_submission_wins(self):
+        index = self.api.index_submissions(self.submissions)
+        result = self.api.check_problem_solved('tourist', {'contestId': 1, 'index': 'A'}, index)
+        self.assertTrue(result['solved'])
+        self.assertEqual(result['submission_id'], 2)
+
+    def test_lookup_without_accepted_or_match(self):
+        index = self.api.index_submissions(self.submissions)
+        result = self.api.check_problem_solved('tourist', {'contestId': '2', 'index': 'B'}, index)
+        self.assertFalse(result['solved'])
+        self.assertEqual(result['verdict'], 'TIME_LIMIT_EXCEEDED')
+        self.assertIsNone(self.api.check_problem_solved('tourist', {'contestId': 3, 'index': 'C'}, index)['submission_id'])
+
+
+    def test_batched_user_info_drops_unknown_handles(self):
+        def fake_call(method, params=None, timeout=10):
+            handles = params['handles'].split(';')
+            if 'ghost' in handles:
+                raise CodeforcesAPIError('handles: User with handle ghost not found')
+            return [{'handle': h} for h in handles]
+
+        with mock.patch.object(self.api, '_call', side_effect=fake_call) as call:
+            found = self.api.get_users_info(['Tourist', 'ghost', 'Petr'])
+        self.assertEqual(set(found), {'tourist', 'petr'})
+        self.assertEqual(call.call_count, 2)
+
+
+    def test_incremental_sync_stops_at_cursor(self):
+        class Store:
+            def __init__(self):
+                self.rows = {}
+
+            def get_submission_cursor(self, handle):
+                return self.rows.get(handle.lower(), (None, []))
+
+            def save_submission_cursor(self, handle, last_id, submissions):
+                self.rows[handle.lower()] = (last_id, submissions)
+
+        store = Store()
+        api = CodeforcesAPI(cursor_store=store)
+        with mock.patch.object(api, '_call', return_value=self.submissions):
+            api.get_submission_index('tourist')
+        self.assertEqual(store.rows['tourist'][0], 3)
+
+        newer = {'id': 4, 'verdict': 'OK', 'creationTimeSeconds': 40, 'problem': {'contestId': 2, 'index': 'B'}}
+        with mock.patch.object(api, '_call', return_value=[newer] + self.submissions) as call:
+            index = api.get_submission_index('Tourist')
+        self.assertEqual(call.call_count, 1)
+        self.assertEqual(call.call_args[0][1]['count'], 20)
+        self.assertTrue(api.check_problem_solved('tourist', {'contestId': 2, 'index': 'B'}, index)['solved'])
+        self.assertEqual(api.check_problem_solved('tourist', {'contestId': 1, 'index': 'A'}, index)['submission_id'], 2)
+        self.assertEqual(store.rows['tourist'][0], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
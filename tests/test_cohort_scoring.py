@@ -0,0 +1,46 @@
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'agents', 'shortlisting')))
+
+from cohort_scoring import score_cohort
+from test_schema import get_test_schema
+
+
+class TestCohortScoring(unittest.TestCase):
+    def test_scores_ranks_and_percentiles(self):
+        questions = [
+            {'contestId': 1, 'index': 'A', 'rating': 800, 'tags': ['math']},
+            {'contestId': 1, 'index': 'B', 'rating': 1900, 'tags': ['dp', 'math']},
+        ]
+
+        def candidate(name, *solved):
+            return {
+                'email': f'{name}@example.com', 'username': name, 'total_solved': len(solved),
+                'questions': {qid: {'solved': True} for qid in solved}
+            }
+
+        cohort = score_cohort(questions, [
+            candidate('low', '1A'), candidate('top', '1A', '1B'), candidate('tie', '1A'), candidate('none')
+        ])
+        self.assertEqual(cohort.scores.tolist(), [25, 100, 25, 0])
+        self.assertEqual(cohort.ranks.tolist(), [2, 1, 2, 4])
+        self.assertEqual(cohort.percentiles.tolist(), [50.0, 87.5, 50.0, 12.5])
+        self.assertEqual(cohort.levels.tolist()[1], 'Excellent')
+
+        best = cohort.ranking(limit=1)[0]
+        self.assertEqual(best['username'], 'top')
+        self.assertEqual(best['tag_performance']['math'], {'total': 2, 'solved': 2, 'percentage': 100.0})
+        self.assertEqual(cohort.cohort_tag_accuracy()['dp'], 25.0)
+
+        # Each row matches the analyzer's per-candidate stats
+        schema = get_test_schema(questions)
+        for i, c in enumerate(cohort.candidates):
+            expected = schema.candidate_scores(c)
+            scores = cohort.candidate_scores(i)
+            self.assertEqual((scores.difficulty, scores.tags, scores.score), (expected.difficulty, expected.tags, expected.score))
+
+
+if __name__ == '__main__':
+    unittest.main()
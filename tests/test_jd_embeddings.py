@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+import importlib
+import tempfile
+import types
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.resumeandmatching.utils.database import JobDescription, get_session_factory
+
+JD_EMBEDDINGS = 'agents.resumeandmatching.utils.jd_embeddings'
+
+
+class TestJobEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        # jd_embeddings imports the SBERT matcher; encoding is patched below
+        stub = types.ModuleType('sentence_transformers')
+        stub.SentenceTransformer = MagicMock()
+        self.modules = patch.dict(sys.modules, {'sentence_transformers': stub})
+        self.modules.start()
+        self.jd_embeddings = importlib.import_module(JD_EMBEDDINGS)
+        self.encoded = []
+        self.encode = patch.object(self.jd_embeddings, 'get_embeddings', side_effect=self._encode)
+        self.encode.start()
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.session = get_session_factory(f"sqlite:///{os.path.join(self.tmp.name, 'agent.db')}")()
+        self.jobs = [{'_id': 'j1', 'title': 'Backend', 'description': 'python apis'},
+                     {'_id': 'j2', 'title': 'Data', 'description': 'pandas and sql'}]
+
+    def tearDown(self):
+        self.session.close()
+        self.session.get_bind().dispose()
+        self.encode.stop()
+        self.modules.stop()
+        self.tmp.cleanup()
+
+    def _encode(self, texts, model_name):
+        self.encoded.append(list(texts))
+        return np.array([[len(t), i + 1.0, 0.5] for i, t in enumerate(texts)], dtype=np.float32)
+
+    def _stored(self, job_id):
+        self.session.expire_all()
+        return self.session.get(JobDescription, job_id)
+
+    def test_unchanged_jobs_reuse_stored_vectors(self):
+        first = self.jd_embeddings.get_job_embeddings(self.session, self.jobs, 'model-a')
+        self.assertEqual(self.encoded, [['python apis', 'pandas and sql']])
+        row = self._stored('j1')
+        self.assertEqual(row.content_hash, self.jd_embeddings.content_hash('python apis', 'model-a'))
+        np.testing.assert_array_equal(np.frombuffer(row.embedding, dtype=np.float32), first[0])
+
+        again = self.jd_embeddings.get_job_embeddings(self.session, self.jobs, 'model-a')
+        self.assertEqual(len(self.encoded), 1)  # served from the stored blobs
+        self.assertEqual(again.dtype, np.float32)
+        np.testing.assert_array_equal(again, first)
+
+    def test_edited_job_is_re_embedded(self):
+        self.jd_embeddings.get_job_embeddings(self.session, self.jobs, 'model-a')
+        edited = [self.jobs[0], {**self.jobs[1], 'description': 'spark pipelines'}]
+        embs = self.jd_embeddings.get_job_embeddings(self.session, edited, 'model-a')
+
+        self.assertEqual(self.encoded[1], ['spark pipelines'])
+        row = self._stored('j2')
+        self.assertEqual(row.description, 'spark pipelines')
+        self.assertEqual(row.content_hash, self.jd_embeddings.content_hash('spark pipelines', 'model-a'))
+        np.testing.assert_array_equal(np.frombuffer(row.embedding, dtype=np.float32), embs[1])
+
+    def test_model_change_invalidates_stored_vectors(self):
+        self.jd_embeddings.get_job_embeddings(self.session, self.jobs[:1], 'model-a')
+        self.assertNotEqual(self.jd_embeddings.content_hash('python apis', 'model-a'),
+                            self.jd_embeddings.content_hash('python apis', 'model-b'))
+
+        self.jd_embeddings.get_job_embeddings(self.session, self.jobs[:1], 'model-b')
+        self.assertEqual(self.encoded, [['python apis'], ['python apis']])
+        self.assertEqual(self._stored('j1').content_hash, self.jd_embeddings.content_hash('python apis', 'model-b'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import sys
+import os
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'agents', 'shortlisting')))
+
+from job_queue import JobQueue
+
+
+class TestJobQueue(unittest.TestCase):
+    def test_resubmission_while_running_returns_same_job(self):
+        release = threading.Event()
+        notes = []
+        jobs = JobQueue(workers=1, notify=lambda message, type, details=None: notes.append(message))
+
+        def work(progress, value):
+            progress("halfway", done=1, total=2)
+            release.wait(5)
+            return value * 2
+
+        first = jobs.submit('fetch-results', 7, work, 21)
+        second = jobs.submit('fetch-results', 7, work, 21)
+        self.assertEqual(first['id'], second['id'])
+
+        release.set()
+        job = jobs.wait(first['id'], timeout=5)
+        self.assertEqual(job['status'], 'completed')
+        self.assertEqual(job['result'], 42)
+        self.assertEqual(job['progress']['message'], 'halfway')
+        self.assertIn('halfway', notes)
+        self.assertNotEqual(jobs.submit('fetch-results', 7, work, 1)['id'], first['id'])
+
+    def test_failed_job_reports_error(self):
+        jobs = JobQueue(workers=1)
+
+        def boom(progress):
+            raise ValueError("no questions")
+
+        job = jobs.wait(jobs.submit('candidate-analysis', 1, boom)['id'], timeout=5)
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['error'], 'no questions')
+
+
+if __name__ == '__main__':
+    unittest.main()
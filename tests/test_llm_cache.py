@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from llm_cache import LLMCache
+
+
+class TestLLMCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'cache.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_depends_on_model_messages_and_params(self):
+        messages = [{'role': 'user', 'content': 'Score this resume'}]
+        key = LLMCache.make_key('model-a', messages, temperature=0.0)
+        self.assertEqual(key, LLMCache.make_key('model-a', list(messages), temperature=0.0))
+        self.assertNotEqual(key, LLMCache.make_key('model-b', messages, temperature=0.0))
+        self.assertNotEqual(key, LLMCache.make_key('model-a', messages, temperature=0.5))
+
+    def test_round_trip_and_ttl_expiry(self):
+        cache = LLMCache(self.db_path, ttl_seconds=60)
+        cache.set('k', 'model', '{"score": 80}')
+        self.assertEqual(cache.get('k'), '{"score": 80}')
+
+        cache.ttl_seconds = 0
+        time.sleep(0.01)
+        self.assertIsNone(cache.get('k'))
+
+    def test_evicts_least_recently_used(self):
+        cache = LLMCache(self.db_path, max_entries=2)
+        cache.set('a', 'model', '1')
+        cache.set('b', 'model', '2')
+        cache.get('a')
+        cache.set('c', 'model', '3')
+        cache._evict(time.time())
+
+        self.assertEqual(cache.get('a'), '1')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), '3')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from openai import RateLimitError
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.resumeandmatching.utils import llm_scorer
+from agents.resumeandmatching.utils.llm_scorer import AsyncLLMScorer, TokenBucket
+from backend.llm_cache import LLMCache
+
+
+def _rate_limit_error(headers):
+    request = httpx.Request('POST', 'https://example.invalid/v1/chat/completions')
+    response = httpx.Response(429, headers=headers, request=request)
+    return RateLimitError('rate limited', response=response, body=None)
+
+
+def _completion(content):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions; replays ``outcomes`` in order"""
+
+    def __init__(self, outcomes, delay=0.0):
+        self.outcomes = list(outcomes)
+        self.delay = delay
+        self.calls = 0
+
+    async def create(self, **kwargs):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        outcome = self.outcomes[min(self.calls, len(self.outcomes)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return _completion(outcome)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_refill_rate(self):
+        async def take(n):
+            bucket = TokenBucket(rate=50.0, capacity=2)
+            stamps = []
+            for _ in range(n):
+                await bucket.acquire()
+                stamps.append(time.monotonic())
+            return stamps
+
+        stamps = asyncio.run(take(4))
+        # Two banked tokens are immediate; the next two wait ~1/rate each
+        self.assertLess(stamps[1] - stamps[0], 0.01)
+        self.assertGreaterEqual(stamps[3] - stamps[1], 0.035)
+
+
+class TestRetryAfter(unittest.TestCase):
+    def test_header_forms(self):
+        self.assertEqual(llm_scorer._retry_after(_rate_limit_error({'retry-after': '3'})), 3.0)
+        self.assertEqual(llm_scorer._retry_after(_rate_limit_error({'retry-after-ms': '250'})), 0.25)
+        self.assertIsNone(llm_scorer._retry_after(_rate_limit_error({'retry-after': 'Wed, 21 Oct 2026 07:28:00 GMT'})))
+
+
+class TestAsyncLLMScorer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self._cache = llm_scorer.llm_cache
+        self._prompts = llm_scorer.prompt_manager
+        llm_scorer.llm_cache = LLMCache(os.path.join(self.tmp.name, 'cache.db'))
+        llm_scorer.prompt_manager = None
+        self.scorer = AsyncLLMScorer('model', 'token')
+
+    def tearDown(self):
+        llm_scorer.llm_cache = self._cache
+        llm_scorer.prompt_manager = self._prompts
+        self.tmp.cleanup()
+
+    def _use(self, completions):
+        self.scorer._client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    def test_identical_requests_in_flight_are_sent_once(self):
+        completions = FakeCompletions(['{"score": 72}'], delay=0.05)
+        self._use(completions)
+
+        scores = self.scorer.score_many([('resume', 'job')] * 5)
+
+        self.assertEqual(scores, [72.0] * 5)
+        self.assertEqual(completions.calls, 1)
+
+    def test_rate_limit_waits_for_retry_after(self):
+        completions = FakeCompletions([_rate_limit_error({'retry-after': '7'}), '{"score": 40}'])
+        self._use(completions)
+
+        with patch.object(llm_scorer.asyncio, 'sleep', new=AsyncMock()) as sleep:
+            self.assertEqual(self.scorer.score_many([('resume', 'job')]), [40.0])
+        sleep.assert_awaited_once_with(7.0)
+
+    def test_no_backoff_after_last_attempt(self):
+        completions = FakeCompletions([_rate_limit_error({'retry-after': '1'})])
+        self._use(completions)
+
+        with patch.object(llm_scorer.asyncio, 'sleep', new=AsyncMock()) as sleep:
+            self.assertEqual(self.scorer.score_many([('resume', 'job')]), [0.0])
+        self.assertEqual(completions.calls, llm_scorer.MAX_ATTEMPTS)
+        self.assertEqual(sleep.await_count, llm_scorer.MAX_ATTEMPTS - 1)
+
+    def test_cache_io_runs_off_the_event_loop(self):
+        completions = FakeCompletions(['{"score": 65}'])
+        self._use(completions)
+        cache = llm_scorer.llm_cache
+        threads = []
+
+        def record(method):
+            def call(*args):
+                threads.append(threading.current_thread())
+                return method(*args)
+            return call
+
+        with patch.object(cache, 'get', record(cache.get)), patch.object(cache, 'set', record(cache.set)):
+            self.assertEqual(self.scorer.score_many([('resume', 'job')]), [65.0])
+            # The second call is answered from the cache
+            self.assertEqual(self.scorer.score_many([('resume', 'job')]), [65.0])
+        self.assertEqual(completions.calls, 1)
+        self.assertEqual(len(threads), 3)  # get, set, get
+        self.assertNotIn(self.scorer._thread, threads)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import importlib
+import types
+import zlib
+from collections import Counter
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+MATCHER = 'agents.resumeandmatching.utils.matcher'
+
+
+class FakeSentenceTransformer:
+    """Deterministic stand-in for SBERT that records every text it encodes"""
+    dim = 8
+
+    def __init__(self, name):
+        self.name = name
+        self.encoded = Counter()
+        self.calls = 0
+
+    def get_sentence_embedding_dimension(self):
+        return self.dim
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True, normalize_embeddings=False, show_progress_bar=None):
+        self.calls += 1
+        self.encoded.update(texts)
+        embs = np.array([np.random.default_rng(zlib.crc32(t.encode())).normal(size=self.dim) for t in texts])
+        if normalize_embeddings:
+            embs = embs / np.linalg.norm(embs, axis=1, keepdims=True)
+        return embs
+
+
+class TestSemanticMatchMatrix(unittest.TestCase):
+    def setUp(self):
+        stub = types.ModuleType('sentence_transformers')
+        stub.SentenceTransformer = FakeSentenceTransformer
+        # Import the real matcher against the stub (other tests replace the module)
+        self.modules = patch.dict(sys.modules, {'sentence_transformers': stub})
+        self.modules.start()
+        sys.modules.pop(MATCHER, None)
+        self.matcher = importlib.import_module(MATCHER)
+        self.resumes = ['python developer', 'data scientist, pandas', 'frontend engineer']
+        self.jobs = ['backend python role', 'machine learning engineer']
+
+    def tearDown(self):
+        self.modules.stop()
+
+    def test_each_text_is_encoded_once_per_batch(self):
+        matrix = self.matcher.semantic_match_matrix(self.resumes, self.jobs, 'fake-model')
+        model = self.matcher._model
+        self.assertEqual(matrix.shape, (3, 2))
+        self.assertEqual(model.calls, 2)  # one call for the resumes, one for the JDs
+        self.assertEqual(model.encoded, Counter(self.resumes + self.jobs))
+
+    def test_matrix_matches_pairwise_scores(self):
+        matrix = self.matcher.semantic_match_matrix(self.resumes, self.jobs, 'fake-model')
+        expected = [[self.matcher.semantic_match(r, j, 'fake-model') for j in self.jobs] for r in self.resumes]
+        np.testing.assert_allclose(matrix, expected, atol=1e-6)
+
+    def test_empty_batch(self):
+        self.assertEqual(self.matcher.get_embeddings([], 'fake-model').shape, (0, FakeSentenceTransformer.dim))
+        self.assertEqual(self.matcher.semantic_match_matrix([], self.jobs, 'fake-model').shape, (0, 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
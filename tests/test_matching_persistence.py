@@ -0,0 +1,55 @@
+import unittest
+import sys
+import os
+import importlib.util
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from pymongo import UpdateOne
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.resumeandmatching.utils.database import get_session_factory
+
+# main.py loads the SBERT matcher at import time
+HAS_MATCHER_DEPS = importlib.util.find_spec('sentence_transformers') is not None
+
+
+class TestSessionFactory(unittest.TestCase):
+    def test_engine_is_created_once_per_url(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{os.path.join(tmp, 'agent.db')}"
+            factory = get_session_factory(url)
+            self.assertIs(get_session_factory(url), factory)
+
+            first, second = factory(), factory()
+            try:
+                self.assertIs(first.get_bind(), second.get_bind())
+            finally:
+                first.close()
+                second.close()
+                first.get_bind().dispose()
+
+
+@unittest.skipUnless(HAS_MATCHER_DEPS, 'sentence-transformers is not installed')
+class TestFlushScores(unittest.TestCase):
+    def setUp(self):
+        from agents.resumeandmatching import main
+        self.main = main
+
+    def test_one_bulk_write_per_flush(self):
+        client = MagicMock()
+        updates = [UpdateOne({'resume_path': f'/r/{i}.pdf'}, {'$set': {'score': 80.0}}) for i in range(3)]
+        state = self.main.AgentState(resumes=[], jobs=[], mongo_updates=list(updates))
+
+        with patch.object(self.main, 'get_mongo_client', return_value=client):
+            self.main.flush_scores_node(state)
+            self.main.flush_scores_node(state)  # nothing queued: no round trip
+
+        bulk_write = client['profiles']['applications'].bulk_write
+        bulk_write.assert_called_once_with(updates, ordered=False)
+        self.assertEqual(state.mongo_updates, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
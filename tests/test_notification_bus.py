@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from notification_bus import SQLiteNotificationBus
+
+
+class TestNotificationBus(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'notifications.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writers_share_one_stream(self):
+        # Two buses on one file stand in for two API processes
+        shortlisting = SQLiteNotificationBus(self.db_path, retention=3)
+        interview = SQLiteNotificationBus(self.db_path, retention=3)
+        shortlisting.add({'agent': 'Shortlisting Agent', 'message': 'a'})
+        shortlisting.add({'agent': 'Shortlisting Agent', 'message': 'b'})
+        shortlisting.flush()
+        interview.add({'agent': 'Interview Agent', 'message': 'c'})
+        interview.flush()
+
+        self.assertEqual([n['message'] for n in interview.get_all()], ['c', 'b', 'a'])
+        self.assertEqual([n['message'] for n in shortlisting.get_since(2)], ['c'])
+        self.assertEqual(shortlisting.latest_seq, 3)
+
+        interview.mark_read(1)
+        self.assertEqual([n['read'] for n in shortlisting.get_all()], [False, True, False])
+
+        for message in 'defg':
+            shortlisting.add({'message': message})
+        shortlisting.flush()
+        # Retention keeps the newest three rows; sequence ids keep increasing
+        self.assertEqual([n['seq'] for n in interview.get_all()], [7, 6, 5])
+
+    def test_wait_for_sees_background_flush(self):
+        bus = SQLiteNotificationBus(self.db_path, flush_interval=0.01)
+        bus.add({'message': 'hello'})
+        notifications = bus.wait_for(0, timeout=5)
+        self.assertEqual([n['message'] for n in notifications], ['hello'])
+        bus.clear_all()
+        self.assertEqual(bus.get_all(), [])
+
+    def test_failed_flush_keeps_the_batch(self):
+        bus = SQLiteNotificationBus(self.db_path)
+        first = bus.add({'message': 'first'})
+        self.assertNotIn('seq', first)  # assigned when the batch is written
+
+        with patch.object(bus, '_payload', side_effect=[bus._payload(first), sqlite3.OperationalError('database is locked')]):
+            bus.add({'message': 'second'})
+            with self.assertRaises(sqlite3.OperationalError):
+                bus.flush()
+        self.assertNotIn('seq', first)
+        self.assertEqual(bus.get_all(), [])
+
+        bus.add({'message': 'third'})
+        bus.flush()
+        self.assertEqual([n['message'] for n in bus.get_all()], ['third', 'second', 'first'])
+        self.assertEqual(first['seq'], 1)
+
+    def test_republish_moves_the_row_to_a_new_seq(self):
+        writer = SQLiteNotificationBus(self.db_path)
+        reader = SQLiteNotificationBus(self.db_path)
+        writer.add({'message': 'decided', 'reasoning': None, 'reasoning_id': 'r1'})
+        # Still queued: updated in place, written once
+        writer.republish('r1', reasoning='early')
+        writer.flush()
+        writer.add({'message': 'other'})
+        writer.flush()
+        writer.mark_read(1)
+        [_, decided] = reader.get_all()
+        self.assertEqual((decided['seq'], decided['reasoning'], decided['read']), (1, 'early', True))
+
+        updated = writer.republish('r1', reasoning='because')
+        self.assertEqual(updated['seq'], 3)
+        self.assertEqual([n['seq'] for n in reader.wait_for(2, timeout=1)], [3])
+        self.assertEqual([(n['message'], n.get('reasoning'), n['read']) for n in reader.get_all()],
+                         [('decided', 'because', True), ('other', None, False)])
+        self.assertEqual(reader.find('r1')['reasoning'], 'because')
+        self.assertIsNone(writer.republish('missing', reasoning='x'))
+
+
+if __name__ == '__main__':
+    unittest.main()
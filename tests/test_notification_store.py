@@ -0,0 +1,95 @@
+import unittest
+import sys
+import os
+import threading
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend import agent_orchestrator
+from backend.agent_orchestrator import AIAgent, NotificationStore, get_reasoning, with_reasoning
+
+
+class TestNotificationStore(unittest.TestCase):
+    def test_ring_buffer_and_since_queries(self):
+        store = NotificationStore(capacity=3)
+        for i in range(5):
+            store.add({'message': f'n{i}'})
+
+        self.assertEqual([n['seq'] for n in store.get_all()], [5, 4, 3])
+        self.assertEqual([n['message'] for n in store.get_since(3)], ['n4', 'n3'])
+        self.assertEqual(store.get_since(5), [])
+        # Older than the buffer: everything still held
+        self.assertEqual(len(store.get_since(0)), 3)
+
+        store.mark_read(1)
+        self.assertEqual([n['read'] for n in store.get_all()], [False, True, False])
+        store.clear_all()
+        self.assertEqual((store.get_all(), store.latest_seq), ([], 5))
+
+    def test_wait_for_wakes_on_add(self):
+        store = NotificationStore()
+        timer = threading.Timer(0.05, store.add, args=({'message': 'hello'},))
+        timer.start()
+        notifications = store.wait_for(0, timeout=5)
+        timer.join()
+        self.assertEqual([n['message'] for n in notifications], ['hello'])
+        self.assertEqual(store.wait_for(1, timeout=0.01), [])
+
+    def test_republish_moves_the_entry_to_a_new_seq(self):
+        store = NotificationStore()
+        store.add({'message': 'decided', 'reasoning_id': 'r1'})
+        store.add({'message': 'other'})
+        updated = store.republish('r1', reasoning='because')
+        self.assertEqual(updated['seq'], 3)
+        self.assertEqual([(n['message'], n['seq']) for n in store.get_all()], [('decided', 3), ('other', 2)])
+        self.assertEqual([n['message'] for n in store.get_since(2)], ['decided'])
+        self.assertEqual(store.find('r1')['reasoning'], 'because')
+        self.assertIsNone(store.republish('missing', reasoning='x'))
+
+
+class TestDeferredReasoning(unittest.TestCase):
+    def setUp(self):
+        self.store = NotificationStore()
+        self.store_patch = patch.object(agent_orchestrator, 'notification_store', self.store)
+        self.store_patch.start()
+        self.release = threading.Event()
+        self.agent = AIAgent('Test Agent', 'tests decisions')
+        self.agent.reason = lambda context, task: self.release.wait(5) and f'because {task}'
+
+    def tearDown(self):
+        self.release.set()
+        self.store_patch.stop()
+
+    def test_reasoning_updates_the_decision_notification(self):
+        result = {'decision': 'SHORTLIST'}
+        reasoning_id = self.agent.decide('Shortlisted', 'decision', {'score': 90}, 'context', 'shortlist', result)
+        [pending] = self.store.get_all()
+        self.assertEqual((pending['reasoning'], pending['reasoning_pending'], pending['reasoning_id']), (None, True, reasoning_id))
+        self.assertIsNone(get_reasoning(reasoning_id))
+        self.assertEqual(with_reasoning(result)['reasoning_status'], 'pending')
+
+        self.release.set()
+        self.assertEqual(get_reasoning(reasoning_id, timeout=5), 'because shortlist')
+        # Stream and poll clients asking for anything after the decision get the reasoning
+        [explained] = self.store.wait_for(pending['seq'], timeout=5)
+        self.assertEqual((explained['message'], explained['reasoning'], explained['reasoning_pending']),
+                         ('Shortlisted', 'because shortlist', False))
+        self.assertGreater(explained['seq'], pending['seq'])
+        # One history entry per decision
+        self.assertEqual(len(self.store.get_all()), 1)
+        # The caller's result is a snapshot; the pool thread never writes to it
+        self.assertEqual(result, {'decision': 'SHORTLIST', 'reasoning': None, 'reasoning_status': 'pending', 'reasoning_id': reasoning_id})
+        self.assertEqual(with_reasoning(result), {**result, 'reasoning': 'because shortlist', 'reasoning_status': 'ready'})
+
+    def test_reasoning_from_another_process(self):
+        # No local future: the text comes from the shared notification
+        self.store.add({'message': 'decided', 'reasoning': 'elsewhere', 'reasoning_id': 'remote'})
+        self.assertEqual(get_reasoning('remote'), 'elsewhere')
+
+    def test_unknown_handle(self):
+        self.assertIsNone(get_reasoning('missing', timeout=0.01))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import sys
+import os
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'agents', 'shortlisting')))
+
+import problem_catalog
+from codeforces_api import CodeforcesAPI
+from problem_catalog import CatalogUnavailableError, ProblemCatalog
+
+
+class FakeCodeforces:
+    def __init__(self, problems):
+        self.problems = problems
+        self.calls = 0
+
+    def fetch_problemset(self, etag=None):
+        self.calls += 1
+        if etag == 'v1':
+            return None, etag
+        return self.problems, 'v1'
+
+
+class OfflineCodeforces:
+    def fetch_problemset(self, etag=None):
+        raise ConnectionError('codeforces.com unreachable')
+
+
+class TestProblemCatalog(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'problemset.json')
+        self.cf = FakeCodeforces([
+            {'contestId': 3, 'index': 'A', 'rating': 800, 'tags': ['math', 'greedy']},
+            {'contestId': 3, 'index': 'B', 'rating': 1500, 'tags': ['dp']},
+            {'contestId': 2, 'index': 'A', 'tags': ['math']},
+            {'contestId': 1, 'index': 'C', 'rating': 1200, 'tags': ['math', 'greedy', 'dp']},
+        ])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_filters_and_pagination(self):
+        catalog = ProblemCatalog(self.cf, path=self.path)
+        problems, total = catalog.query(tags=['math', 'greedy'])
+        self.assertEqual([(p['contestId'], p['index']) for p in problems], [(3, 'A'), (1, 'C')])
+        self.assertEqual(total, 2)
+        problems, total = catalog.query(difficulty_min=1000)
+        self.assertEqual([p['index'] for p in problems], ['B', 'C'])
+        problems, total = catalog.query(offset=1, limit=2)
+        self.assertEqual((len(problems), total), (2, 4))
+
+    def test_persisted_catalogue_is_reused(self):
+        ProblemCatalog(self.cf, path=self.path).query()
+        catalog = ProblemCatalog(self.cf, path=self.path)
+        self.assertEqual(catalog.query(difficulty_max=800)[1], 1)
+        self.assertEqual(self.cf.calls, 1)
+
+    def test_failed_first_download_is_reported(self):
+        catalog = ProblemCatalog(OfflineCodeforces(), path=self.path)
+        with self.assertRaises(CatalogUnavailableError):
+            catalog.query(tags=['dp'])
+        # Not swallowed into an empty "no matches" result either
+        with patch.object(problem_catalog, 'get_problem_catalog', return_value=catalog):
+            with self.assertRaises(CatalogUnavailableError):
+                CodeforcesAPI().get_problems(tags=['dp'])
+
+    def test_cached_catalogue_survives_a_failed_refresh(self):
+        ProblemCatalog(self.cf, path=self.path).query()
+        catalog = ProblemCatalog(OfflineCodeforces(), path=self.path, ttl_seconds=0)
+        with patch.object(catalog, 'refresh_in_background') as refresh:
+            self.assertEqual(catalog.query(tags=['dp'])[1], 2)
+        refresh.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from backend.prompt_manager import PromptManager
+
+
+class TestPromptCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp, 'prompts.db')
+        self.manager = PromptManager(db_path=self.db_path)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_update_invalidates_cached_prompt(self):
+        original = self.manager.get_prompt('Shortlisting Agent', 'reasoning')
+        self.assertIn('Shortlisting Agent', original)
+        self.manager.update_prompt('Shortlisting Agent', 'reasoning', 'new prompt')
+        self.assertEqual(self.manager.get_prompt('Shortlisting Agent', 'reasoning'), 'new prompt')
+
+    def test_write_from_another_connection_is_seen(self):
+        self.manager.get_prompt('Shortlisting Agent', 'reasoning')
+        # Simulates another process: a separate PromptManager on the same file
+        PromptManager(db_path=self.db_path).update_prompt('Shortlisting Agent', 'reasoning', 'from elsewhere')
+        self.assertEqual(self.manager.get_prompt('Shortlisting Agent', 'reasoning'), 'from elsewhere')
+
+    def test_cache_hit_does_not_query(self):
+        self.manager.get_prompt('Shortlisting Agent', 'evaluation')
+        queries = []
+        self.manager._reader.set_trace_callback(queries.append)
+        for _ in range(5):
+            self.manager.get_prompt('Shortlisting Agent', 'evaluation')
+        self.assertTrue(all('prompt_content' not in q for q in queries))
+
+
+if __name__ == '__main__':
+    unittest.main()
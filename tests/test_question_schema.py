@@ -0,0 +1,61 @@
+import unittest
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'agents', 'shortlisting')))
+
+import test_schema
+
+
+class TestCompiledQuestionSchema(unittest.TestCase):
+    def setUp(self):
+        self.questions = [
+            {'id': 's1', 'questions': [
+                {'type': 'codeforces', 'data': {'contestId': 1234, 'index': 'A', 'rating': 1000, 'tags': ['math']}},
+                {'contestId': 1234, 'index': 'B', 'rating': 1900, 'tags': ['dp']},
+            ]},
+            {'id': 's2', 'questions': [{'type': 'mcq'}, {'type': 'mcq'}]},
+        ]
+
+    def test_aliases_resolve_to_canonical_ids(self):
+        schema = test_schema.get_test_schema(self.questions)
+        self.assertEqual(schema.question_ids, ['1234A', '1234B', 's2_0', 's2_1'])
+        self.assertIs(schema, test_schema.get_test_schema(self.questions))
+        candidate = {'questions': {
+            '1234A': {'solved': True},
+            '3': {'solved': True},      # legacy flattened position of s2_1
+            's2_1': {'solved': False},  # canonical ID wins over the alias
+            'default_2': {'solved': True},
+        }}
+        self.assertEqual(schema.solved_flags(candidate), [True, False, True, False])
+
+    def test_weighted_score_and_buckets(self):
+        schema = test_schema.get_test_schema(self.questions)
+        candidate = {'questions': {'1234B': {'solved': True}, 's2_0': {'solved': True}}}
+        stats = schema.difficulty_stats(candidate)
+        self.assertEqual((stats['hard']['solved'], stats['medium']['total']), (1, 2))
+        self.assertEqual(schema.weighted_score(candidate), round(50 / 80 * 100))
+
+    def test_candidate_scores_resolve_results_once(self):
+        schema = test_schema.get_test_schema(self.questions)
+        candidate = {'questions': {'1234A': {'solved': True}, 's2_1': {'solved': True}}}
+        with patch.object(schema, 'resolve', wraps=schema.resolve) as resolve:
+            scores = schema.candidate_scores(candidate)
+        self.assertEqual(resolve.call_count, 1)
+        self.assertEqual(scores.difficulty, schema.difficulty_stats(candidate))
+        self.assertEqual(scores.tags, schema.tag_stats(candidate))
+        self.assertEqual(scores.score, schema.weighted_score(candidate))
+
+    def test_same_list_skips_hashing(self):
+        schema = test_schema.get_test_schema(self.questions)
+        with patch.object(test_schema.json, 'dumps', wraps=test_schema.json.dumps) as dumps:
+            self.assertIs(test_schema.get_test_schema(self.questions), schema)
+            self.assertEqual(dumps.call_count, 0)
+            # An equal copy is still found by content
+            self.assertIs(test_schema.get_test_schema(list(self.questions)), schema)
+            self.assertEqual(dumps.call_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import sys
+import os
+import mmap
+import subprocess
+import tempfile
+from concurrent.futures import Future, wait
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.resumeandmatching.utils import resume_parser
+from agents.resumeandmatching.utils.resume_parser import PDFExtractionPool
+
+
+class TestPDFExtractionPool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.pdf_path = os.path.join(self.tmp.name, 'resume.pdf')
+        # Built in a subprocess so this process's allocator holds no freed
+        # font memory a forked worker could reuse; the embedded font makes
+        # MuPDF allocate while extracting
+        subprocess.run([sys.executable, '-c', (
+            "import sys, fitz\n"
+            "doc = fitz.open()\n"
+            "page = doc.new_page()\n"
+            "page.insert_font(fontname='F0', fontbuffer=fitz.Font('cjk').buffer)\n"
+            "page.insert_text((72, 72), 'Jane Doe - Python developer', fontname='F0')\n"
+            "doc.save(sys.argv[1])\n"
+        ), self.pdf_path], check=True, capture_output=True)
+        self.pool = PDFExtractionPool(workers=1, max_memory_mb=512)
+        # Worker functions are pickled by module name; other tests stub it
+        self.modules = patch.dict(sys.modules, {resume_parser.__name__: resume_parser})
+        self.modules.start()
+
+    def tearDown(self):
+        self.pool.shutdown()
+        self.modules.stop()
+        self.tmp.cleanup()
+
+    def test_extracts_after_parent_maps_large_buffer(self):
+        # Stands in for a parent that has loaded torch / SBERT: workers must
+        # not inherit this address space and trip their memory cap
+        size = 1536 * 1024 * 1024
+        buffer = mmap.mmap(-1, size)
+        try:
+            text = self.pool.extract(self.pdf_path)
+            worker_size = self.pool._get_executor().submit(resume_parser._address_space_bytes).result()
+        finally:
+            buffer.close()
+        self.assertIn('Python developer', text or '')
+        self.assertLess(worker_size, size)
+
+
+class TestExtractionStall(unittest.TestCase):
+    def test_stall_fails_only_running_files(self):
+        pool = PDFExtractionPool(workers=1)
+        submitted = []
+
+        def submit(path):
+            submitted.append(path)
+            future = Future()
+            if path == 'hung.pdf':
+                future.set_running_or_notify_cancel()  # handed to a worker
+            elif submitted.count(path) > 1:
+                future.set_result(f'text of {path}')
+            return future
+
+        # The first wait hits the stall limit with nothing finished
+        stalls = iter([(set(), set())])
+        fake_wait = lambda fs, **kwargs: next(stalls, None) or wait(fs, **kwargs)
+        with patch.object(pool, 'submit', side_effect=submit), patch.object(resume_parser, 'wait', fake_wait):
+            results = list(pool.extract_many(['hung.pdf', 'queued.pdf']))
+
+        self.assertEqual(results, [('hung.pdf', None), ('queued.pdf', 'text of queued.pdf')])
+        self.assertEqual(submitted, ['hung.pdf', 'queued.pdf', 'queued.pdf'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.resumeandmatching.utils.database import get_session_factory
+from agents.resumeandmatching.utils.watcher import ResumeWatcher
+
+
+class TestResumeWatcherLedger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.url = f"sqlite:///{os.path.join(self.tmp.name, 'ledger.db')}"
+        self.resumes = os.path.join(self.tmp.name, 'resumes')
+        os.makedirs(self.resumes)
+        self.path = os.path.join(self.resumes, 'a@example.com_resume.pdf')
+        with open(self.path, 'wb') as f:
+            f.write(b'%PDF-1.4 first')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _watcher(self):
+        return ResumeWatcher(self.resumes, get_session_factory(self.url))
+
+    def test_unchanged_file_is_skipped_after_restart(self):
+        watcher = self._watcher()
+        self.assertEqual(watcher.unprocessed(watcher._scan()), [self.path])
+        watcher.mark_processed([self.path])
+
+        # A new watcher (agent restart) reads the same ledger
+        restarted = self._watcher()
+        self.assertEqual(restarted.unprocessed(restarted._scan()), [])
+
+    def test_changed_file_is_offered_again(self):
+        watcher = self._watcher()
+        watcher.mark_processed([self.path])
+        with open(self.path, 'ab') as f:
+            f.write(b' updated')
+
+        self.assertEqual(watcher.unprocessed(watcher._scan()), [self.path])
+
+
+if __name__ == '__main__':
+    unittest.main()
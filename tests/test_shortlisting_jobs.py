@@ -0,0 +1,179 @@
+import unittest
+import sys
+import os
+import threading
+import time
+import json
+from unittest.mock import MagicMock, patch
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+sys.path.append(os.path.join(ROOT, 'agents', 'shortlisting'))
+
+import api
+from job_queue import JobQueue
+from llm_analyzer import LLMPerformanceAnalyzer
+
+
+class TestJobEndpoints(unittest.TestCase):
+    def setUp(self):
+        self.client = api.app.test_client()
+        self.release = threading.Event()
+        self.queue_patch = patch.object(api, 'job_queue', JobQueue(workers=1))
+        self.queue_patch.start()
+
+    def tearDown(self):
+        self.release.set()
+        self.queue_patch.stop()
+
+    def _fetch_job(self, progress, test_id):
+        self.release.wait(5)
+        return {'success': True, 'test_id': test_id}
+
+    def test_returns_202_without_blocking(self):
+        with patch.object(api, '_fetch_results_job', self._fetch_job):
+            started = time.monotonic()
+            response = self.client.post('/api/tests/7/fetch-results')
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(response.status_code, 202)
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(response.get_json()['status_url'], f"/api/jobs/{response.get_json()['job_id']}")
+
+    def test_wait_opt_in_returns_result(self):
+        self.release.set()
+        with patch.object(api, '_fetch_results_job', self._fetch_job):
+            response = self.client.post('/api/tests/7/fetch-results?wait=2')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['test_id'], 7)
+
+
+class TestBulkAnalysis(unittest.TestCase):
+    CANDIDATES = [
+        {'email': 'ok@example.com', 'username': 'ok', 'total_solved': 1},
+        {'email': 'bad@example.com', 'username': 'bad', 'total_solved': 0},
+        {'email': 'slow@example.com', 'username': 'slow', 'total_solved': 0},
+    ]
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.analyze_candidate = api._analyze_candidate
+        self.patches = [
+            patch.object(api, 'job_queue', JobQueue(workers=1)),
+            patch.object(api.db_manager, 'get_test_questions', return_value=[]),
+            patch.object(api.test_service, 'get_test_results', return_value=[dict(c) for c in self.CANDIDATES]),
+            patch.object(api, 'get_llm_analyzer', return_value=object()),
+            patch.object(api, '_analyze_candidate', side_effect=self._analyze),
+            patch.object(api, 'ANALYSIS_TIMEOUT', 0.3),
+        ]
+        for p in self.patches:
+            p.start()
+        self.client = api.app.test_client()
+
+    def tearDown(self):
+        self.release.set()
+        for p in reversed(self.patches):
+            p.stop()
+
+    def _analyze(self, candidate_data, test_questions, cf_api, analyzer, deadline=None, scores=None):
+        if candidate_data['username'] == 'bad':
+            raise ValueError('boom')
+        if candidate_data['username'] == 'slow':
+            self.release.wait(5)
+        return {'performance_score': 100, 'recommendation': 'STRONG_HIRE'}
+
+    def _lines(self, response):
+        return [json.loads(line) for line in response.get_data(as_text=True).splitlines() if line]
+
+    def test_failures_and_timeouts_get_fallback_analyses(self):
+        results = {c['username']: a for _, c, a in api._iter_candidate_analyses(1)}
+
+        self.assertEqual(results['ok']['recommendation'], 'STRONG_HIRE')
+        self.assertIn('boom', results['bad']['reasoning'])
+        self.assertIn('timed out', results['slow']['reasoning'])
+        # Fallbacks are placed in the cohort too (an empty test ties everyone)
+        for analysis in results.values():
+            self.assertEqual(analysis['cohort'], {'rank': 1, 'percentile': 50.0, 'cohort_size': 3})
+
+    def test_analyzer_reads_stats_from_the_cohort(self):
+        questions = [{'contestId': 1, 'index': 'A', 'rating': 800, 'tags': ['math']}]
+        candidate = {'email': 'a@example.com', 'username': 'a', 'total_solved': 1, 'questions': {'1A': {'solved': True}}}
+        analyzer = LLMPerformanceAnalyzer(load_model=False)
+        cf_api = MagicMock()
+        cf_api.get_user_submission_details.return_value = None
+        with patch.object(api, '_analyze_candidate', self.analyze_candidate), \
+             patch.object(api, 'get_llm_analyzer', return_value=analyzer), \
+             patch.object(api, 'get_shortlisting_agent', return_value=MagicMock()), \
+             patch.object(api.db_manager, 'get_test_questions', return_value=questions), \
+             patch.object(api.test_service, 'get_test_results', return_value=[candidate]), \
+             patch('codeforces_api.CodeforcesAPI', return_value=cf_api), \
+             patch('test_schema.TestSchema.candidate_scores', side_effect=AssertionError('recomputed')):
+            [(_, _, analysis)] = list(api._iter_candidate_analyses(1))
+
+        self.assertEqual(analysis['performance_score'], 100)
+        self.assertEqual(analysis['difficulty_analysis']['easy'], {'total': 1, 'solved': 1, 'percentage': 100.0})
+        self.assertEqual(analysis['cohort']['rank'], 1)
+
+    def test_timed_out_worker_stops_at_next_step(self):
+        cf_api = MagicMock()
+        analyzer = MagicMock()
+        with self.assertRaises(TimeoutError):
+            self.analyze_candidate(self.CANDIDATES[0], [], cf_api, analyzer, deadline=time.monotonic() - 1)
+        analyzer.analyze_candidate_performance.assert_not_called()
+
+    def test_stream_follows_the_queued_job(self):
+        self.release.set()
+        response = self.client.get('/api/tests/1/candidate-analysis/stream')
+        lines = self._lines(response)
+
+        self.assertEqual(sorted(line['username'] for line in lines[:-1]), ['bad', 'ok', 'slow'])
+        self.assertEqual(lines[-1]['done'], True)
+        self.assertEqual(lines[-1]['total'], 3)
+        job = api.job_queue.get(lines[-1]['job_id'])
+        self.assertEqual(job['status'], 'completed')
+
+    def test_stream_is_capped_and_joins_running_job(self):
+        with patch.object(api, 'ANALYSIS_STREAM_SECONDS', 0.1), patch.object(api, 'ANALYSIS_TIMEOUT', 30):
+            first = self._lines(self.client.get('/api/tests/1/candidate-analysis/stream'))
+            second = self._lines(self.client.get(f"/api/tests/1/candidate-analysis/stream?since={first[-1]['since']}"))
+
+        self.assertEqual(first[-1]['done'], False)
+        self.assertEqual(second[-1]['done'], False)
+        self.assertEqual(first[-1]['job_id'], second[-1]['job_id'])
+        # Analyses already received are not sent again
+        sent = [line['username'] for line in first[:-1] + second[:-1]]
+        self.assertEqual(len(sent), len(set(sent)))
+
+
+class TestModelLoadLock(unittest.TestCase):
+    def test_concurrent_callers_load_the_model_once(self):
+        analyzer = LLMPerformanceAnalyzer(load_model=False)
+        loads = []
+
+        def load():
+            loads.append(1)
+            time.sleep(0.05)
+            analyzer.model_loaded = True
+
+        with patch.object(analyzer, '_load_model_locked', side_effect=load):
+            threads = [threading.Thread(target=analyzer._load_model) for _ in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        self.assertEqual(len(loads), 1)
+
+
+class TestProblemSearch(unittest.TestCase):
+    def test_unavailable_catalogue_is_a_503(self):
+        error = api.CatalogUnavailableError('Codeforces problemset unavailable: timed out')
+        with patch.object(api.test_service, 'search_problems', side_effect=error):
+            response = api.app.test_client().get('/api/tests/problems?tags=dp')
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(response.get_json()['success'])
+
+
+if __name__ == '__main__':
+    unittest.main()
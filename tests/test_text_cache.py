@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+import hashlib
+import shutil
+import tempfile
+from unittest.mock import patch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.resumeandmatching.utils import text_cache
+from agents.resumeandmatching.utils.database import get_session_factory
+
+
+class FakePool:
+    def __init__(self, text):
+        self.text = text
+        self.extracted = []
+
+    def extract_many(self, paths):
+        for path in paths:
+            self.extracted.append(path)
+            yield path, self.text
+
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.session = get_session_factory(f"sqlite:///{os.path.join(self.tmp.name, 'cache.db')}")()
+        self.path = os.path.join(self.tmp.name, 'a@example.com_resume.pdf')
+        with open(self.path, 'wb') as f:
+            f.write(b'%PDF-1.4 resume bytes')
+        self.pool = FakePool('Jane   Doe\r\n\n\n\nPython')
+        self.patcher = patch.object(text_cache, 'get_extraction_pool', return_value=self.pool)
+        self.patcher.start()
+
+    def tearDown(self):
+        self.patcher.stop()
+        self.session.close()
+        self.tmp.cleanup()
+
+    def test_miss_extracts_and_caches_by_sha256(self):
+        [(path, digest, text)] = list(text_cache.get_or_extract_many(self.session, [self.path]))
+
+        with open(self.path, 'rb') as f:
+            self.assertEqual(digest, hashlib.sha256(f.read()).hexdigest())
+        self.assertEqual(text, 'Jane Doe\n\nPython')
+        self.assertEqual(self.pool.extracted, [self.path])
+
+    def test_hit_skips_extraction_for_same_content(self):
+        list(text_cache.get_or_extract_many(self.session, [self.path]))
+        # Same bytes under another name hit the cache; no second extraction
+        copy = os.path.join(self.tmp.name, 'b@example.com_resume.pdf')
+        shutil.copy(self.path, copy)
+
+        [(path, digest, text)] = list(text_cache.get_or_extract_many(self.session, [copy]))
+
+        self.assertEqual(path, copy)
+        self.assertEqual(text, 'Jane Doe\n\nPython')
+        self.assertEqual(self.pool.extracted, [self.path])
+
+
+if __name__ == '__main__':
+    unittest.main()
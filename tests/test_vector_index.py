@@ -0,0 +1,124 @@
+import unittest
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agents.resumeandmatching.utils import vector_index
+from agents.resumeandmatching.utils.vector_index import VectorIndex
+
+
+def _unit(*rows):
+    arr = np.asarray(rows, dtype=np.float32)
+    return arr / np.linalg.norm(arr, axis=1, keepdims=True)
+
+
+class TestFlatVectorIndex(unittest.TestCase):
+    def setUp(self):
+        # Force the NumPy backend regardless of whether chromadb is installed
+        self._chromadb = vector_index.chromadb
+        vector_index.chromadb = None
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        vector_index.chromadb = self._chromadb
+        self.tmp.cleanup()
+
+    def test_top_jobs_for_resume_ranked_and_limited(self):
+        index = VectorIndex(self.tmp.name)
+        index.sync_jobs(["a", "b", "c"], _unit([1, 0], [0, 1], [1, 1]))
+
+        matches = index.top_jobs_for_resume(_unit([1, 0.1])[0], 2)
+
+        self.assertEqual([m[0] for m in matches], ["a", "c"])
+        self.assertTrue(0.0 <= matches[1][1] <= matches[0][1] <= 1.0)
+
+    def test_sync_jobs_drops_unapproved_and_persists(self):
+        index = VectorIndex(self.tmp.name)
+        index.sync_jobs(["a", "b"], _unit([1, 0], [0, 1]))
+        index.sync_jobs(["b"], _unit([0, 1]))
+
+        reloaded = VectorIndex(self.tmp.name)
+        self.assertEqual(reloaded.jobs.ids(), ["b"])
+
+    def test_upsert_replaces_existing_vector(self):
+        index = VectorIndex(self.tmp.name)
+        index.sync_jobs(["a", "b"], _unit([1, 0], [0, 1]))
+        index.sync_jobs(["a", "b"], _unit([0, 1], [0, 1]))
+
+        matches = index.top_jobs_for_resume(_unit([0, 1])[0], 5)
+        self.assertEqual(len(matches), 2)
+        self.assertAlmostEqual(matches[0][1], 1.0, places=5)
+        self.assertAlmostEqual(matches[1][1], 1.0, places=5)
+
+    def test_unchanged_sync_does_not_rewrite(self):
+        index = VectorIndex(self.tmp.name)
+        index.sync_jobs(["a", "b"], _unit([1, 0], [0, 1]))
+        path = index.jobs.path
+        os.utime(path, (0, 0))
+
+        index.sync_jobs(["a", "b"], _unit([1, 0], [0, 1]))
+        self.assertEqual(os.stat(path).st_mtime, 0)
+
+        index.sync_jobs(["a", "b", "c"], _unit([1, 0], [0, 1], [1, 1]))
+        self.assertNotEqual(os.stat(path).st_mtime, 0)
+
+    def test_ivf_search_matches_exact_top_k(self):
+        rng = np.random.default_rng(1)
+        centers = _unit(*rng.normal(size=(16, 8)))
+        embs = centers[rng.integers(0, 16, 5000)] + rng.normal(scale=0.05, size=(5000, 8))
+        embs = _unit(*embs)
+        ids = [str(i) for i in range(len(embs))]
+        index = VectorIndex(self.tmp.name)
+        index.sync_jobs(ids, embs)
+
+        query = embs[42]
+        exact = np.argsort(-(embs @ query))[:5]
+        matches = index.top_jobs_for_resume(query, 5)
+        self.assertIsNotNone(index.jobs._ivf)
+        self.assertEqual(matches[0][0], "42")
+        self.assertGreaterEqual(len({m[0] for m in matches} & {str(i) for i in exact}), 4)
+
+    def test_top_resumes_for_job_replaces_reprocessed_resume(self):
+        index = VectorIndex(self.tmp.name)
+        index.upsert_resumes(["r1", "r2"], _unit([1, 0], [0, 1]))
+        index.upsert_resumes(["r1"], _unit([0, 1]))
+
+        matches = index.top_resumes_for_job(_unit([0, 1])[0], 5)
+        self.assertEqual(len(matches), 2)
+        self.assertAlmostEqual(matches[0][1], 1.0, places=5)
+        self.assertAlmostEqual(matches[1][1], 1.0, places=5)
+        # Re-processing made r1 the most recently indexed entry
+        self.assertEqual(index.resumes.ids(), ["r2", "r1"])
+
+    def test_resume_collection_is_bounded(self):
+        index = VectorIndex(self.tmp.name, max_resumes=2)
+        index.upsert_resumes(["r1", "r2"], _unit([1, 0], [0, 1]))
+        index.upsert_resumes(["r3"], _unit([1, 1]))
+
+        self.assertEqual(VectorIndex(self.tmp.name).resumes.ids(), ["r2", "r3"])
+
+    def test_deleted_files_are_pruned(self):
+        kept = os.path.join(self.tmp.name, "kept.pdf")
+        gone = os.path.join(self.tmp.name, "gone.pdf")
+        open(kept, "wb").close()
+        index = VectorIndex(self.tmp.name)
+        index.upsert_resumes([kept, gone], _unit([1, 0], [0, 1]))
+
+        self.assertEqual(index.prune_resumes(), [gone])
+        self.assertEqual([m[0] for m in index.top_resumes_for_job(_unit([0, 1])[0], 5)], [kept])
+
+    def test_reader_sees_writer_updates(self):
+        # A reader in another process (the backend) picks up the agent's writes
+        reader = VectorIndex(self.tmp.name)
+        self.assertEqual(reader.top_resumes_for_job(_unit([1, 0])[0], 5), [])
+        writer = VectorIndex(self.tmp.name)
+        writer.upsert_resumes(["r1"], _unit([1, 0]))
+        self.assertEqual([m[0] for m in reader.top_resumes_for_job(_unit([1, 0])[0], 5)], ["r1"])
+
+
+if __name__ == '__main__':
+    unittest.main()
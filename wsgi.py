@@ -35,6 +35,11 @@ print("Loading settings_api...", flush=True)
 from backend.settings_api import app as settings_app
 print("Loaded settings_api.", flush=True)
 
+# Build every registered agent once, off the request path, so the first
+# request to each API doesn't pay for graph compilation and client setup
+from backend.agent_registry import agent_registry
+agent_registry.warm_up_in_background()
+
 # ... imports ...
 from flask import Flask, send_from_directory
 